@@ -0,0 +1,157 @@
+# src/api/handlers.py
+
+"""
+Crew, research and sweep handlers shared by the API's background jobs and
+the durable task queue workers; importing them does not load the web app
+"""
+
+from typing import Dict, Any, Optional
+from enum import Enum
+from pydantic import BaseModel
+import logging
+import os
+import re
+
+from tools.registry import get_registry
+from api.service_pool import get_service_pool
+
+logger = logging.getLogger(__name__)
+
+# Sweep and run IDs name checkpoint files, so only plain file-name characters are allowed
+CHECKPOINT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Define our CrewAI modes
+class CrewAIMode(Enum):
+    """
+    Enum to distinguish between Enterprise and Self-hosted modes
+    """
+    ENTERPRISE = "enterprise"
+    SELF_HOSTED = "self_hosted"
+
+class CrewConfig(BaseModel):
+    """
+    Pydantic model for crew configuration
+    
+    Attributes:
+        mode: Specifies whether to use Enterprise or Self-hosted mode
+        config: Dictionary containing crew configuration details
+        name: Optional name for the crew
+    """
+    mode: CrewAIMode
+    config: Dict[str, Any]
+    name: Optional[str] = None
+
+class CrewResponse(BaseModel):
+    """Response model for crew creation endpoint"""
+    status: str
+    mode: str
+    crew_id: str
+    details: Dict[str, Any]
+
+async def run_create_crew(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    """
+    Job handler: create a crew through the service for its mode
+
+    Returns the CrewResponse body; failures mark the job failed
+    """
+    crew_config = CrewConfig(**payload)
+    logger.info(f"Creating crew in {crew_config.mode} mode")
+
+    # Services are built once per mode at startup and reused across requests
+    with get_service_pool().acquire(crew_config.mode.value) as service:
+        progress("creating", {"mode": crew_config.mode.value})
+        result = await service.create_crew(crew_config.config)
+
+    logger.info(f"Successfully created crew in {crew_config.mode} mode")
+    return CrewResponse(
+        status="success",
+        mode=crew_config.mode.value,
+        crew_id=result.get("crew_id"),
+        details=result
+    ).model_dump()
+
+def run_amazon_research(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    """
+    Job handler: run the Amazon research crew, reporting each finished task
+
+    The run checkpoints under the payload's ``run_id``, so a retried or
+    re-leased task resumes it instead of paying for finished tasks again.
+    A crew error is raised so the job or task is retried; a market gate
+    rejection is a normal result
+    """
+    from crews.amazon.amazon_crew import AmazonResearchCrew
+
+    run_id = payload.get("run_id")
+    if run_id is not None and not valid_checkpoint_id(run_id):
+        raise ValueError(f"Invalid run_id: {run_id!r}")
+    on_task_complete = lambda task, output: progress("task", {"task": task, "output": output})
+
+    crew = AmazonResearchCrew()
+    if run_id and crew.memory_store.get_run(run_id) is not None:
+        progress("resumed", {"run_id": run_id})
+        result = crew.resume(run_id, on_task_complete=on_task_complete)
+    else:
+        result = crew.research_product_opportunity(payload["keyword"], run_id=run_id, on_task_complete=on_task_complete)
+    if result.get("status") == "error":
+        raise RuntimeError(f"Research crew failed for '{payload['keyword']}' (run {result.get('run_id')}): {result.get('reason')}")
+    return result
+
+def valid_checkpoint_id(checkpoint_id: Any) -> bool:
+    """Whether a caller-supplied sweep or run ID is safe to use as a checkpoint file name"""
+    return isinstance(checkpoint_id, str) and CHECKPOINT_ID_PATTERN.match(checkpoint_id) is not None
+
+def sweep_checkpoint_path(sweep_dir: str, sweep_id: Any) -> str:
+    """Checkpoint file for a sweep, guaranteed to lie inside ``sweep_dir``"""
+    if not valid_checkpoint_id(sweep_id):
+        raise ValueError(f"Invalid sweep_id: {sweep_id!r}")
+    root = os.path.realpath(sweep_dir)
+    path = os.path.realpath(os.path.join(root, f"{sweep_id}.json"))
+    if os.path.dirname(path) != root:
+        raise ValueError(f"Sweep checkpoint for {sweep_id!r} falls outside {sweep_dir}")
+    return path
+
+def run_sov_sweep(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    """
+    Task handler: crawl Share of Voice outward from seed keywords
+
+    The crawl checkpoints per sweep ID, so a retried or re-leased sweep
+    resumes where the previous attempt stopped instead of re-spending quota
+    """
+    from tools.amazon.keyword_crawler import KeywordDiscoveryCrawler
+    from crews.amazon.amazon_memory_store import AmazonMemoryStore
+
+    sweep_dir = os.getenv("SWEEP_CHECKPOINT_DIR", "memory/sweeps")
+    checkpoint_path = sweep_checkpoint_path(sweep_dir, payload.get("sweep_id"))
+    os.makedirs(sweep_dir, exist_ok=True)
+    crawler = KeywordDiscoveryCrawler(
+        get_registry().get("junglescout"),
+        memory_store=AmazonMemoryStore(),
+        max_requests=payload.get("max_requests", 100),
+        max_depth=payload.get("max_depth", 2),
+        checkpoint_path=checkpoint_path
+    )
+    if crawler.visited or crawler.frontier:
+        # A retried sweep gives keywords that ran out of attempts another round
+        crawler.retry_failed()
+    else:
+        crawler.add_seeds(payload["seeds"])
+    progress("started", {"resumed_keywords": len(crawler.results)})
+    results = crawler.crawl()
+    if not results and crawler.stats["errors"]:
+        # Nothing succeeded; drop the checkpoint so the retry starts from the seeds again
+        os.remove(checkpoint_path)
+        raise RuntimeError(f"Share of Voice sweep {payload['sweep_id']} failed for every keyword")
+    top = sorted(results.values(), key=lambda r: r["opportunity_score"], reverse=True)[:20]
+    return {
+        "sweep_id": payload["sweep_id"],
+        "keywords": len(results),
+        "top_opportunities": top,
+        "stats": crawler.stats
+    }
+
+# Kinds the durable task queue accepts, run by embedded and standalone workers
+TASK_HANDLERS = {
+    "create_crew": run_create_crew,
+    "amazon_research": run_amazon_research,
+    "sov_sweep": run_sov_sweep
+}
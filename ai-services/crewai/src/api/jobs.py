@@ -0,0 +1,214 @@
+# src/api/jobs.py
+
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import asyncio
+import inspect
+import logging
+import os
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"succeeded", "failed", "cancelled"}
+STATUS_EVENTS = TERMINAL_STATUSES | {"queued", "running"}
+
+# handler(payload, progress) -> result; may be a coroutine function
+JobHandler = Callable[[Dict[str, Any], Callable[[str, Any], None]], Any]
+
+
+class JobManager:
+    """Background execution of long-running requests on a bounded worker pool
+
+    ``submit`` returns immediately with a queued job; at most
+    ``max_workers`` handlers run at once. Each job keeps an ordered event
+    log (status changes plus whatever the handler reports through its
+    ``progress`` callback) that clients can follow with ``wait_events``,
+    or with ``await_events`` from an event loop without holding a thread.
+    The newest ``max_retained`` finished jobs are kept for status and
+    result retrieval.
+    """
+
+    def __init__(self, max_workers: int = 4, max_retained: int = 1000):
+        self.max_workers = max_workers
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._futures: Dict[str, Any] = {}
+        self._changed = threading.Condition()
+        # job_id -> (loop, event) of async followers woken by _event
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    def submit(self, kind: str, handler: JobHandler, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a job and return its public record"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "events": []
+        }
+        with self._changed:
+            self._jobs[job_id] = job
+            self._event(job, "queued", {})
+            self._futures[job_id] = self._executor.submit(self._run, job_id, handler, payload or {})
+        return self.get(job_id)
+
+    def _event(self, job: Dict[str, Any], event: str, data: Any):
+        # Caller holds self._changed
+        job["events"].append({"seq": len(job["events"]), "event": event, "data": data, "at": datetime.now().isoformat()})
+        self._changed.notify_all()
+        for loop, waiter in self._waiters.get(job["job_id"], []):
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                # The follower's loop has closed
+                pass
+
+    def _set_status(self, job_id: str, status: str, **fields):
+        with self._changed:
+            job = self._jobs[job_id]
+            job.update(status=status, **fields)
+            data = {"error": fields["error"]} if fields.get("error") else {}
+            self._event(job, status, data)
+            if status in TERMINAL_STATUSES:
+                self._futures.pop(job_id, None)
+                self._prune()
+
+    def _run(self, job_id: str, handler: JobHandler, payload: Dict[str, Any]):
+        with self._changed:
+            if self._jobs[job_id]["status"] != "queued":
+                return
+        self._set_status(job_id, "running", started_at=datetime.now().isoformat())
+
+        def progress(event: str, data: Any = None):
+            with self._changed:
+                self._event(self._jobs[job_id], event, data)
+
+        try:
+            result = handler(payload, progress)
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self._set_status(job_id, "failed", error=str(e) or type(e).__name__, finished_at=datetime.now().isoformat())
+            return
+        self._set_status(job_id, "succeeded", result=result, finished_at=datetime.now().isoformat())
+
+    def _prune(self):
+        # Caller holds self._changed; drop the oldest finished jobs past the cap
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in TERMINAL_STATUSES]
+        for job_id in finished[:max(len(finished) - self.max_retained, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict[str, Any]]:
+        """Status record of a job, or None if unknown"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            record = {k: v for k, v in job.items() if k not in ("events", "result")}
+            progress = [e for e in job["events"] if e["event"] not in STATUS_EVENTS]
+            record["progress"] = progress[-1] if progress else None
+            if include_result:
+                record["result"] = job["result"]
+            return record
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != "queued":
+                return False
+            future = self._futures.get(job_id)
+            if future is not None:
+                future.cancel()
+            self._set_status(job_id, "cancelled", finished_at=datetime.now().isoformat())
+        return True
+
+    def wait_events(self, job_id: str, after: int = 0, timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """Events with seq >= ``after``, waiting up to ``timeout`` for new ones
+
+        Returns the events and whether the job has finished.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._has_events(job_id, after), timeout=timeout)
+            return self._events_after(job_id, after)
+
+    async def await_events(self, job_id: str, after: int = 0, timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """``wait_events`` for event loops: waits on an asyncio.Event instead of a thread"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = (loop, asyncio.Event())
+        with self._changed:
+            if self._has_events(job_id, after):
+                return self._events_after(job_id, after)
+            self._waiters.setdefault(job_id, []).append(waiter)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    break
+                waiter[1].clear()
+                with self._changed:
+                    if self._has_events(job_id, after):
+                        break
+        finally:
+            with self._changed:
+                waiters = self._waiters.get(job_id, [])
+                waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(job_id, None)
+        with self._changed:
+            return self._events_after(job_id, after)
+
+    def _has_events(self, job_id: str, after: int) -> bool:
+        # Caller holds self._changed
+        job = self._jobs.get(job_id)
+        return job is None or len(job["events"]) > after or job["status"] in TERMINAL_STATUSES
+
+    def _events_after(self, job_id: str, after: int) -> Tuple[List[Dict[str, Any]], bool]:
+        # Caller holds self._changed
+        job = self._jobs.get(job_id)
+        if job is None:
+            return [], True
+        return list(job["events"][after:]), job["status"] in TERMINAL_STATUSES
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs first, optionally filtered by status"""
+        with self._changed:
+            job_ids = [job_id for job_id, job in reversed(self._jobs.items()) if status is None or job["status"] == status]
+        return [self.get(job_id) for job_id in job_ids[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status and pool size"""
+        with self._changed:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"max_workers": self.max_workers, "jobs": counts}
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager sized by CREW_JOB_WORKERS"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(max_workers=int(os.getenv("CREW_JOB_WORKERS", "4")))
+        return _manager
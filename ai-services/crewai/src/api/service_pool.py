@@ -0,0 +1,203 @@
+# src/api/service_pool.py
+
+from typing import Dict, Any, Callable, Optional, Iterator, Tuple
+from contextlib import contextmanager
+import importlib
+import logging
+import os
+import queue
+import threading
+import time
+
+from tools.ai.hedging import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# Crew service class per CrewAIMode value, as 'module:Class'
+MODE_SERVICES = {
+    "enterprise": "enterprise_bridge.service:EnterpriseCrewService",
+    "self_hosted": "self_hosted.service:SelfHostedCrewService"
+}
+
+
+class ServiceUnavailableError(RuntimeError):
+    """No service can be handed out for a mode"""
+
+
+def service_factory(path: str) -> Callable[[], Any]:
+    """Factory that imports 'module:Class' and constructs it"""
+    module_name, class_name = path.split(":")
+
+    def factory():
+        return getattr(importlib.import_module(module_name), class_name)()
+    return factory
+
+
+class ServicePool:
+    """Warm, reusable crew service instances per mode
+
+    ``warm`` builds ``size`` instances of every mode once (at application
+    startup), so requests skip the module import and client construction.
+    ``acquire`` checks an instance out for one request, waiting up to
+    ``timeout`` when all are busy, and records how long the request held
+    it. A mode whose service cannot be built is reported unavailable with
+    the error instead of failing every request at import time, and a
+    background timer retries the build after an exponential backoff
+    (``retry_base`` doubling up to ``retry_max`` seconds). Builds run
+    outside the pool lock, so readiness and metrics never wait on them.
+    """
+
+    def __init__(
+        self,
+        factories: Dict[str, Callable[[], Any]],
+        size: int = 2,
+        timeout: float = 30.0,
+        retry_base: float = 5.0,
+        retry_max: float = 300.0
+    ):
+        self.factories = factories
+        self.size = size
+        self.timeout = timeout
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.latencies = LatencyTracker()
+        self._idle: Dict[str, queue.Queue] = {}
+        self._errors: Dict[str, str] = {}
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._retry_timers: Dict[str, threading.Timer] = {}
+        self._build_locks = {mode: threading.Lock() for mode in factories}
+        self._closed = False
+        self._stats: Dict[str, Dict[str, int]] = {mode: {"requests": 0, "errors": 0, "waits": 0} for mode in factories}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ServicePool":
+        """Pool of the crew services per mode sized by CREW_SERVICE_POOL_SIZE"""
+        return cls(
+            {mode: service_factory(path) for mode, path in MODE_SERVICES.items()},
+            size=int(os.getenv("CREW_SERVICE_POOL_SIZE", "2")),
+            timeout=float(os.getenv("CREW_SERVICE_POOL_TIMEOUT", "30")),
+            retry_max=float(os.getenv("CREW_SERVICE_RETRY_MAX", "300"))
+        )
+
+    def _ensure(self, mode: str, retry: bool = False) -> Tuple[Optional[queue.Queue], Optional[str]]:
+        """Build a mode's instances on first use; (idle queue, None) or (None, build error)
+
+        A failed mode is only rebuilt once its backoff has passed, or when ``retry`` is set.
+        """
+        if mode not in self.factories:
+            raise ServiceUnavailableError(f"Unknown crew mode: {mode}")
+        # One builder per mode; the pool lock is only held to read and publish state
+        with self._build_locks[mode]:
+            with self._lock:
+                if mode in self._idle:
+                    return self._idle[mode], None
+                if mode in self._errors and not retry and time.monotonic() < self._retry_at[mode]:
+                    return None, self._errors[mode]
+            started = time.perf_counter()
+            idle: queue.Queue = queue.Queue()
+            try:
+                for _ in range(self.size):
+                    idle.put(self.factories[mode]())
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e)}"
+                with self._lock:
+                    failures = self._failures[mode] = self._failures.get(mode, 0) + 1
+                    delay = min(self.retry_base * 2 ** (failures - 1), self.retry_max)
+                    self._errors[mode] = error
+                    self._retry_at[mode] = time.monotonic() + delay
+                    self._schedule_retry(mode, delay)
+                logger.error(f"Crew service for {mode} mode is unavailable, retrying in {delay:.0f}s: {error}")
+                return None, error
+            with self._lock:
+                self._idle[mode] = idle
+                self._errors.pop(mode, None)
+                self._failures.pop(mode, None)
+            logger.info(f"Warmed {self.size} {mode} crew service(s) in {time.perf_counter() - started:.2f}s")
+            return idle, None
+
+    def _schedule_retry(self, mode: str, delay: float):
+        """Rebuild a failed mode in the background once its backoff has passed (caller holds the lock)"""
+        if self._closed:
+            return
+        timer = threading.Timer(delay, self._ensure, args=(mode, True))
+        timer.daemon = True
+        self._retry_timers[mode] = timer
+        timer.start()
+
+    def close(self):
+        """Stop pending background rebuilds"""
+        with self._lock:
+            self._closed = True
+            timers = list(self._retry_timers.values())
+            self._retry_timers.clear()
+        for timer in timers:
+            timer.cancel()
+
+    def warm(self):
+        """Build every mode's instances now"""
+        for mode in self.factories:
+            self._ensure(mode)
+
+    @contextmanager
+    def acquire(self, mode: str) -> Iterator[Any]:
+        """Check out a warm service for one request and return it afterwards"""
+        idle, error = self._ensure(mode)
+        if idle is None:
+            raise ServiceUnavailableError(f"Crew service for {mode} mode is unavailable: {error}")
+        try:
+            service = idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self._stats[mode]["waits"] += 1
+            try:
+                service = idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise ServiceUnavailableError(f"All {self.size} {mode} crew services busy for {self.timeout}s")
+
+        started = time.perf_counter()
+        try:
+            yield service
+        except Exception:
+            with self._lock:
+                self._stats[mode]["errors"] += 1
+            raise
+        finally:
+            self.latencies.observe(mode, time.perf_counter() - started)
+            with self._lock:
+                self._stats[mode]["requests"] += 1
+            idle.put(service)
+
+    def readiness(self) -> Dict[str, Any]:
+        """Warm capacity per mode; ready when any mode has a service built"""
+        modes = {}
+        with self._lock:
+            for mode in self.factories:
+                idle = self._idle.get(mode)
+                modes[mode] = {
+                    "available": idle is not None,
+                    "warm": self.size if idle is not None else 0,
+                    "idle": idle.qsize() if idle is not None else 0,
+                    "error": self._errors.get(mode)
+                }
+        return {"ready": any(m["available"] for m in modes.values()), "modes": modes}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Requests, errors, waits for a free service and latency percentiles per mode"""
+        with self._lock:
+            stats = {mode: dict(counts) for mode, counts in self._stats.items()}
+        return {mode: {**counts, **self.latencies.snapshot(mode)} for mode, counts in stats.items()}
+
+
+_pool: Optional[ServicePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_service_pool() -> ServicePool:
+    """Process-wide crew service pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ServicePool.from_env()
+        return _pool
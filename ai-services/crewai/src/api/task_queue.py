@@ -0,0 +1,387 @@
+# src/api/task_queue.py
+
+from typing import Dict, Any, List, Optional, Callable, Iterable
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import inspect
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TASK_STATUSES = ("pending", "leased", "succeeded", "dead")
+
+# handler(payload, progress) -> result; same contract as JobManager handlers
+TaskHandler = Callable[[Dict[str, Any], Callable[[str, Any], None]], Any]
+
+
+class TaskQueue:
+    """Durable task queue in SQLite shared by the API and worker processes
+
+    A worker ``lease``s the highest-priority available task for
+    ``visibility_timeout`` seconds; unless it calls ``complete`` or extends
+    the lease with ``heartbeat`` in time, the task becomes available to
+    other workers again. ``fail`` retries with exponential backoff until
+    ``max_attempts`` is reached, then moves the task to the dead-letter
+    state where it stays until ``requeue``. Every state change is a single
+    transaction, so several processes can share one database file.
+    """
+
+    def __init__(
+        self,
+        path: str = "memory/task_queue.db",
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        backoff_base: float = 5.0,
+        backoff_max: float = 600.0
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+                "priority INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+                "available_at REAL NOT NULL, lease_owner TEXT, lease_expires_at REAL, "
+                "progress TEXT, result TEXT, last_error TEXT, "
+                "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority DESC, available_at)"
+            )
+
+    @classmethod
+    def from_env(cls) -> "TaskQueue":
+        """Queue at TASK_QUEUE_PATH; TASK_VISIBILITY_TIMEOUT and TASK_MAX_ATTEMPTS set the defaults"""
+        return cls(
+            path=os.getenv("TASK_QUEUE_PATH", "memory/task_queue.db"),
+            visibility_timeout=float(os.getenv("TASK_VISIBILITY_TIMEOUT", "300")),
+            max_attempts=int(os.getenv("TASK_MAX_ATTEMPTS", "5"))
+        )
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        # BEGIN IMMEDIATE takes the write lock up front so two workers never lease the same row
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0,
+        task_id: Optional[str] = None
+    ) -> str:
+        """Add a task and return its ID; re-enqueueing an existing ``task_id`` is a no-op"""
+        task_id = task_id or uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        self._transaction(lambda conn: conn.execute(
+            "INSERT OR IGNORE INTO tasks (id, kind, payload, priority, status, max_attempts, "
+            "available_at, created_at, updated_at) VALUES (?, ?, ?, ?, 'pending', ?, ?, ?, ?)",
+            (task_id, kind, json.dumps(payload or {}, default=str), priority,
+             max_attempts or self.max_attempts, time.time() + delay, now, now)
+        ))
+        return task_id
+
+    def lease(
+        self,
+        worker_id: str,
+        kinds: Optional[Iterable[str]] = None,
+        lease_seconds: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Claim the next available task for this worker, or None
+
+        Tasks whose lease expired are taken over; one that has already used
+        all its attempts is dead-lettered instead.
+        """
+        kinds = list(kinds) if kinds else None
+        lease_seconds = lease_seconds or self.visibility_timeout
+
+        def claim(conn: sqlite3.Connection):
+            now = time.time()
+            conn.execute(
+                "UPDATE tasks SET status = 'dead', lease_owner = NULL, updated_at = ?, "
+                "last_error = COALESCE(last_error, 'Lease expired') "
+                "WHERE status = 'leased' AND lease_expires_at <= ? AND attempts >= max_attempts",
+                (datetime.now().isoformat(), now)
+            )
+            sql = (
+                "SELECT * FROM tasks WHERE ((status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires_at <= ?))"
+            )
+            params: List[Any] = [now, now]
+            if kinds:
+                sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+                params.extend(kinds)
+            row = conn.execute(sql + " ORDER BY priority DESC, available_at, created_at LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            if row["status"] == "leased":
+                logger.warning(f"Lease on task {row['id']} held by {row['lease_owner']} expired; retrying")
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, datetime.now().isoformat(), row["id"])
+            )
+            return conn.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone()
+
+        row = self._transaction(claim)
+        return self._record(row) if row is not None else None
+
+    def heartbeat(
+        self,
+        task_id: str,
+        worker_id: str,
+        lease_seconds: Optional[float] = None,
+        progress: Any = None
+    ) -> bool:
+        """Extend a held lease, optionally recording progress; False if the lease was lost"""
+        lease_seconds = lease_seconds or self.visibility_timeout
+        sql = "UPDATE tasks SET lease_expires_at = ?, updated_at = ?"
+        params: List[Any] = [time.time() + lease_seconds, datetime.now().isoformat()]
+        if progress is not None:
+            sql += ", progress = ?"
+            params.append(json.dumps(progress, default=str))
+        sql += " WHERE id = ? AND status = 'leased' AND lease_owner = ?"
+        params.extend([task_id, worker_id])
+        return self._transaction(lambda conn: conn.execute(sql, params).rowcount) == 1
+
+    def complete(self, task_id: str, worker_id: str, result: Any = None) -> bool:
+        """Mark a leased task succeeded; False if this worker no longer holds it"""
+        return self._transaction(lambda conn: conn.execute(
+            "UPDATE tasks SET status = 'succeeded', result = ?, lease_owner = NULL, lease_expires_at = NULL, "
+            "updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(result, default=str), datetime.now().isoformat(), task_id, worker_id)
+        ).rowcount) == 1
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry number ``attempts``"""
+        return min(self.backoff_base * 2 ** max(attempts - 1, 0), self.backoff_max)
+
+    def fail(self, task_id: str, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """Record a failed attempt and return the new status (pending or dead)
+
+        Returns None if this worker no longer holds the lease.
+        """
+        def record(conn: sqlite3.Connection):
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM tasks WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (task_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            status = "pending" if retry and row["attempts"] < row["max_attempts"] else "dead"
+            conn.execute(
+                "UPDATE tasks SET status = ?, last_error = ?, available_at = ?, lease_owner = NULL, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                (status, error, time.time() + self.backoff(row["attempts"]), datetime.now().isoformat(), task_id)
+            )
+            return status
+
+        status = self._transaction(record)
+        if status == "dead":
+            logger.error(f"Task {task_id} dead-lettered: {error}")
+        return status
+
+    def requeue(self, task_id: str, reset_attempts: bool = True) -> bool:
+        """Move a dead-lettered task back to pending"""
+        attempts = "0" if reset_attempts else "attempts"
+        return self._transaction(lambda conn: conn.execute(
+            f"UPDATE tasks SET status = 'pending', attempts = {attempts}, available_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'dead'",
+            (time.time(), datetime.now().isoformat(), task_id)
+        ).rowcount) == 1
+
+    def _record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        for field in ("payload", "progress", "result"):
+            if record[field] is not None:
+                record[field] = json.loads(record[field])
+        return record
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Full record of a task, or None if unknown"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._record(row) if row is not None else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recently updated tasks first, optionally filtered by status"""
+        sql = "SELECT * FROM tasks"
+        params: List[Any] = []
+        if status:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._record(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Task counts by status and kind, plus how many are ready to run now"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, kind, COUNT(*) FROM tasks GROUP BY status, kind").fetchall()
+            ready = self._conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND available_at <= ?", (time.time(),)
+            ).fetchone()[0]
+        counts = {status: 0 for status in TASK_STATUSES}
+        kinds: Dict[str, Dict[str, int]] = {}
+        for status, kind, count in rows:
+            counts[status] = counts.get(status, 0) + count
+            kinds.setdefault(kind, {})[status] = count
+        return {"tasks": counts, "kinds": kinds, "ready": ready}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class QueueWorker:
+    """Leases tasks from a TaskQueue and runs them with registered handlers
+
+    Each of ``concurrency`` threads polls for a task, keeps its lease alive
+    with a heartbeat every third of the visibility timeout (and on every
+    progress report) and completes or fails it. Handlers get the same
+    ``(payload, progress)`` arguments as JobManager handlers, so one
+    implementation serves both.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        handlers: Dict[str, TaskHandler],
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        poll_interval: float = 1.0
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.stats = {"succeeded": 0, "failed": 0, "lost_leases": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def run_once(self) -> bool:
+        """Lease and run one task; False when none was available"""
+        task = self.queue.lease(self.worker_id, kinds=self.handlers)
+        if task is None:
+            return False
+        self._execute(task)
+        return True
+
+    def _execute(self, task: Dict[str, Any]):
+        task_id = task["id"]
+        lease_seconds = self.queue.visibility_timeout
+        finished = threading.Event()
+
+        def keep_alive():
+            while not finished.wait(lease_seconds / 3):
+                if not self.queue.heartbeat(task_id, self.worker_id, lease_seconds):
+                    return
+
+        def progress(event: str, data: Any = None):
+            self.queue.heartbeat(task_id, self.worker_id, lease_seconds, progress={"event": event, "data": data})
+
+        heartbeat = threading.Thread(target=keep_alive, name=f"heartbeat-{task_id[:8]}", daemon=True)
+        heartbeat.start()
+        logger.info(f"Worker {self.worker_id} running {task['kind']} task {task_id} (attempt {task['attempts']})")
+        try:
+            result = self.handlers[task["kind"]](task["payload"], progress)
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+        except Exception as e:
+            logger.error(f"Task {task_id} failed on attempt {task['attempts']}: {str(e)}")
+            self._count("failed")
+            if self.queue.fail(task_id, self.worker_id, str(e) or type(e).__name__) is None:
+                self._count("lost_leases")
+            return
+        finally:
+            finished.set()
+
+        if self.queue.complete(task_id, self.worker_id, result):
+            self._count("succeeded")
+        else:
+            # Lease expired mid-run and another worker took over; its result wins
+            logger.warning(f"Worker {self.worker_id} lost the lease on task {task_id}; result discarded")
+            self._count("lost_leases")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                ran = self.run_once()
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} could not poll the task queue: {str(e)}")
+                ran = False
+            if not ran:
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """Start the polling threads in the background"""
+        self._stop.clear()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, name=f"queue-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait: bool = True, timeout: Optional[float] = None):
+        """Stop polling; with ``wait``, block until running tasks finish"""
+        self._stop.set()
+        if not wait:
+            return
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_forever(self):
+        """Block running tasks until ``stop(wait=False)`` is called, e.g. from a signal handler"""
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        finally:
+            self.stop()
+
+
+_queue: Optional[TaskQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_task_queue() -> TaskQueue:
+    """Process-wide task queue configured from the environment"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = TaskQueue.from_env()
+        return _queue
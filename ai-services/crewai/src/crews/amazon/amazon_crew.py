@@ -1,24 +1,99 @@
 # src/crews/amazon/amazon_crew.py
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Callable, Optional
 from datetime import datetime
 import logging
+import time
+import uuid
 from crewai import Agent, Task, Crew, Process
 
-# Amazon specific tools
-from tools.amazon.junglescout_api import JungleScoutAPI
+# Shared Amazon, AI and search tool clients
+from tools.registry import ToolRegistry, get_registry
+from tools.amazon.keyword_crawler import normalize_keyword
+from tools.ai.usage import attribute_usage, get_usage_tracker, merge_usage, split_model
+from tools.ai.budget import default_prompt_budget
+from tools.ai.preflight import PromptSection, fit_sections
+from tools.ai.vector_index import VectorIndex, get_vector_index
+from tools.amazon.research_brief import build_research_brief, render_brief
 
-# AI tools
-from tools.ai.gpt4_api import GPT4API
-from tools.ai.claude_api import ClaudeAPI
-from tools.ai.gemini_api import GeminiAPI
-
-# Search tools
-from tools.search.web_search import WebSearchTool
-from tools.search.perplexity import PerplexitySearchTool
+from ..dag_scheduler import TaskGraph
+from ..result_cache import CrewResultCache, stable_hash
+from .amazon_memory_store import AmazonMemoryStore
+from .market_gate import MarketGate
 
 logger = logging.getLogger(__name__)
 
+# Research tasks and the outputs each one needs. Everything except the
+# validator depends only on market research, so those run concurrently.
+RESEARCH_TASKS = {
+    "market_research": {
+        "agent": "market_researcher",
+        "depends_on": [],
+        "description": """Analyze the Amazon market for '{keyword}': search volume, product
+        count, top brands by Share of Voice and overall demand.""",
+        "expected_output": "Market analysis with demand, brand concentration and opportunity score"
+    },
+    "competition_analysis": {
+        "agent": "competition_analyst",
+        "depends_on": ["market_research"],
+        "description": """Analyze the competitive landscape for '{keyword}': market leaders,
+        positioning and gaps in price segments.""",
+        "expected_output": "Competition analysis with leaders, gaps and positioning opportunities"
+    },
+    "pricing_strategy": {
+        "agent": "pricing_strategist",
+        "depends_on": ["market_research"],
+        "description": """Develop a pricing strategy for '{keyword}' based on competitor price
+        points and margin targets.""",
+        "expected_output": "Recommended price point with margin analysis"
+    },
+    "supplier_research": {
+        "agent": "supplier_researcher",
+        "depends_on": ["market_research"],
+        "description": """Identify and evaluate suppliers able to deliver '{keyword}' products
+        that meet quality and shipping criteria.""",
+        "expected_output": "Ranked supplier shortlist with quality and shipping assessment"
+    },
+    "listing_optimization": {
+        "agent": "listing_optimizer",
+        "depends_on": ["market_research"],
+        "description": """Draft an optimized Amazon listing strategy for '{keyword}': title,
+        bullet points and target keywords.""",
+        "expected_output": "Listing recommendations with title, bullets and keywords"
+    },
+    "trend_analysis": {
+        "agent": "trend_analyst",
+        "depends_on": ["market_research"],
+        "description": """Analyze demand trends and seasonality for '{keyword}'.""",
+        "expected_output": "Trend and seasonality assessment with timing recommendation"
+    },
+    "product_validation": {
+        "agent": "product_validator",
+        "depends_on": [
+            "market_research", "competition_analysis", "pricing_strategy",
+            "supplier_research", "listing_optimization", "trend_analysis"
+        ],
+        "description": """Validate the '{keyword}' product opportunity against the research
+        below. Confirm margins above 30% and a sustainable market position.""",
+        "expected_output": "Go/no-go validation with score, profit potential and risk factors"
+    }
+}
+
+# Non-LLM stage that condenses SoV data into the brief every agent receives
+BRIEF_TASK = "research_brief"
+
+# Result keys for each task's output in research_product_opportunity
+RESULT_KEYS = {
+    BRIEF_TASK: "research_brief",
+    "market_research": "market_data",
+    "competition_analysis": "competition_data",
+    "pricing_strategy": "pricing_data",
+    "supplier_research": "supplier_data",
+    "listing_optimization": "listing_data",
+    "trend_analysis": "trend_data",
+    "product_validation": "validation_data"
+}
+
 class ValidationCriteria:
     """Validation criteria for Amazon product opportunities based on JungleScout data"""
     
@@ -49,16 +124,83 @@ class ValidationCriteria:
             "min_market_gap": 0.10            # Minimum market gap opportunity
         }
 
+    def validate_market(self, data: Dict[str, Any]) -> Tuple[bool, Dict[str, Dict[str, Any]]]:
+        """Evaluate the numeric criteria that can be checked without an LLM
+
+        Accepts Share of Voice attributes (or any dict using the same field
+        names) and only checks criteria whose inputs are present. Returns
+        (passed, results) where results maps criterion to value/threshold/passed.
+        """
+        results = {}
+
+        def check(criterion: str, value: float, threshold: float, minimum: bool):
+            results[criterion] = {
+                "value": value,
+                "threshold": threshold,
+                "passed": value >= threshold if minimum else value <= threshold
+            }
+
+        volume = data.get("estimated_30_day_search_volume")
+        if volume is not None:
+            check("min_search_volume", volume, self.market_criteria["min_search_volume"], True)
+
+        brands = sorted(
+            data.get("brands") or [],
+            key=lambda x: x.get("combined_weighted_sov", 0),
+            reverse=True
+        )
+        if brands:
+            top_three = sum(b.get("combined_weighted_sov", 0) for b in brands[:3])
+            check("max_competition", top_three, self.market_criteria["max_competition"], False)
+            check(
+                "max_top_brand_share",
+                brands[0].get("combined_weighted_sov", 0),
+                self.competition_criteria["max_top_brand_share"],
+                False
+            )
+            if any("sponsored_weighted_sov" in b for b in brands):
+                check(
+                    "max_sponsored_share",
+                    sum(b.get("sponsored_weighted_sov", 0) for b in brands),
+                    self.competition_criteria["max_sponsored_share"],
+                    False
+                )
+
+        margin = data.get("profit_margin")
+        if margin is not None:
+            check("min_profit_margin", margin, self.market_criteria["min_profit_margin"], True)
+
+        passed = all(r["passed"] for r in results.values())
+        return passed, results
+
 class AmazonResearchCrew:
     """Specialized crew for Amazon product research and validation"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        registry: ToolRegistry = None,
+        use_gate: bool = False,
+        result_cache: CrewResultCache = None,
+        context_token_budget: int = None,
+        vector_index: VectorIndex = None,
+        storage_dir: str = "memory"
+    ):
         self.validation = ValidationCriteria()
+        self.registry = registry or get_registry()
         self.agents = self._create_agents()
-        self.memory_store = MemoryStore()
+        # Semantic recall of past runs' findings; None without an embedder
+        self.vector_index = vector_index if vector_index is not None else get_vector_index()
+        self.memory_store = AmazonMemoryStore(storage_dir=storage_dir, vector_index=self.vector_index)
+        self.gate = MarketGate(
+            self.registry.get("junglescout"), self.validation, self.memory_store
+        ) if use_gate else None
+        self.result_cache = result_cache
+        # Token budget for the brief plus upstream outputs in each task prompt
+        self.context_token_budget = context_token_budget or default_prompt_budget()
 
     def _create_agents(self) -> Dict[str, Agent]:
         """Initialize all specialized agents with rich personas and appropriate tools"""
+        tools = self.registry
         
         market_researcher = Agent(
             name="Dr. Sarah Chen",
@@ -72,9 +214,10 @@ class AmazonResearchCrew:
             launches. Expert in analyzing Share of Voice data, competitor metrics, and 
             market trends to identify underserved niches with high profit potential.""",
             tools=[
-                JungleScoutAPI(),
-                PerplexitySearchTool(),
-                GPT4API()
+                tools.get("local_index"),
+                tools.get("junglescout"),
+                tools.get("perplexity"),
+                tools.get("gpt4")
             ],
             verbose=True,
             allow_delegation=True
@@ -91,9 +234,10 @@ class AmazonResearchCrew:
             positioning, and market dynamics. Developed frameworks for competitive 
             advantage analysis used by Fortune 500 companies.""",
             tools=[
-                JungleScoutAPI(),
-                ClaudeAPI(),
-                PerplexitySearchTool()
+                tools.get("local_index"),
+                tools.get("junglescout"),
+                tools.get("claude"),
+                tools.get("perplexity")
             ],
             verbose=True,
             allow_delegation=True
@@ -110,9 +254,10 @@ class AmazonResearchCrew:
             resulted in a 78% success rate for new product launches. Expert in analyzing 
             sales velocity, profit margins, and competition levels.""",
             tools=[
-                JungleScoutAPI(),
-                GPT4API(),
-                WebSearchTool()
+                tools.get("local_index"),
+                tools.get("junglescout"),
+                tools.get("gpt4"),
+                tools.get("web_search")
             ],
             verbose=True,
             allow_delegation=True
@@ -129,9 +274,9 @@ class AmazonResearchCrew:
             for major retailers. Expert in analyzing competitor pricing, market 
             positioning, and elasticity to find optimal price points.""",
             tools=[
-                JungleScoutAPI(),
-                GPT4API(),
-                ClaudeAPI()
+                tools.get("junglescout"),
+                tools.get("gpt4"),
+                tools.get("claude")
             ],
             verbose=True,
             allow_delegation=True
@@ -148,9 +293,10 @@ class AmazonResearchCrew:
             suppliers across Asia. Developed quality control systems that reduced defect 
             rates by 95%.""",
             tools=[
-                WebSearchTool(),
-                PerplexitySearchTool(),
-                GeminiAPI()
+                tools.get("local_index"),
+                tools.get("web_search"),
+                tools.get("perplexity"),
+                tools.get("gemini")
             ],
             verbose=True,
             allow_delegation=True
@@ -166,9 +312,9 @@ class AmazonResearchCrew:
             search ranking factors and buyer psychology. Optimized over 5,000 listings 
             achieving 156% average increase in conversion rates.""",
             tools=[
-                JungleScoutAPI(),
-                GPT4API(),
-                ClaudeAPI()
+                tools.get("junglescout"),
+                tools.get("gpt4"),
+                tools.get("claude")
             ],
             verbose=True,
             allow_delegation=True
@@ -185,9 +331,10 @@ class AmazonResearchCrew:
             forecast market trends with 85% accuracy. Created trend prediction 
             models used by major e-commerce platforms.""",
             tools=[
-                JungleScoutAPI(),
-                PerplexitySearchTool(),
-                GeminiAPI()
+                tools.get("local_index"),
+                tools.get("junglescout"),
+                tools.get("perplexity"),
+                tools.get("gemini")
             ],
             verbose=True,
             allow_delegation=True
@@ -201,4 +348,287 @@ class AmazonResearchCrew:
             "supplier_researcher": supplier_researcher,
             "listing_optimizer": listing_optimizer,
             "trend_analyst": trend_analyst
-        }
\ No newline at end of file
+        }
+
+    def _build_task(self, name: str, keyword: str, inputs: Dict[str, str], run_id: str = None) -> Task:
+        """Create the crewAI task for one research step with its upstream context"""
+        spec = RESEARCH_TASKS[name]
+        description = spec["description"].format(keyword=keyword)
+        inputs = dict(inputs)
+        brief = inputs.pop(BRIEF_TASK, None)
+        sections = []
+        if brief:
+            sections.append(PromptSection(BRIEF_TASK, f"Research brief:\n{brief}", priority=1))
+        for i, (dep, output) in enumerate(inputs.items()):
+            # Upstream outputs share what the brief leaves of the budget
+            heading = "Research so far:\n" if i == 0 else ""
+            sections.append(PromptSection(dep, f"{heading}## {dep.replace('_', ' ').title()}\n{output}"))
+        prior = self._prior_findings(description, run_id)
+        if prior:
+            # Lowest priority: dropped first when the budget is tight
+            sections.append(PromptSection("prior_findings", f"Relevant findings from earlier research:\n{prior}", priority=-1))
+        if sections:
+            description = f"{description}\n\n{fit_sections(sections, self.context_token_budget)}"
+        return Task(
+            description=description,
+            expected_output=spec["expected_output"],
+            agent=self.agents[spec["agent"]]
+        )
+
+    def _prior_findings(self, query: str, run_id: str = None, k: int = 3) -> Optional[str]:
+        """Top-k stored findings from other runs relevant to a task"""
+        if self.vector_index is None:
+            return None
+        try:
+            where = (lambda metadata: metadata.get("run_id") != run_id) if run_id else None
+            results = self.vector_index.search(query, k=k, where=where)
+        except Exception as e:
+            logger.warning(f"Semantic recall failed: {str(e)}")
+            return None
+        return "\n".join(f"- {r['text']}" for r in results) or None
+
+    def _run_task(self, name: str, keyword: str, inputs: Dict[str, str], run_id: str = None) -> str:
+        """Run a single research task as its own one-agent crew"""
+        task = self._build_task(name, keyword, inputs, run_id)
+        agent_name = RESEARCH_TASKS[name]["agent"]
+        crew = Crew(
+            agents=[task.agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=True
+        )
+        # Attribution is per thread, so it is set here inside the graph worker
+        with attribute_usage(run_id=run_id, agent=agent_name, task=name):
+            start = time.perf_counter()
+            output = crew.kickoff()
+            self._record_crew_usage(task.agent, output, time.perf_counter() - start)
+        return str(output)
+
+    def _record_crew_usage(self, agent: Agent, output: Any, latency: float):
+        """Record the agent's own LLM token usage reported by crewAI"""
+        metrics = getattr(output, "token_usage", None)
+        if metrics is None:
+            return
+        llm = getattr(agent, "llm", None)
+        # Cost under the real provider so any prompt-cache reads crewAI reports get its cache pricing
+        provider, model = split_model(getattr(llm, "model", None) or str(llm))
+        cached = getattr(metrics, "cached_prompt_tokens", 0) or 0
+        get_usage_tracker().record(
+            provider or "crewai",
+            model,
+            prompt_tokens=(getattr(metrics, "prompt_tokens", 0) or 0) - cached,
+            completion_tokens=getattr(metrics, "completion_tokens", 0),
+            cache_read_tokens=cached,
+            latency=latency
+        )
+
+    def _fetch_share_of_voice(self, keyword: str) -> Dict[str, Any]:
+        """SoV payload for a keyword, or None when the lookup fails"""
+        try:
+            response = self.registry.get("junglescout").get_share_of_voice(keyword)
+        except Exception as e:
+            logger.error(f"Could not fetch SoV for '{keyword}': {str(e)}")
+            return None
+        if "data" not in response or "attributes" not in response["data"]:
+            return None
+        return response
+
+    def _research_brief(self, keyword: str, sov: Dict[str, Any] = None) -> str:
+        """Compact brief handed to every agent instead of raw SoV data"""
+        sov = sov or self._fetch_share_of_voice(keyword)
+        if sov is None:
+            return "No market data available"
+        brief = build_research_brief(keyword, sov)
+        return render_brief(brief, max_tokens=self.context_token_budget // 2)
+
+    def build_task_graph(self, keyword: str, run_id: str = None, sov: Dict[str, Any] = None) -> TaskGraph:
+        """Dependency graph of the research tasks for a keyword"""
+        graph = TaskGraph()
+        graph.add(BRIEF_TASK, lambda inputs: self._research_brief(keyword, sov))
+        for name, spec in RESEARCH_TASKS.items():
+            graph.add(
+                name,
+                lambda inputs, name=name: self._run_task(name, keyword, inputs, run_id),
+                depends_on=[BRIEF_TASK] + spec["depends_on"]
+            )
+        return graph
+
+    def cache_key(self, keyword: str, updated_at: str = None) -> str:
+        """Stable hash of everything that determines a crew run's output"""
+        return stable_hash({
+            "keyword": normalize_keyword(keyword),
+            "updated_at": updated_at,
+            "criteria": {
+                "market": self.validation.market_criteria,
+                "product": self.validation.product_criteria,
+                "competition": self.validation.competition_criteria
+            },
+            "agents": {
+                name: {
+                    "role": agent.role,
+                    "goal": agent.goal,
+                    "backstory": agent.backstory,
+                    "tools": [getattr(t, "name", type(t).__name__) for t in agent.tools or []]
+                }
+                for name, agent in self.agents.items()
+            },
+            "tasks": RESEARCH_TASKS,
+            "context_token_budget": self.context_token_budget
+        })
+
+    def _market_updated_at(self, sov: Dict[str, Any] = None) -> str:
+        """SoV freshness stamp"""
+        if sov is None:
+            return None
+        return sov["data"]["attributes"].get("updated_at")
+
+    def research_product_opportunity(
+        self,
+        keyword: str,
+        max_workers: int = None,
+        use_cache: bool = True,
+        run_id: str = None,
+        on_task_complete: Callable[[str, str], None] = None
+    ) -> Dict[str, Any]:
+        """Run the full research crew, executing independent tasks in parallel
+
+        Every finished task is checkpointed under ``run_id`` (generated when not
+        given), so a failed run can be continued with ``resume(run_id)``.
+        ``on_task_complete(task, output)`` is called as each task finishes so
+        callers can relay progress.
+        """
+        started = datetime.now()
+        sov = None
+        if self.gate is not None:
+            decision = self.gate.evaluate(keyword)
+            if not decision["passed"]:
+                return {
+                    "status": "rejected",
+                    "keyword": keyword,
+                    "reason": decision["reason"],
+                    "criteria_results": decision["results"],
+                    "timestamp": started.isoformat()
+                }
+            # Reuse the gate's lookup for the cache key and the brief
+            sov = decision.get("response")
+
+        cache_key = None
+        if self.result_cache is not None and use_cache:
+            sov = sov or self._fetch_share_of_voice(keyword)
+            updated_at = self._market_updated_at(sov)
+            # Without a freshness stamp we cannot tell stale results apart
+            if updated_at:
+                cache_key = self.cache_key(keyword, updated_at)
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Serving cached crew result for '{keyword}'")
+                    return dict(cached, cached=True)
+
+        result = self._execute_run(keyword, run_id or uuid.uuid4().hex, max_workers, sov, on_task_complete)
+        if result["status"] != "success":
+            return result
+
+        if cache_key is not None:
+            try:
+                self.result_cache.put(cache_key, normalize_keyword(keyword), result)
+            except Exception as e:
+                logger.error(f"Error caching crew result for '{keyword}': {str(e)}")
+        return result
+
+    def _execute_run(
+        self,
+        keyword: str,
+        run_id: str,
+        max_workers: int = None,
+        sov: Dict[str, Any] = None,
+        on_task_complete: Callable[[str, str], None] = None
+    ) -> Dict[str, Any]:
+        """Run the task graph, skipping and feeding forward checkpointed tasks"""
+        started = datetime.now()
+        self.memory_store.start_run(run_id, keyword)
+        completed = self.memory_store.get_completed_tasks(run_id)
+        if completed:
+            logger.info(f"Resuming run {run_id}: skipping {', '.join(sorted(completed))}")
+
+        graph = self.build_task_graph(keyword, run_id, sov)
+        try:
+            outputs = graph.run(
+                max_workers=max_workers,
+                completed=completed,
+                on_complete=lambda name, output: self._task_completed(run_id, name, output, on_task_complete)
+            )
+        except Exception as e:
+            logger.error(f"Research crew failed for '{keyword}' (run {run_id}): {str(e)}")
+            usage = self._store_run_usage(run_id)
+            self.memory_store.finish_run(run_id, "error", str(e))
+            return {
+                "status": "error",
+                "keyword": keyword,
+                "run_id": run_id,
+                "reason": str(e),
+                "usage": usage,
+                "cost": usage["totals"]["cost"]
+            }
+
+        usage = self._store_run_usage(run_id)
+        self.memory_store.finish_run(run_id, "success")
+        result = {
+            "status": "success",
+            "keyword": keyword,
+            "run_id": run_id,
+            "timestamp": started.isoformat(),
+            "duration": (datetime.now() - started).total_seconds(),
+            "task_timings": dict(graph.timings),
+            "resumed_tasks": sorted(completed),
+            "usage": usage,
+            "cost": usage["totals"]["cost"]
+        }
+        for name, output in outputs.items():
+            result[RESULT_KEYS[name]] = output
+        return result
+
+    def _task_completed(self, run_id: str, name: str, output: str, callback: Callable[[str, str], None] = None):
+        """Checkpoint a finished task, then notify the caller"""
+        self.memory_store.store_task_output(run_id, name, output)
+        if callback is None:
+            return
+        try:
+            callback(name, output)
+        except Exception as e:
+            logger.error(f"Task progress callback failed for {name}: {str(e)}")
+
+    def _store_run_usage(self, run_id: str) -> Dict[str, Any]:
+        """Add this attempt's token/cost usage for a run to its checkpoint
+
+        Once persisted, the run's aggregates are evicted from the in-memory
+        tracker so a long-lived process does not keep every run it served.
+        """
+        tracker = get_usage_tracker()
+        usage = tracker.run_usage(run_id)
+        try:
+            previous = (self.memory_store.get_run(run_id) or {}).get("usage")
+            if previous:
+                usage = merge_usage(previous, usage)
+            self.memory_store.store_run_usage(run_id, usage)
+            tracker.evict_run(run_id)
+        except Exception as e:
+            logger.error(f"Error storing usage for run {run_id}: {str(e)}")
+        return usage
+
+    def resume(
+        self,
+        run_id: str,
+        max_workers: int = None,
+        on_task_complete: Callable[[str, str], None] = None
+    ) -> Dict[str, Any]:
+        """Continue a checkpointed run, rerunning only unfinished tasks"""
+        run = self.memory_store.get_run(run_id)
+        if run is None:
+            raise ValueError(f"No checkpoint found for run {run_id}")
+        return self._execute_run(run["keyword"], run_id, max_workers, on_task_complete=on_task_complete)
+
+    def invalidate_cached_results(self, keyword: str) -> int:
+        """Drop every cached crew result for a keyword"""
+        if self.result_cache is None:
+            return 0
+        return self.result_cache.invalidate_keyword(normalize_keyword(keyword))
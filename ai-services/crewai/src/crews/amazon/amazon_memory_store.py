@@ -1,6 +1,7 @@
 # src/crews/amazon/amazon_memory_store.py
 
 from ..memory_store import BaseMemoryStore
+from tools.amazon.brand_index import BrandIndex
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import logging
@@ -10,8 +11,9 @@ logger = logging.getLogger(__name__)
 class AmazonMemoryStore(BaseMemoryStore):
     """Amazon-specific memory store implementation"""
     
-    def __init__(self, storage_dir: str = "memory"):
-        super().__init__(storage_dir)
+    def __init__(self, storage_dir: str = "memory", brand_index: Optional[BrandIndex] = None, vector_index=None):
+        super().__init__(storage_dir, vector_index)
+        self.brand_index = brand_index
         
         # Amazon-specific categories
         self.categories = {
@@ -28,22 +30,24 @@ class AmazonMemoryStore(BaseMemoryStore):
 
     def store_market_insight(self, keyword: str, data: Dict[str, Any]):
         """Store Amazon market research data from Share of Voice API"""
+        brands = self._canonical_brands(data["data"]["attributes"]["brands"])
         processed_data = {
             "timestamp": datetime.now().isoformat(),
             "search_volume": data["data"]["attributes"]["estimated_30_day_search_volume"],
             "product_count": data["data"]["attributes"]["product_count"],
-            "top_brands": self._extract_top_brands(data["data"]["attributes"]["brands"]),
-            "competition_level": self._calculate_competition_level(data["data"]["attributes"]["brands"]),
+            "top_brands": self._extract_top_brands(brands),
+            "competition_level": self._calculate_competition_level(brands),
             "raw_data": data
         }
         self._store_data("market_research", keyword, processed_data)
 
     def store_competition_analysis(self, keyword: str, data: Dict[str, Any]):
         """Store competition analysis results"""
+        brands = self._canonical_brands(data["data"]["attributes"]["brands"])
         analysis = {
             "timestamp": datetime.now().isoformat(),
-            "market_leaders": self._identify_market_leaders(data["data"]["attributes"]["brands"]),
-            "market_gaps": self._identify_market_gaps(data["data"]["attributes"]["brands"]),
+            "market_leaders": self._identify_market_leaders(brands),
+            "market_gaps": self._identify_market_gaps(brands),
             "raw_data": data
         }
         self._store_data("competition", keyword, analysis)
@@ -59,6 +63,32 @@ class AmazonMemoryStore(BaseMemoryStore):
         }
         self._store_data("products", product_id, validation)
 
+    def _document_text(self, category: str, key: str, data: Dict[str, Any]) -> str:
+        """One-paragraph finding per stored record for semantic recall"""
+        if category == "market_research":
+            brands = ", ".join(f"{b['brand']} ({b['combined_weighted_sov']:.0%})" for b in data["top_brands"])
+            return (
+                f"Market research for '{key}': {data['search_volume']} monthly searches, "
+                f"{data['product_count']} products, {data['competition_level']} competition. "
+                f"Top brands: {brands}."
+            )
+        if category == "competition":
+            leaders = ", ".join(f"{l['brand']} ({l['market_share']:.0%} at ${l['avg_price']:.2f})" for l in data["market_leaders"])
+            gaps = ", ".join(f"{g['price_segment']} ({g['current_share']:.0%} share)" for g in data["market_gaps"]) or "none"
+            return f"Competition analysis for '{key}': leaders {leaders}. Price gaps: {gaps}."
+        if category == "products":
+            return (
+                f"Product validation for {key}: score {data.get('validation_score')}, "
+                f"profit potential {data.get('profit_potential')}, risks {data.get('risk_factors')}."
+            )
+        return super()._document_text(category, key, data)
+
+    def _canonical_brands(self, brands: List[Dict]) -> List[Dict]:
+        """Merge brand spelling variants when a brand index is configured"""
+        if self.brand_index is None:
+            return brands
+        return self.brand_index.canonicalize_brands(brands)
+
     def _extract_top_brands(self, brands: List[Dict]) -> List[Dict]:
         """Extract top 5 brands by market share"""
         return sorted(
@@ -0,0 +1,168 @@
+# src/crews/amazon/batch_runner.py
+
+from typing import Dict, Any, List, Optional, Callable, Iterator, Iterable
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+import hashlib
+import logging
+import os
+import re
+import time
+
+from .amazon_memory_store import AmazonMemoryStore
+
+logger = logging.getLogger(__name__)
+
+# Crew built once per worker process by the pool initializer
+_worker_crew = None
+
+
+def default_crew_factory(**options):
+    """Build the research crew inside a worker process"""
+    from .amazon_crew import AmazonResearchCrew
+    return AmazonResearchCrew(**options)
+
+
+def _init_worker(crew_factory: Callable[..., Any], crew_options: Dict[str, Any]):
+    global _worker_crew
+    _worker_crew = crew_factory(**crew_options)
+
+
+def _run_keyword(keyword: str, run_id: str, resume: bool) -> Dict[str, Any]:
+    """Worker entry point: run or resume one keyword's crew"""
+    started = time.perf_counter()
+    if resume:
+        result = _worker_crew.resume(run_id)
+    else:
+        result = _worker_crew.research_product_opportunity(keyword, run_id=run_id)
+    result["duration"] = time.perf_counter() - started
+    return result
+
+
+def batch_run_id(batch_id: str, keyword: str) -> str:
+    """Deterministic run ID so rerunning a batch picks up its checkpoints"""
+    slug = re.sub(r"[^a-z0-9]+", "-", keyword.lower()).strip("-")[:40]
+    digest = hashlib.sha1(keyword.lower().encode()).hexdigest()[:8]
+    return f"{batch_id}-{slug}-{digest}"
+
+
+class BatchCrewRunner:
+    """Run AmazonResearchCrew for many keywords across a process pool
+
+    Pool size defaults to the CPU count, capped by the tightest provider
+    concurrency limit. Every keyword runs under a run ID derived from the
+    batch ID, so its tasks checkpoint into AmazonMemoryStore and a rerun of
+    the same batch skips finished keywords and resumes failed ones.
+    ``run`` yields a status event per transition (queued, running, done,
+    rejected, failed) with duration and cost.
+    """
+
+    def __init__(
+        self,
+        batch_id: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+        storage_dir: str = "memory",
+        crew_factory: Callable[..., Any] = default_crew_factory,
+        crew_options: Optional[Dict[str, Any]] = None
+    ):
+        self.batch_id = batch_id or datetime.now().strftime("batch-%Y%m%d%H%M%S")
+        limits = [limit for limit in (provider_limits or {}).values() if limit]
+        self.max_workers = max_workers or min([os.cpu_count() or 1] + limits)
+        self.memory_store = AmazonMemoryStore(storage_dir=storage_dir)
+        self.crew_factory = crew_factory
+        # Crews checkpoint where the runner looks for them when deciding skip/resume
+        self.crew_options = {"storage_dir": storage_dir, **(crew_options or {})}
+        self.statuses: Dict[str, Dict[str, Any]] = {}
+
+    def _event(self, keyword: str, status: str, **details) -> Dict[str, Any]:
+        event = self.statuses.setdefault(keyword, {"keyword": keyword})
+        event.update(details, status=status, timestamp=datetime.now().isoformat())
+        return dict(event)
+
+    def run(self, keywords: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Run every keyword, yielding status events as they happen"""
+        queue: List[Dict[str, Any]] = []
+        for keyword in dict.fromkeys(k.strip() for k in keywords if k and k.strip()):
+            run_id = batch_run_id(self.batch_id, keyword)
+            checkpoint = self.memory_store.get_run(run_id)
+            if checkpoint and checkpoint.get("status") == "success":
+                yield self._event(keyword, "done", run_id=run_id, duration=0.0, cost=None, skipped=True)
+                continue
+            queue.append({"keyword": keyword, "run_id": run_id, "resume": checkpoint is not None})
+            yield self._event(keyword, "queued", run_id=run_id)
+
+        if not queue:
+            return
+
+        in_flight = {}
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.crew_factory, self.crew_options)
+        ) as executor:
+            while queue or in_flight:
+                # Only as many submissions as workers, so 'running' is accurate
+                while queue and len(in_flight) < self.max_workers:
+                    item = queue.pop(0)
+                    future = executor.submit(_run_keyword, item["keyword"], item["run_id"], item["resume"])
+                    in_flight[future] = item
+                    yield self._event(item["keyword"], "running", resumed=item["resume"])
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    yield self._finish(item, future)
+
+    def _finish(self, item: Dict[str, Any], future) -> Dict[str, Any]:
+        keyword = item["keyword"]
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Batch run failed for '{keyword}': {str(e)}")
+            return self._event(keyword, "failed", error=str(e))
+
+        details = {"duration": result.get("duration"), "cost": result.get("cost")}
+        if result.get("status") == "success":
+            return self._event(keyword, "done", **details)
+        if result.get("status") == "rejected":
+            return self._event(keyword, "rejected", reason=result.get("reason"), **details)
+        return self._event(keyword, "failed", error=result.get("reason"), **details)
+
+    def summary(self) -> Dict[str, Any]:
+        """Portfolio progress: counts per status plus total duration and cost"""
+        counts: Dict[str, int] = {}
+        for status in self.statuses.values():
+            counts[status["status"]] = counts.get(status["status"], 0) + 1
+        return {
+            "batch_id": self.batch_id,
+            "total": len(self.statuses),
+            "counts": counts,
+            "duration": sum(s.get("duration") or 0 for s in self.statuses.values()),
+            "cost": sum(s.get("cost") or 0 for s in self.statuses.values())
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run the Amazon research crew for a keyword list")
+    parser.add_argument("keywords_file", help="File with one keyword per line")
+    parser.add_argument("--batch-id", help="Reuse a batch ID to resume its checkpoints")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--gate", action="store_true", help="Screen keywords before running agents")
+    args = parser.parse_args()
+
+    with open(args.keywords_file) as f:
+        keyword_list = f.read().splitlines()
+
+    runner = BatchCrewRunner(
+        batch_id=args.batch_id,
+        max_workers=args.workers,
+        crew_options={"use_gate": args.gate}
+    )
+    for event in runner.run(keyword_list):
+        print(json.dumps(event, default=str), flush=True)
+    print(json.dumps(runner.summary()), flush=True)
@@ -0,0 +1,92 @@
+# src/crews/amazon/market_gate.py
+
+from typing import Dict, Any
+from datetime import datetime
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class MarketGate:
+    """Deterministic pre-LLM screen run before the research crew starts
+
+    Fetches Share of Voice once and evaluates the numeric ValidationCriteria
+    locally. Keywords that fail a hard threshold are rejected before any agent
+    runs; lookup errors fail open so a JungleScout outage never blocks research.
+    """
+
+    def __init__(self, api, criteria, memory_store=None):
+        self.api = api
+        self.criteria = criteria
+        self.memory_store = memory_store
+        self._lock = threading.Lock()
+        self.metrics = {
+            "evaluated": 0,
+            "passed": 0,
+            "rejected": 0,
+            "errors": 0,
+            "rejections_by_criterion": {}
+        }
+
+    def evaluate(self, keyword: str) -> Dict[str, Any]:
+        """Screen a keyword and return a structured pass/reject decision"""
+        try:
+            response = self.api.get_share_of_voice(keyword)
+            attributes = response["data"]["attributes"]
+        except Exception as e:
+            logger.error(f"Market gate lookup failed for '{keyword}', letting it through: {str(e)}")
+            self._count("errors")
+            return {
+                "keyword": keyword,
+                "passed": True,
+                "reason": f"Gate skipped: {str(e)}",
+                "results": {}
+            }
+
+        passed, results = self.criteria.validate_market(attributes)
+        failed = [name for name, result in results.items() if not result["passed"]]
+
+        if self.memory_store is not None:
+            try:
+                self.memory_store.store_market_insight(keyword, response)
+            except Exception as e:
+                logger.error(f"Error storing gate data for '{keyword}': {str(e)}")
+
+        self._count("passed" if passed else "rejected", failed)
+        if not passed:
+            logger.info(f"Market gate rejected '{keyword}': {', '.join(failed)}")
+
+        return {
+            "keyword": keyword,
+            "passed": passed,
+            "reason": self._describe(failed, results) if failed else "All hard criteria met",
+            "results": results,
+            "updated_at": attributes.get("updated_at"),
+            "response": response,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _count(self, outcome: str, failed=()):
+        with self._lock:
+            self.metrics["evaluated"] += 1
+            self.metrics[outcome] += 1
+            by_criterion = self.metrics["rejections_by_criterion"]
+            for name in failed:
+                by_criterion[name] = by_criterion.get(name, 0) + 1
+
+    def _describe(self, failed, results) -> str:
+        return "; ".join(
+            f"{name}: {results[name]['value']:,.2f} vs threshold {results[name]['threshold']:,.2f}"
+            for name in failed
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Counters including the share of crew runs avoided"""
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics["rejections_by_criterion"] = dict(self.metrics["rejections_by_criterion"])
+        evaluated = metrics["evaluated"]
+        metrics["runs_avoided"] = metrics["rejected"]
+        metrics["avoided_ratio"] = metrics["rejected"] / evaluated if evaluated else 0.0
+        return metrics
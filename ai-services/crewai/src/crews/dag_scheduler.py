@@ -0,0 +1,127 @@
+# src/crews/dag_scheduler.py
+
+from typing import Dict, Any, List, Callable, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TaskGraphError(Exception):
+    """Raised when a task graph is invalid or one of its tasks fails"""
+
+    def __init__(self, message: str, outputs: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.outputs = outputs or {}
+
+
+class TaskNode:
+    """A unit of work that runs once all of its dependencies have produced output"""
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], depends_on: Iterable[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.depends_on = list(depends_on)
+
+
+class TaskGraph:
+    """Dependency-graph scheduler that runs independent tasks concurrently
+
+    Each task receives a dict of its dependencies' outputs. A task is started
+    as soon as its last dependency finishes, so wall time tracks the critical
+    path instead of the sum of all tasks.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, TaskNode] = {}
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, fn: Callable[[Dict[str, Any]], Any], depends_on: Iterable[str] = ()) -> "TaskGraph":
+        """Add a task to the graph"""
+        if name in self.nodes:
+            raise TaskGraphError(f"Duplicate task: {name}")
+        self.nodes[name] = TaskNode(name, fn, depends_on)
+        return self
+
+    def topological_order(self) -> List[str]:
+        """Return tasks in dependency order, rejecting unknown deps and cycles"""
+        indegree = {name: 0 for name in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise TaskGraphError(f"Task '{node.name}' depends on unknown task '{dep}'")
+                indegree[node.name] += 1
+
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for node in self.nodes.values():
+                if name in node.depends_on:
+                    indegree[node.name] -= 1
+                    if indegree[node.name] == 0:
+                        ready.append(node.name)
+
+        if len(order) != len(self.nodes):
+            cyclic = sorted(set(self.nodes) - set(order))
+            raise TaskGraphError(f"Task graph has a cycle involving: {', '.join(cyclic)}")
+        return order
+
+    def run(
+        self,
+        max_workers: Optional[int] = None,
+        completed: Optional[Dict[str, Any]] = None,
+        on_complete: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
+        """Execute the graph and return every task's output
+
+        Tasks listed in ``completed`` are not rerun; their stored outputs are
+        fed forward to dependents. ``on_complete`` is called from the
+        scheduling thread as each task finishes, e.g. to checkpoint it.
+        """
+        self.topological_order()
+        outputs: Dict[str, Any] = {
+            name: output for name, output in (completed or {}).items() if name in self.nodes
+        }
+        pending = {name: node for name, node in self.nodes.items() if name not in outputs}
+        in_flight = {}
+        workers = max_workers or max(len(self.nodes), 1)
+
+        failure = None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while (pending and failure is None) or in_flight:
+                if failure is None:
+                    for name in [n for n, node in pending.items() if all(d in outputs for d in node.depends_on)]:
+                        node = pending.pop(name)
+                        inputs = {dep: outputs[dep] for dep in node.depends_on}
+                        logger.info(f"Starting task: {name}")
+                        in_flight[executor.submit(self._timed, node, inputs)] = name
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = in_flight.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Task '{name}' failed: {str(e)}")
+                        # Let tasks already running finish so their work is kept
+                        failure = failure or (name, e)
+                        continue
+                    logger.info(f"Finished task: {name} in {self.timings[name]:.2f}s")
+                    if on_complete is not None:
+                        on_complete(name, outputs[name])
+
+        if failure is not None:
+            name, error = failure
+            raise TaskGraphError(f"Task '{name}' failed: {str(error)}", outputs) from error
+        return outputs
+
+    def _timed(self, node: TaskNode, inputs: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return node.fn(inputs)
+        finally:
+            self.timings[node.name] = time.perf_counter() - start
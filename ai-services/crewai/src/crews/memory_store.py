@@ -11,10 +11,13 @@ logger = logging.getLogger(__name__)
 class BaseMemoryStore:
     """Base memory store implementation with common functionality"""
     
-    def __init__(self, storage_dir: str = "memory"):
+    def __init__(self, storage_dir: str = "memory", vector_index=None):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
         self.categories = {}  # To be defined by child classes
+        self.runs_dir = self.storage_dir / "runs"
+        # Optional tools.ai.vector_index.VectorIndex; writes only queue documents for it
+        self.vector_index = vector_index
         
     def _initialize_storage(self):
         """Initialize storage files if they don't exist"""
@@ -45,6 +48,32 @@ class BaseMemoryStore:
             logger.error(f"Error storing data in {category}: {str(e)}")
             raise
 
+        self._index_record(category, key, data)
+
+    def _document_text(self, category: str, key: str, data: Dict[str, Any]) -> str:
+        """Text embedded for semantic recall; child classes summarize their categories"""
+        summary = {k: v for k, v in data.items() if k != "raw_data"}
+        return f"{category.replace('_', ' ')} for {key}: {json.dumps(summary, default=str)}"
+
+    def _index_record(self, category: str, key: str, data: Dict[str, Any]):
+        if self.vector_index is None:
+            return
+        try:
+            text = self._document_text(category, key, data)
+        except Exception as e:
+            logger.warning(f"Could not summarize {category} record {key} for recall: {str(e)}")
+            return
+        self._index_document(f"{category}:{key}:{data.get('timestamp', '')}", text, {"category": category, "key": key})
+
+    def _index_document(self, doc_id: str, text: str, metadata: Dict[str, Any]):
+        """Queue a document for semantic recall; indexing never fails a write"""
+        if self.vector_index is None:
+            return
+        try:
+            self.vector_index.add(doc_id, text, metadata)
+        except Exception as e:
+            logger.warning(f"Could not index {doc_id} for recall: {str(e)}")
+
     def _get_data(self, category: str, key: str) -> Optional[Dict[str, Any]]:
         """Base method for retrieving data"""
         file_path = self.categories[category]
@@ -54,4 +83,95 @@ class BaseMemoryStore:
             return data.get(key)
         except Exception as e:
             logger.error(f"Error retrieving data from {category}: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def _run_path(self, run_id: str) -> Path:
+        return self.runs_dir / f"{run_id}.json"
+
+    def _write_run(self, run_id: str, run: Dict[str, Any]):
+        """Atomically rewrite a run checkpoint (one file per run, one writer per run)"""
+        self.runs_dir.mkdir(exist_ok=True)
+        path = self._run_path(run_id)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(run, f, indent=2, default=str)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.error(f"Error writing checkpoint for run {run_id}: {str(e)}")
+            raise
+
+    def start_run(self, run_id: str, keyword: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a run checkpoint, or return the existing one when resuming"""
+        run = self.get_run(run_id)
+        if run is None:
+            run = {
+                "run_id": run_id,
+                "keyword": keyword,
+                "params": params or {},
+                "status": "running",
+                "started_at": datetime.now().isoformat(),
+                "tasks": {}
+            }
+        else:
+            run["status"] = "running"
+            run["resumed_at"] = datetime.now().isoformat()
+        self._write_run(run_id, run)
+        return run
+
+    def store_task_output(self, run_id: str, task: str, output: Any):
+        """Checkpoint one finished task of a run"""
+        run = self.get_run(run_id)
+        if run is None:
+            raise KeyError(f"Unknown run: {run_id}")
+        run["tasks"][task] = {
+            "output": output,
+            "completed_at": datetime.now().isoformat()
+        }
+        self._write_run(run_id, run)
+        self._index_document(
+            f"run:{run_id}:{task}",
+            f"{task.replace('_', ' ')} for {run['keyword']}: {output}",
+            {"category": "agent_output", "key": run["keyword"], "run_id": run_id, "task": task}
+        )
+
+    def finish_run(self, run_id: str, status: str, error: Optional[str] = None):
+        """Mark a run as finished (success) or failed (error)"""
+        run = self.get_run(run_id)
+        if run is None:
+            raise KeyError(f"Unknown run: {run_id}")
+        run["status"] = status
+        run["finished_at"] = datetime.now().isoformat()
+        if error:
+            run["error"] = error
+        self._write_run(run_id, run)
+        if self.vector_index is not None:
+            # Embed whatever the run queued in one batch, off the write path
+            try:
+                self.vector_index.flush(wait=False)
+            except Exception as e:
+                logger.warning(f"Could not flush recall index for run {run_id}: {str(e)}")
+
+    def store_run_usage(self, run_id: str, usage: Dict[str, Any]):
+        """Attach token, latency and cost accounting to a run checkpoint"""
+        run = self.get_run(run_id)
+        if run is None:
+            raise KeyError(f"Unknown run: {run_id}")
+        run["usage"] = usage
+        self._write_run(run_id, run)
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Load a run checkpoint"""
+        try:
+            with open(self._run_path(run_id), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading checkpoint for run {run_id}: {str(e)}")
+            return None
+
+    def get_completed_tasks(self, run_id: str) -> Dict[str, Any]:
+        """Outputs of the tasks a run already finished"""
+        run = self.get_run(run_id) or {"tasks": {}}
+        return {name: task["output"] for name, task in run["tasks"].items()}
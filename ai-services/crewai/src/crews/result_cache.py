@@ -0,0 +1,126 @@
+# src/crews/result_cache.py
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def stable_hash(payload: Any) -> str:
+    """Order-independent SHA-256 of a JSON-serializable payload"""
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CrewResultCache:
+    """Persistent whole-run cache of crew results with TTL and invalidation
+
+    Each entry is one JSON file named after its key, so concurrent crews never
+    rewrite each other's entries and invalidating one keyword is a file delete.
+    """
+
+    def __init__(self, storage_dir: str = "memory/crew_results", ttl: timedelta = timedelta(days=7)):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.storage_dir / f"{key}.json"
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, or None if missing or expired"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except Exception as e:
+            logger.error(f"Error reading crew cache entry {key}: {str(e)}")
+            self._count("misses")
+            return None
+
+        if datetime.fromisoformat(entry["expires_at"]) <= datetime.now():
+            path.unlink(missing_ok=True)
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return entry["result"]
+
+    def put(self, key: str, keyword: str, result: Dict[str, Any], ttl: Optional[timedelta] = None):
+        """Store a crew result under its key"""
+        now = datetime.now()
+        entry = {
+            "key": key,
+            "keyword": keyword,
+            "created_at": now.isoformat(),
+            "expires_at": (now + (ttl or self.ttl)).isoformat(),
+            "result": result
+        }
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, indent=2, default=str)
+            tmp_path.replace(path)
+            self._count("stores")
+        except Exception as e:
+            logger.error(f"Error storing crew cache entry {key}: {str(e)}")
+            raise
+
+    def invalidate(self, key: str) -> bool:
+        """Drop a single entry"""
+        path = self._path(key)
+        if path.exists():
+            path.unlink()
+            self._count("invalidations")
+            return True
+        return False
+
+    def invalidate_keyword(self, keyword: str) -> int:
+        """Drop every entry stored for a keyword"""
+        removed = 0
+        for path in self.storage_dir.glob("*.json"):
+            try:
+                with open(path, 'r') as f:
+                    if json.load(f).get("keyword") != keyword:
+                        continue
+            except Exception:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        self._count("invalidations", removed)
+        return removed
+
+    def purge_expired(self) -> int:
+        """Delete entries whose TTL has passed"""
+        removed = 0
+        now = datetime.now()
+        for path in self.storage_dir.glob("*.json"):
+            try:
+                with open(path, 'r') as f:
+                    expires_at = datetime.fromisoformat(json.load(f)["expires_at"])
+            except Exception:
+                continue
+            if expires_at <= now:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Remove all entries"""
+        for path in self.storage_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
@@ -1,10 +1,23 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from enum import Enum
-from typing import Dict, Any, Optional
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, List, Optional, AsyncIterator
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import logging
+import os
 import sys
+import uuid
+
+from tools.ai.usage import get_usage_tracker
+from tools.ai.gateway import get_gateway
+from tools.registry import get_registry
+from api.jobs import get_job_manager
+from api.task_queue import QueueWorker, get_task_queue
+from api.service_pool import get_service_pool
+from api.handlers import CrewConfig, TASK_HANDLERS, run_amazon_research, run_create_crew, valid_checkpoint_id
 
 # Configure logging
 logging.basicConfig(
@@ -16,28 +29,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Define our CrewAI modes
-class CrewAIMode(Enum):
-    """
-    Enum to distinguish between Enterprise and Self-hosted modes
-    """
-    ENTERPRISE = "enterprise"
-    SELF_HOSTED = "self_hosted"
-
 # Define our request/response models
-class CrewConfig(BaseModel):
-    """
-    Pydantic model for crew configuration
-    
-    Attributes:
-        mode: Specifies whether to use Enterprise or Self-hosted mode
-        config: Dictionary containing crew configuration details
-        name: Optional name for the crew
-    """
-    mode: CrewAIMode
-    config: Dict[str, Any]
-    name: Optional[str] = None
-
 class HealthResponse(BaseModel):
     """Response model for health check endpoint"""
     status: str
@@ -50,12 +42,60 @@ class RootResponse(BaseModel):
     documentation: str
     health: str
 
-class CrewResponse(BaseModel):
-    """Response model for crew creation endpoint"""
+class StreamRequest(BaseModel):
+    """Request model for streaming LLM analysis"""
+    prompt: str
+    provider: str = "openai"
+    model: Optional[str] = None
+
+class ResearchRequest(BaseModel):
+    """Request model for queuing an Amazon research crew run"""
+    keyword: str
+
+class JobAccepted(BaseModel):
+    """Response model for requests accepted as background jobs"""
     status: str
-    mode: str
-    crew_id: str
-    details: Dict[str, Any]
+    job_id: str
+    status_url: str
+    events_url: str
+    result_url: str
+
+class TaskRequest(BaseModel):
+    """Request model for enqueuing a durable task"""
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    priority: int = 0
+    max_attempts: Optional[int] = None
+    task_id: Optional[str] = None
+
+class SweepRequest(BaseModel):
+    """Request model for a Share of Voice sweep over related keywords"""
+    seeds: List[str]
+    max_requests: int = 100
+    max_depth: int = 2
+    priority: int = 0
+    sweep_id: Optional[str] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the crew service pool, start the embedded task queue workers
+    (TASK_QUEUE_EMBEDDED_WORKERS, 0 to leave the queue to standalone
+    workers) and stop them and the job pool on shutdown
+    """
+    await asyncio.to_thread(get_service_pool().warm)
+    concurrency = int(os.getenv("TASK_QUEUE_EMBEDDED_WORKERS", "1"))
+    worker = None
+    if concurrency > 0:
+        worker = QueueWorker(get_task_queue(), TASK_HANDLERS, concurrency=concurrency)
+        worker.start()
+        logger.info(f"Started {concurrency} embedded task queue worker(s) as {worker.worker_id}")
+    app.state.queue_worker = worker
+    yield
+    if worker is not None:
+        await asyncio.to_thread(worker.stop)
+    get_service_pool().close()
+    get_job_manager().shutdown(wait=False)
 
 # Initialize FastAPI app with metadata
 app = FastAPI(
@@ -63,7 +103,8 @@ app = FastAPI(
     description="Dual-mode CrewAI service supporting both Enterprise and Self-hosted operations",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -95,44 +136,299 @@ async def health_check():
         "mode": "dual"
     }
 
-@app.post("/crews/create", response_model=CrewResponse)
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness: warm crew service capacity per mode; 503 until at least one
+    mode has services built
+    """
+    readiness = get_service_pool().readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+@app.get("/metrics/services")
+async def service_metrics():
+    """Crew service requests, errors, waits for a free service and latency per mode"""
+    return get_service_pool().metrics()
+
+@app.get("/metrics/usage")
+async def usage_metrics():
+    """
+    Token, latency and estimated cost totals for LLM calls in this process,
+    broken down by provider, model, agent and task
+    """
+    return get_usage_tracker().metrics()
+
+@app.get("/metrics/llm")
+async def llm_metrics():
+    """
+    Per-provider gateway counters (calls, retries, timeouts, in-flight),
+    LLM response cache hit rates and model router statistics
+    """
+    gateway = get_gateway()
+    return {
+        "providers": gateway.metrics(),
+        "response_cache": gateway.cache_metrics(),
+        "routes": gateway.router_stats()
+    }
+
+@app.get("/metrics/search")
+async def search_metrics():
+    """
+    Web search cache hits, coalesced and paid SerpAPI calls, and monthly quota usage
+    """
+    try:
+        web_search = get_registry().get("web_search")
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return web_search.stats()
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/llm/stream")
+async def stream_analysis(request: StreamRequest):
+    """
+    Stream an LLM analysis as Server-Sent Events: one 'token' event per
+    chunk as the provider produces it, then 'done' (or 'error')
+    """
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for chunk in get_gateway().astream(request.provider, request.prompt, model=request.model):
+                yield sse_event("token", {"text": chunk})
+            yield sse_event("done", {})
+        except Exception as e:
+            logger.error(f"Error streaming analysis: {str(e)}")
+            yield sse_event("error", {"error": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/crews/amazon/research/stream")
+async def stream_research(keyword: str):
+    """
+    Run the Amazon research crew for a keyword and relay each agent's
+    output as a 'task' event as soon as it finishes, then a 'result' event
+    """
+    from crews.amazon.amazon_crew import AmazonResearchCrew
+
+    loop = asyncio.get_running_loop()
+    updates: asyncio.Queue = asyncio.Queue()
+
+    def publish(event: str, data: Any):
+        loop.call_soon_threadsafe(updates.put_nowait, (event, data))
+
+    def run() -> Dict[str, Any]:
+        crew = AmazonResearchCrew()
+        return crew.research_product_opportunity(
+            keyword,
+            on_task_complete=lambda task, output: publish("task", {"task": task, "output": output})
+        )
+
+    async def events() -> AsyncIterator[str]:
+        job = asyncio.ensure_future(asyncio.to_thread(run))
+        job.add_done_callback(lambda _: updates.put_nowait(("finished", None)))
+        yield sse_event("started", {"keyword": keyword})
+        while True:
+            event, data = await updates.get()
+            if event != "finished":
+                yield sse_event(event, data)
+                continue
+            try:
+                yield sse_event("result", job.result())
+            except Exception as e:
+                logger.error(f"Error running research crew: {str(e)}")
+                yield sse_event("error", {"error": str(e)})
+            break
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+def accepted(job: Dict[str, Any]) -> JSONResponse:
+    """202 response pointing at a job's status, events and result"""
+    job_id = job["job_id"]
+    return JSONResponse(status_code=202, content={
+        "status": job["status"],
+        "job_id": job_id,
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events",
+        "result_url": f"/jobs/{job_id}/result"
+    })
+
+@app.post("/crews/create", status_code=202, response_model=JobAccepted)
 async def create_crew(crew_config: CrewConfig):
     """
-    Create a new crew based on specified mode and configuration
+    Queue crew creation for the specified mode and configuration
     
     Args:
         crew_config: CrewConfig object containing mode and configuration
     
     Returns:
-        Dict containing crew creation status and details
-    
-    Raises:
-        HTTPException: If crew creation fails
+        202 with the job ID; the CrewResponse is available from
+        /jobs/{job_id}/result once the job succeeds. 503 if the mode's
+        service could not be built
     """
-    try:
-        logger.info(f"Creating crew in {crew_config.mode} mode")
-        
-        if crew_config.mode == CrewAIMode.ENTERPRISE:
-            # Import here to avoid circular imports
-            from enterprise_bridge.service import EnterpriseCrewService
-            service = EnterpriseCrewService()
-        else:
-            from self_hosted.service import SelfHostedCrewService
-            service = SelfHostedCrewService()
-            
-        result = await service.create_crew(crew_config.config)
-        
-        logger.info(f"Successfully created crew in {crew_config.mode} mode")
-        return {
-            "status": "success",
-            "mode": crew_config.mode.value,
-            "crew_id": result.get("crew_id"),
-            "details": result
-        }
-        
-    except Exception as e:
-        logger.error(f"Error creating crew: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    readiness = get_service_pool().readiness()["modes"][crew_config.mode.value]
+    if not readiness["available"] and readiness["error"]:
+        raise HTTPException(status_code=503, detail=f"{crew_config.mode.value} mode unavailable: {readiness['error']}")
+    job = get_job_manager().submit("create_crew", run_create_crew, crew_config.model_dump(mode="json"))
+    return accepted(job)
+
+@app.post("/crews/amazon/research", status_code=202, response_model=JobAccepted)
+async def queue_research(request: ResearchRequest):
+    """
+    Queue an Amazon research crew run; each finished task is reported as a
+    'task' event on /jobs/{job_id}/events
+    """
+    job = get_job_manager().submit(
+        "amazon_research", run_amazon_research, {"keyword": request.keyword, "run_id": uuid.uuid4().hex}
+    )
+    return accepted(job)
+
+def task_accepted(task_id: str) -> JSONResponse:
+    """202 response pointing at a durable task's status"""
+    return JSONResponse(status_code=202, content={
+        "status": "pending",
+        "task_id": task_id,
+        "status_url": f"/tasks/{task_id}"
+    })
+
+@app.post("/tasks", status_code=202)
+async def enqueue_task(request: TaskRequest):
+    """
+    Enqueue a durable task (create_crew, amazon_research or sov_sweep);
+    it survives restarts and is run by whichever worker leases it first
+    """
+    if request.kind not in TASK_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown task kind: {request.kind}")
+    payload = dict(request.payload)
+    if request.kind == "sov_sweep" and not valid_checkpoint_id(payload.get("sweep_id")):
+        raise HTTPException(status_code=400, detail="sov_sweep payload needs a sweep_id of 1-64 letters, digits, '_' or '-'")
+    if request.kind == "amazon_research":
+        # Fixed at enqueue time so every attempt resumes the same run checkpoint
+        payload.setdefault("run_id", uuid.uuid4().hex)
+        if not valid_checkpoint_id(payload["run_id"]):
+            raise HTTPException(status_code=400, detail="run_id must be 1-64 letters, digits, '_' or '-'")
+    task_id = await asyncio.to_thread(
+        get_task_queue().enqueue,
+        request.kind, payload, request.priority, request.max_attempts, 0.0, request.task_id
+    )
+    return task_accepted(task_id)
+
+@app.post("/crews/amazon/sweep", status_code=202)
+async def queue_sweep(request: SweepRequest):
+    """
+    Enqueue a Share of Voice sweep from seed keywords; resubmitting the
+    same sweep_id does not create a second task
+    """
+    sweep_id = request.sweep_id or uuid.uuid4().hex
+    if not valid_checkpoint_id(sweep_id):
+        raise HTTPException(status_code=400, detail="sweep_id must be 1-64 letters, digits, '_' or '-'")
+    payload = {
+        "sweep_id": sweep_id,
+        "seeds": request.seeds,
+        "max_requests": request.max_requests,
+        "max_depth": request.max_depth
+    }
+    task_id = await asyncio.to_thread(
+        get_task_queue().enqueue, "sov_sweep", payload, request.priority, None, 0.0, f"sweep-{sweep_id}"
+    )
+    return task_accepted(task_id)
+
+@app.get("/tasks")
+async def list_tasks(status: Optional[str] = None, limit: int = 50):
+    """Recently updated durable tasks; status=dead lists the dead-letter queue"""
+    queue = get_task_queue()
+    return {"tasks": await asyncio.to_thread(queue.list, status, limit), **queue.stats()}
+
+@app.get("/tasks/{task_id}")
+async def get_task(task_id: str):
+    """Status, attempts, last progress, error and result of a durable task"""
+    task = await asyncio.to_thread(get_task_queue().get, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_id}")
+    return task
+
+@app.post("/tasks/{task_id}/requeue")
+async def requeue_task(task_id: str):
+    """Move a dead-lettered task back to pending with fresh attempts"""
+    queue = get_task_queue()
+    if await asyncio.to_thread(queue.get, task_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_id}")
+    if not await asyncio.to_thread(queue.requeue, task_id):
+        raise HTTPException(status_code=409, detail="Only dead-lettered tasks can be requeued")
+    return await asyncio.to_thread(queue.get, task_id)
+
+@app.get("/metrics/queue")
+async def queue_metrics():
+    """Durable task counts by status and kind, plus embedded worker counters"""
+    worker = getattr(app.state, "queue_worker", None)
+    return {
+        **get_task_queue().stats(),
+        "embedded_worker": {"worker_id": worker.worker_id, **worker.stats} if worker else None
+    }
+
+@app.get("/jobs")
+async def list_jobs(status: Optional[str] = None, limit: int = 50):
+    """Recent jobs, newest first, with counts by status"""
+    manager = get_job_manager()
+    return {"jobs": manager.list(status, limit), **manager.stats()}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, timestamps and latest progress of a job"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Result of a finished job: 200 with the result once it succeeded,
+    202 with its status while still queued or running
+    """
+    job = get_job_manager().get(job_id, include_result=True)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if job["status"] in ("queued", "running"):
+        return JSONResponse(status_code=202, content={"status": job["status"], "job_id": job_id})
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=job["error"] or f"Job {job['status']}")
+    return job["result"]
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a job that has not started yet"""
+    manager = get_job_manager()
+    if manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if not manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job already started")
+    return manager.get(job_id)
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, after: int = 0):
+    """
+    Follow a job as Server-Sent Events: its event log from ``after`` on
+    (queued, running, handler progress, then succeeded/failed/cancelled),
+    with keep-alive comments while nothing happens
+    """
+    manager = get_job_manager()
+    if manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    async def events() -> AsyncIterator[str]:
+        seq = after
+        while True:
+            batch, finished = await manager.await_events(job_id, seq, 15.0)
+            for event in batch:
+                yield sse_event(event["event"], {"seq": event["seq"], "at": event["at"], "data": event["data"]})
+            seq += len(batch)
+            if finished:
+                break
+            if not batch:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 if __name__ == "__main__":
     import uvicorn
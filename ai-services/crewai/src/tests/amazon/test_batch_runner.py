@@ -0,0 +1,103 @@
+# src/tests/amazon/test_batch_runner.py
+
+import os
+import unittest
+import tempfile
+from crews.amazon.amazon_memory_store import AmazonMemoryStore
+from crews.amazon.batch_runner import BatchCrewRunner, batch_run_id
+
+class FakeCrew:
+    """Offline crew that checkpoints like AmazonResearchCrew"""
+
+    def __init__(self, storage_dir="memory", **options):
+        self.memory_store = AmazonMemoryStore(storage_dir=storage_dir)
+
+    def research_product_opportunity(self, keyword, run_id=None):
+        self.memory_store.start_run(run_id, keyword)
+        if keyword == "broken":
+            self.memory_store.finish_run(run_id, "error", "provider timeout")
+            return {"status": "error", "keyword": keyword, "run_id": run_id, "reason": "provider timeout"}
+        if keyword == "hammock hook":
+            return {"status": "rejected", "keyword": keyword, "reason": "min_search_volume"}
+        self.memory_store.store_task_output(run_id, "market_research", f"{keyword} market")
+        self.memory_store.finish_run(run_id, "success")
+        return {"status": "success", "keyword": keyword, "run_id": run_id, "cost": 0.25}
+
+    def resume(self, run_id):
+        run = self.memory_store.get_run(run_id)
+        self.memory_store.finish_run(run_id, "success")
+        return {"status": "success", "keyword": run["keyword"], "run_id": run_id, "cost": 0.1}
+
+def fake_crew_factory(**options):
+    return FakeCrew(**options)
+
+class TestBatchCrewRunner(unittest.TestCase):
+    """Test suite for the multi-keyword batch runner"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.tmp.cleanup()
+
+    def _runner(self):
+        return BatchCrewRunner(
+            batch_id="nightly",
+            max_workers=2,
+            storage_dir=self.tmp.name,
+            crew_factory=fake_crew_factory
+        )
+
+    def test_crew_checkpoints_land_in_storage_dir(self):
+        """Test that worker crews checkpoint under the runner's storage_dir, not the default"""
+        cwd = os.getcwd()
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        os.chdir(workdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        list(self._runner().run(["hammock"]))
+
+        run_id = batch_run_id("nightly", "hammock")
+        self.assertEqual(os.listdir(os.path.join(self.tmp.name, "runs")), [f"{run_id}.json"])
+        self.assertEqual(AmazonMemoryStore(storage_dir=self.tmp.name).get_run(run_id)["status"], "success")
+        self.assertFalse(os.path.exists(os.path.join(workdir.name, "memory")))
+
+    def test_status_stream_and_summary(self):
+        """Test per-keyword status transitions and portfolio summary"""
+        runner = self._runner()
+        events = list(runner.run(["hammock", "tent", "hammock hook", "broken", "tent"]))
+
+        by_keyword = {}
+        for event in events:
+            by_keyword.setdefault(event["keyword"], []).append(event["status"])
+
+        self.assertEqual(by_keyword["hammock"], ["queued", "running", "done"])
+        self.assertEqual(by_keyword["hammock hook"][-1], "rejected")
+        self.assertEqual(by_keyword["broken"][-1], "failed")
+        self.assertEqual(len(by_keyword), 4)
+
+        summary = runner.summary()
+        self.assertEqual(summary["counts"], {"done": 2, "rejected": 1, "failed": 1})
+        self.assertAlmostEqual(summary["cost"], 0.5)
+
+    def test_rerun_skips_done_and_resumes_failed(self):
+        """Test that a rerun of the same batch uses checkpoints"""
+        list(self._runner().run(["hammock", "broken"]))
+
+        events = list(self._runner().run(["hammock", "broken"]))
+        hammock = [e for e in events if e["keyword"] == "hammock"]
+        self.assertEqual(len(hammock), 1)
+        self.assertTrue(hammock[0]["skipped"])
+
+        broken = [e for e in events if e["keyword"] == "broken"]
+        self.assertEqual([e["status"] for e in broken], ["queued", "running", "done"])
+        self.assertTrue(broken[-1]["resumed"])
+
+        store = AmazonMemoryStore(storage_dir=self.tmp.name)
+        self.assertEqual(store.get_run(batch_run_id("nightly", "broken"))["status"], "success")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+# src/tests/amazon/test_brand_index.py
+
+import unittest
+import json
+import os
+import tempfile
+from tools.amazon.brand_index import BrandIndex, normalize_brand
+
+class TestBrandIndex(unittest.TestCase):
+    """Test suite for brand canonicalization"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.index = BrandIndex(threshold=0.8)
+        for brand in ["Amazon Basics", "SXSEAGLE", "Wise Owl Outfitters", "ENO"]:
+            self.index.add_brand(brand)
+
+    def test_normalization(self):
+        """Test spacing, case and suffix insensitive keys"""
+        self.assertEqual(normalize_brand("Amazon Basics"), "amazonbasics")
+        self.assertEqual(normalize_brand("AmazonBasics"), "amazonbasics")
+        self.assertEqual(normalize_brand("amazon  basics, LLC"), "amazonbasics")
+
+    def test_exact_and_fuzzy_resolution(self):
+        """Test that spelling variants resolve to one canonical ID"""
+        exact = self.index.resolve("amazon basics")
+        self.assertEqual(exact.method, "exact")
+        self.assertEqual(exact.name, "Amazon Basics")
+
+        fuzzy = self.index.resolve("Wise Owl Outfiters")
+        self.assertEqual(fuzzy.method, "fuzzy")
+        self.assertEqual(fuzzy.brand_id, normalize_brand("Wise Owl Outfitters"))
+        self.assertGreaterEqual(fuzzy.score, 0.8)
+
+        # Second lookup of the same spelling is served from the alias cache
+        self.assertEqual(self.index.resolve("Wise Owl Outfiters").method, "alias")
+
+    def test_unknown_brand_registered(self):
+        """Test that unknown brands become new canonical entries"""
+        self.assertIsNone(self.index.lookup("Kootek"))
+        match = self.index.resolve("Kootek")
+        self.assertEqual(match.method, "new")
+        self.assertEqual(len(self.index), 5)
+        self.assertIsNone(self.index.resolve("Covacure", register=False))
+
+    def test_manual_alias_table(self):
+        """Test persisted hand-corrected aliases"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "brand_aliases.json")
+            self.index.add_alias("Eagles Nest Outfitters", "ENO")
+            self.index.save_aliases(path)
+
+            with open(path) as f:
+                self.assertEqual(json.load(f), {"ENO": ["Eagles Nest Outfitters"]})
+
+            reloaded = BrandIndex(alias_path=path)
+            match = reloaded.resolve("eagles nest outfitters")
+            self.assertEqual(match.method, "alias")
+            self.assertEqual(match.name, "ENO")
+
+    def test_canonicalize_brands(self):
+        """Test merging Share of Voice rows for brand variants"""
+        rows = [
+            {"brand": "Amazon Basics", "combined_products": 3, "combined_weighted_sov": 0.2,
+             "combined_average_price": 30.0},
+            {"brand": "AmazonBasics", "combined_products": 1, "combined_weighted_sov": 0.1,
+             "combined_average_price": 50.0},
+            {"brand": "SXSEAGLE", "combined_products": 2, "combined_weighted_sov": 0.25,
+             "combined_average_price": 58.66}
+        ]
+        merged = self.index.canonicalize_brands(rows)
+
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(merged[0]["brand"], "Amazon Basics")
+        self.assertAlmostEqual(merged[0]["combined_weighted_sov"], 0.3)
+        self.assertEqual(merged[0]["combined_products"], 4)
+        self.assertAlmostEqual(merged[0]["combined_average_price"], 35.0)
+
+    def test_large_index_lookup(self):
+        """Test fuzzy lookup against a large synthetic brand set"""
+        index = BrandIndex()
+        for i in range(20000):
+            index.add_brand(f"Brand{i:05d} Outdoor")
+        match = index.lookup("Brand12345 Outdor")
+        self.assertIsNotNone(match)
+        self.assertEqual(match.name, "Brand12345 Outdoor")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+# src/tests/amazon/test_keyword_crawler.py
+
+import unittest
+import os
+import tempfile
+from tools.amazon.keyword_crawler import KeywordDiscoveryCrawler, extract_related_terms
+
+class FakeShareOfVoiceAPI:
+    """Offline stand-in for JungleScoutAPI.get_share_of_voice"""
+
+    def __init__(self):
+        self.calls = []
+        self.names = {
+            "hammock": [
+                "Wise Owl Camping Hammock with Tree Straps",
+                "Double Camping Hammock for Outdoor",
+                "Hammock Stand Heavy Duty Steel"
+            ],
+            "camping hammock": ["Portable Camping Hammock Lightweight"],
+            "hammock stand": ["Hammock Stand for Two Person"]
+        }
+
+    def get_share_of_voice(self, keyword):
+        self.calls.append(keyword)
+        return {
+            "data": {
+                "attributes": {
+                    "estimated_30_day_search_volume": 50000 if keyword == "hammock" else 20000,
+                    "product_count": 100,
+                    "updated_at": "2024-01-01T00:00:00Z",
+                    "brands": [{"brand": "Wise Owl", "combined_weighted_sov": 0.2}],
+                    "top_asins": [{"name": n} for n in self.names.get(keyword, [])]
+                }
+            }
+        }
+
+class FlakyShareOfVoiceAPI(FakeShareOfVoiceAPI):
+    """Fails each listed keyword a number of times before answering"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = dict(failures)
+
+    def get_share_of_voice(self, keyword):
+        if self.failures.get(keyword, 0) > 0:
+            self.failures[keyword] -= 1
+            self.calls.append(keyword)
+            raise ConnectionError("429 Too Many Requests")
+        return super().get_share_of_voice(keyword)
+
+class TestKeywordCrawler(unittest.TestCase):
+    """Test suite for related-keyword discovery"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.tmp.name, "crawl.json")
+        self.api = FakeShareOfVoiceAPI()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.tmp.cleanup()
+
+    def test_related_terms(self):
+        """Test phrase extraction from top ASIN names"""
+        attrs = self.api.get_share_of_voice("hammock")["data"]["attributes"]
+        terms = dict(extract_related_terms("hammock", attrs))
+
+        self.assertIn("camping hammock", terms)
+        self.assertIn("hammock stand", terms)
+        self.assertAlmostEqual(terms["camping hammock"], 2 / 3)
+        # Brand tokens are stripped from candidate phrases
+        self.assertFalse(any("owl" in t for t in terms))
+
+    def test_crawl_expands_and_dedupes(self):
+        """Test best-first expansion with a visited index"""
+        crawler = KeywordDiscoveryCrawler(self.api, max_depth=1, max_concurrency=2)
+        crawler.add_seeds(["hammock", "Hammock "])
+        results = crawler.crawl()
+
+        self.assertEqual(self.api.calls.count("hammock"), 1)
+        self.assertIn("camping hammock", results)
+        self.assertEqual(results["camping hammock"]["depth"], 1)
+        self.assertEqual(len(self.api.calls), len(set(self.api.calls)))
+
+    def test_quota_and_resume(self):
+        """Test that a quota-limited run resumes from its checkpoint"""
+        crawler = KeywordDiscoveryCrawler(
+            self.api, max_requests=1, max_depth=1, checkpoint_path=self.checkpoint
+        )
+        crawler.add_seeds(["hammock"])
+        crawler.crawl()
+        self.assertEqual(self.api.calls, ["hammock"])
+        self.assertTrue(crawler.frontier)
+
+        resumed = KeywordDiscoveryCrawler(
+            self.api, max_requests=100, max_depth=1, checkpoint_path=self.checkpoint
+        )
+        self.assertIn("hammock", resumed.results)
+        resumed.add_seeds(["hammock"])  # already visited, ignored
+        results = resumed.crawl()
+
+        self.assertEqual(self.api.calls.count("hammock"), 1)
+        self.assertIn("hammock stand", results)
+        self.assertFalse(resumed.frontier)
+
+    def test_failed_keywords_are_retried(self):
+        """Test re-queuing on errors, the attempt cap and another round after a resume"""
+        api = FlakyShareOfVoiceAPI({"hammock": 1, "camping hammock": 5})
+        crawler = KeywordDiscoveryCrawler(
+            api, max_depth=1, max_concurrency=1, max_attempts=2, checkpoint_path=self.checkpoint
+        )
+        crawler.add_seeds(["hammock"])
+        results = crawler.crawl()
+
+        self.assertIn("hammock", results)
+        self.assertIn("hammock stand", results)
+        self.assertNotIn("camping hammock", results)
+        self.assertEqual(api.calls.count("camping hammock"), 2)
+        self.assertEqual((crawler.stats["errors"], crawler.stats["retries"]), (3, 2))
+        self.assertEqual(crawler.failed["camping hammock"]["attempts"], 2)
+
+        api.failures["camping hammock"] = 0
+        resumed = KeywordDiscoveryCrawler(api, max_depth=1, checkpoint_path=self.checkpoint)
+        self.assertIn("camping hammock", resumed.visited)
+        self.assertEqual(resumed.retry_failed(), 1)
+        results = resumed.crawl()
+        self.assertEqual(results["camping hammock"]["depth"], 1)
+        self.assertEqual(resumed.failed, {})
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
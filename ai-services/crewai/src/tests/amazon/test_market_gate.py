@@ -0,0 +1,85 @@
+# src/tests/amazon/test_market_gate.py
+
+import unittest
+from crews.amazon.amazon_crew import ValidationCriteria
+from crews.amazon.market_gate import MarketGate
+
+class FakeShareOfVoiceAPI:
+    """Offline stand-in for JungleScoutAPI.get_share_of_voice"""
+
+    def __init__(self, markets):
+        self.markets = markets
+
+    def get_share_of_voice(self, keyword):
+        if keyword not in self.markets:
+            raise ConnectionError("JungleScout unavailable")
+        return {"data": {"attributes": self.markets[keyword]}}
+
+class TestMarketGate(unittest.TestCase):
+    """Test suite for the deterministic pre-LLM gate"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.criteria = ValidationCriteria()
+        self.api = FakeShareOfVoiceAPI({
+            "hammock": {
+                "estimated_30_day_search_volume": 275615,
+                "updated_at": "2024-01-01T00:00:00Z",
+                "brands": [
+                    {"brand": "Amazon Basics", "combined_weighted_sov": 0.25},
+                    {"brand": "SXSEAGLE", "combined_weighted_sov": 0.18}
+                ]
+            },
+            "hammock hook": {
+                "estimated_30_day_search_volume": 4200,
+                "brands": [{"brand": "Kootek", "combined_weighted_sov": 0.2}]
+            },
+            "camping chair": {
+                "estimated_30_day_search_volume": 90000,
+                "brands": [
+                    {"brand": "Coleman", "combined_weighted_sov": 0.45},
+                    {"brand": "GCI", "combined_weighted_sov": 0.2},
+                    {"brand": "ALPS", "combined_weighted_sov": 0.1}
+                ]
+            }
+        })
+        self.gate = MarketGate(self.api, self.criteria)
+
+    def test_validate_market_flat_data(self):
+        """Test criteria evaluation on partial data"""
+        passed, results = self.criteria.validate_market({
+            "estimated_30_day_search_volume": 50000,
+            "competition_level": "medium",
+            "profit_margin": 0.35
+        })
+        self.assertTrue(passed)
+        self.assertEqual(set(results), {"min_search_volume", "min_profit_margin"})
+
+    def test_gate_decisions(self):
+        """Test pass and rejection paths"""
+        self.assertTrue(self.gate.evaluate("hammock")["passed"])
+
+        low_volume = self.gate.evaluate("hammock hook")
+        self.assertFalse(low_volume["passed"])
+        self.assertIn("min_search_volume", low_volume["reason"])
+
+        concentrated = self.gate.evaluate("camping chair")
+        self.assertFalse(concentrated["passed"])
+        self.assertFalse(concentrated["results"]["max_competition"]["passed"])
+        self.assertFalse(concentrated["results"]["max_top_brand_share"]["passed"])
+
+    def test_gate_fails_open_and_counts(self):
+        """Test lookup errors and avoided-run metrics"""
+        self.assertTrue(self.gate.evaluate("unknown keyword")["passed"])
+        for keyword in ["hammock", "hammock hook", "camping chair"]:
+            self.gate.evaluate(keyword)
+
+        metrics = self.gate.get_metrics()
+        self.assertEqual(metrics["evaluated"], 4)
+        self.assertEqual(metrics["errors"], 1)
+        self.assertEqual(metrics["runs_avoided"], 2)
+        self.assertEqual(metrics["avoided_ratio"], 0.5)
+        self.assertEqual(metrics["rejections_by_criterion"]["min_search_volume"], 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -114,5 +114,27 @@ class TestMemoryStore(unittest.TestCase):
             self.assertIn("current_share", gap)
             self.assertIn("competitors", gap)
 
+    def test_run_checkpoints(self):
+        """Test per-task run checkpointing"""
+        run = self.memory.start_run("run-1", "hammock")
+        self.assertEqual(run["status"], "running")
+
+        self.memory.store_task_output("run-1", "market_research", "Strong demand")
+        self.memory.finish_run("run-1", "error", "provider timeout")
+
+        stored = self.memory.get_run("run-1")
+        self.assertEqual(stored["status"], "error")
+        self.assertEqual(stored["error"], "provider timeout")
+        self.assertEqual(
+            self.memory.get_completed_tasks("run-1"),
+            {"market_research": "Strong demand"}
+        )
+
+        # Restarting an existing run keeps its finished tasks
+        resumed = self.memory.start_run("run-1", "hammock")
+        self.assertIn("market_research", resumed["tasks"])
+        self.assertIn("resumed_at", resumed)
+        self.assertIsNone(self.memory.get_run("missing"))
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
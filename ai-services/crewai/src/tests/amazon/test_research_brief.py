@@ -0,0 +1,72 @@
+# src/tests/amazon/test_research_brief.py
+
+import json
+import unittest
+from tools.ai.preflight import count_tokens, truncate_to_tokens
+from tools.amazon.research_brief import build_research_brief, render_brief
+
+def share_of_voice(brand_count, asin_count):
+    """Synthetic SoV payload with a long tail of brands and ASINs"""
+    brands = [{
+        "brand": f"Brand {i}",
+        "combined_weighted_sov": 0.3 / (i + 1),
+        "combined_average_price": 15.0 + i * 3,
+        "combined_average_position": 1.0 + i,
+        "combined_products": 3
+    } for i in range(brand_count)]
+    asins = [{
+        "asin": f"B0{i:08d}",
+        "name": "Portable camping hammock with tree straps " * 3,
+        "brand": f"Brand {i % brand_count}",
+        "clicks": 1000,
+        "conversions": 100 + i,
+        "conversion_rate": (100 + i) / 1000
+    } for i in range(asin_count)]
+    return {"data": {"attributes": {
+        "estimated_30_day_search_volume": 142377,
+        "product_count": 2400,
+        "exact_suggested_bid_median": 1.25,
+        "updated_at": "2024-01-01T00:00:00Z",
+        "brands": brands,
+        "top_asins": asins
+    }}}
+
+class TestResearchBrief(unittest.TestCase):
+    """Test suite for the compact research brief"""
+
+    def test_brief_keeps_top_k_and_aggregates(self):
+        """Test that the brief keeps top-k entries and whole-market aggregates"""
+        brief = build_research_brief("hammock", share_of_voice(40, 30), top_k=5)
+
+        self.assertEqual(len(brief["top_brands"]), 5)
+        self.assertEqual(brief["top_brands"][0]["brand"], "Brand 0")
+        self.assertEqual(brief["concentration"]["brand_count"], 40)
+        self.assertEqual(brief["concentration"]["top_brand"], 0.3)
+        self.assertEqual(len(brief["top_asins"]), 5)
+        self.assertEqual(brief["top_asins"][0]["asin"], "B000000029")
+        self.assertLessEqual(len(brief["top_asins"][0]["name"]), 60)
+        self.assertIn("premium", brief["gaps"])
+
+    def test_brief_size_is_bounded(self):
+        """Test that the brief does not grow with the payload"""
+        small = render_brief(build_research_brief("hammock", share_of_voice(10, 10)))
+        large_payload = share_of_voice(500, 500)
+        large = render_brief(build_research_brief("hammock", large_payload))
+
+        self.assertLess(len(large), len(json.dumps(large_payload)) / 50)
+        self.assertLess(abs(len(large) - len(small)), 200)
+        self.assertIn("Market Analysis", large)
+        self.assertIn("Monthly Search Volume", large)
+        self.assertIn("Top Brands", large)
+
+    def test_token_budget(self):
+        """Test that prompts over budget are truncated"""
+        text = "\n".join(f"line {i}" for i in range(1000))
+
+        self.assertEqual(truncate_to_tokens("short", 10), "short")
+        clipped = truncate_to_tokens(text, 100)
+        self.assertLessEqual(count_tokens(clipped), 100)
+        self.assertTrue(clipped.startswith("line 0\n"))
+
+if __name__ == '__main__':
+    unittest.main()
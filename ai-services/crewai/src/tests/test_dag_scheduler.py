@@ -0,0 +1,116 @@
+# src/tests/test_dag_scheduler.py
+
+import unittest
+import threading
+import time
+from crews.dag_scheduler import TaskGraph, TaskGraphError
+
+class TestTaskGraph(unittest.TestCase):
+    """Test suite for the dependency-graph task scheduler"""
+
+    def test_independent_tasks_run_concurrently(self):
+        """Test that fan-out tasks overlap and the join sees every input"""
+        graph = TaskGraph()
+        graph.add("market", lambda inputs: "market")
+        for name in ["pricing", "suppliers", "listing", "trends"]:
+            graph.add(name, lambda inputs, name=name: (time.sleep(0.2), f"{name}:{inputs['market']}")[1],
+                      depends_on=["market"])
+        graph.add("validation", lambda inputs: sorted(inputs),
+                  depends_on=["pricing", "suppliers", "listing", "trends"])
+
+        start = time.perf_counter()
+        outputs = graph.run()
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(outputs["pricing"], "pricing:market")
+        self.assertEqual(outputs["validation"], ["listing", "pricing", "suppliers", "trends"])
+        self.assertEqual(set(graph.timings), set(outputs))
+
+    def test_dependencies_respected(self):
+        """Test that a task never starts before its dependencies finish"""
+        finished = set()
+        lock = threading.Lock()
+
+        def step(name, deps):
+            def fn(inputs):
+                with lock:
+                    self.assertTrue(set(deps) <= finished)
+                time.sleep(0.01)
+                with lock:
+                    finished.add(name)
+                return name
+            return fn
+
+        graph = TaskGraph()
+        graph.add("a", step("a", []))
+        graph.add("b", step("b", ["a"]), depends_on=["a"])
+        graph.add("c", step("c", ["a", "b"]), depends_on=["a", "b"])
+        self.assertEqual(graph.run(max_workers=2), {"a": "a", "b": "b", "c": "c"})
+
+    def test_invalid_graphs(self):
+        """Test cycle and unknown dependency detection"""
+        graph = TaskGraph()
+        graph.add("a", lambda inputs: 1, depends_on=["b"])
+        graph.add("b", lambda inputs: 2, depends_on=["a"])
+        with self.assertRaises(TaskGraphError):
+            graph.run()
+
+        graph = TaskGraph().add("a", lambda inputs: 1, depends_on=["missing"])
+        with self.assertRaises(TaskGraphError):
+            graph.topological_order()
+
+    def test_failure_reports_partial_outputs(self):
+        """Test that a failing task surfaces completed outputs"""
+        graph = TaskGraph()
+        graph.add("a", lambda inputs: "ok")
+        graph.add("b", lambda inputs: 1 / 0, depends_on=["a"])
+        with self.assertRaises(TaskGraphError) as ctx:
+            graph.run()
+        self.assertEqual(ctx.exception.outputs, {"a": "ok"})
+
+    def test_resume_skips_completed_tasks(self):
+        """Test that checkpointed outputs are fed forward instead of rerun"""
+        calls = []
+        checkpoints = {}
+
+        def step(name):
+            def fn(inputs):
+                calls.append(name)
+                return f"{name}({','.join(sorted(inputs.values()))})"
+            return fn
+
+        graph = TaskGraph()
+        graph.add("market", step("market"))
+        graph.add("pricing", step("pricing"), depends_on=["market"])
+        graph.add("validation", step("validation"), depends_on=["market", "pricing"])
+
+        outputs = graph.run(
+            completed={"market": "stored-market"},
+            on_complete=lambda name, output: checkpoints.__setitem__(name, output)
+        )
+
+        self.assertEqual(calls, ["pricing", "validation"])
+        self.assertEqual(outputs["pricing"], "pricing(stored-market)")
+        self.assertEqual(set(checkpoints), {"pricing", "validation"})
+
+    def test_failure_keeps_running_siblings(self):
+        """Test that tasks already in flight still finish and checkpoint"""
+        checkpoints = {}
+
+        def slow(inputs):
+            time.sleep(0.1)
+            return "slow"
+
+        graph = TaskGraph()
+        graph.add("fails", lambda inputs: 1 / 0)
+        graph.add("slow", slow)
+        graph.add("after", lambda inputs: "after", depends_on=["slow"])
+
+        with self.assertRaises(TaskGraphError) as ctx:
+            graph.run(on_complete=lambda name, output: checkpoints.__setitem__(name, output))
+        self.assertEqual(checkpoints, {"slow": "slow"})
+        self.assertNotIn("after", ctx.exception.outputs)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
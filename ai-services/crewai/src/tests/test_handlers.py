@@ -0,0 +1,80 @@
+# src/tests/test_handlers.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from api.handlers import run_amazon_research, run_sov_sweep, sweep_checkpoint_path, valid_checkpoint_id
+
+class FakeResearchCrew:
+    """Research crew that returns scripted results and records how it was run"""
+
+    checkpoints = {}
+    results = []
+    calls = []
+
+    def __init__(self):
+        self.memory_store = mock.Mock(get_run=lambda run_id: FakeResearchCrew.checkpoints.get(run_id))
+
+    def research_product_opportunity(self, keyword, run_id=None, on_task_complete=None):
+        FakeResearchCrew.calls.append(("run", run_id))
+        FakeResearchCrew.checkpoints[run_id] = {"keyword": keyword}
+        return FakeResearchCrew.results.pop(0)
+
+    def resume(self, run_id, on_task_complete=None):
+        FakeResearchCrew.calls.append(("resume", run_id))
+        return FakeResearchCrew.results.pop(0)
+
+class TestHandlers(unittest.TestCase):
+    """Test suite for the job and task queue handlers"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+        self.sweep_dir = os.path.join(self.storage_dir, "sweeps")
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def test_sweep_ids_cannot_escape_the_checkpoint_dir(self):
+        """Test that only plain file-name sweep IDs map to checkpoint paths"""
+        self.assertTrue(valid_checkpoint_id("nightly-2026_10"))
+        for sweep_id in ("../../x", "/etc/foo", "a/b", "", "x" * 65, None, 7):
+            self.assertFalse(valid_checkpoint_id(sweep_id))
+            with self.assertRaises(ValueError):
+                sweep_checkpoint_path(self.sweep_dir, sweep_id)
+        self.assertEqual(
+            sweep_checkpoint_path(self.sweep_dir, "nightly"),
+            os.path.join(os.path.realpath(self.sweep_dir), "nightly.json")
+        )
+
+    def test_sweep_handler_rejects_unsafe_ids(self):
+        """Test that the sweep task fails before touching the filesystem"""
+        with mock.patch.dict(os.environ, {"SWEEP_CHECKPOINT_DIR": self.sweep_dir}):
+            with self.assertRaises(ValueError):
+                run_sov_sweep({"sweep_id": "../outside", "seeds": ["hammock"]}, lambda *_: None)
+        self.assertFalse(os.path.exists(self.sweep_dir))
+
+    def test_research_failures_raise_and_retries_resume(self):
+        """Test that crew errors fail the attempt and the retry resumes the same run"""
+        FakeResearchCrew.checkpoints, FakeResearchCrew.calls = {}, []
+        FakeResearchCrew.results = [
+            {"status": "error", "run_id": "run-1", "reason": "JungleScout 503"},
+            {"status": "success", "run_id": "run-1"},
+            {"status": "rejected", "reason": "search volume too low"}
+        ]
+        payload = {"keyword": "hammock", "run_id": "run-1"}
+        with mock.patch("crews.amazon.amazon_crew.AmazonResearchCrew", FakeResearchCrew):
+            with self.assertRaises(RuntimeError):
+                run_amazon_research(payload, lambda *_: None)
+            self.assertEqual(run_amazon_research(payload, lambda *_: None)["status"], "success")
+            rejected = run_amazon_research({"keyword": "fidget toy", "run_id": "run-2"}, lambda *_: None)
+            with self.assertRaises(ValueError):
+                run_amazon_research({"keyword": "hammock", "run_id": "../run"}, lambda *_: None)
+        self.assertEqual(rejected["status"], "rejected")
+        self.assertEqual(FakeResearchCrew.calls, [("run", "run-1"), ("resume", "run-1"), ("run", "run-2")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# src/tests/test_hedging.py
+
+import time
+import unittest
+from tools.ai.gateway import LLMGateway, ProviderLimits
+from tools.ai.hedging import HedgePolicy, LatencyTracker
+from tests.test_llm_gateway import FakeAdapter
+
+class TestHedging(unittest.TestCase):
+    """Test suite for latency-driven hedged LLM requests"""
+
+    def make_gateway(self, primary, secondary, **policy):
+        gateway = LLMGateway(adapters={})
+        gateway.register("primary", primary, ProviderLimits(requests_per_minute=0, max_retries=0))
+        gateway.register("secondary", secondary, ProviderLimits(requests_per_minute=0, max_retries=0))
+        policy.setdefault("default_delay", 0.05)
+        gateway.set_hedge("primary", HedgePolicy("secondary", **policy))
+        return gateway
+
+    def test_percentiles_drive_delay(self):
+        """Test that the hedge delay follows the observed p95 once warmed up"""
+        latencies = LatencyTracker()
+        policy = HedgePolicy("secondary", default_delay=3.0, min_samples=10, min_delay=0.1)
+        self.assertEqual(policy.delay(latencies, "openai"), 3.0)
+
+        for i in range(100):
+            latencies.observe("openai", (i + 1) / 100)
+        self.assertAlmostEqual(latencies.percentile("openai", 0.95), 0.9505)
+        self.assertAlmostEqual(policy.delay(latencies, "openai"), 0.9505)
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test that the secondary answers and the primary is cancelled"""
+        primary = FakeAdapter(hang=True)
+        secondary = FakeAdapter(delay=0.01)
+        gateway = self.make_gateway(primary, secondary)
+
+        start = time.perf_counter()
+        result = gateway.analyze("primary", "hello")
+
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(result["provider"], "secondary")
+        self.assertTrue(result["hedged"])
+        time.sleep(0.05)
+        self.assertEqual(primary.active, 0)
+        metrics = gateway.metrics()["primary"]
+        self.assertEqual((metrics["hedges"], metrics["hedge_wins"], metrics["in_flight"]), (1, 1, 0))
+
+    def test_fast_primary_is_not_hedged(self):
+        """Test that no backup is sent when the primary answers in time"""
+        secondary = FakeAdapter()
+        gateway = self.make_gateway(FakeAdapter(delay=0.01), secondary, default_delay=1.0)
+
+        result = gateway.analyze("primary", "hello")
+
+        self.assertEqual(result["provider"], "primary")
+        self.assertFalse(result["hedged"])
+        self.assertEqual(secondary.calls, 0)
+
+    def test_failed_primary_falls_over(self):
+        """Test immediate failover when the primary errors before the delay"""
+        gateway = self.make_gateway(FakeAdapter(failures=[ValueError("bad")]), FakeAdapter(), default_delay=5.0)
+        result = gateway.analyze("primary", "hello")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["provider"], "secondary")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# src/tests/test_jobs.py
+
+import asyncio
+import threading
+import time
+import unittest
+from api.jobs import JobManager
+
+class TestJobManager(unittest.TestCase):
+    """Test suite for background job execution and progress events"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.manager = JobManager(max_workers=2, max_retained=3)
+        self.addCleanup(self.manager.shutdown)
+
+    def wait_done(self, job_id, timeout=5.0):
+        after = 0
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            events, finished = self.manager.wait_events(job_id, after, timeout=0.5)
+            after += len(events)
+            if finished:
+                return self.manager.get(job_id, include_result=True)
+        self.fail(f"Job {job_id} did not finish")
+
+    def test_submit_returns_immediately_and_reports_progress(self):
+        """Test that a job is queued at once and its events stream in order"""
+        release = threading.Event()
+
+        def handler(payload, progress):
+            progress("task", {"name": "market_research"})
+            release.wait(5)
+            return {"keyword": payload["keyword"]}
+
+        job = self.manager.submit("research", handler, {"keyword": "camping hammock"})
+        self.assertIn(job["status"], ("queued", "running"))
+        events, finished = self.manager.wait_events(job["job_id"], after=2, timeout=5)
+        self.assertFalse(finished)
+        self.assertEqual(events[0]["event"], "task")
+        self.assertEqual(self.manager.get(job["job_id"])["progress"]["data"], {"name": "market_research"})
+
+        release.set()
+        done = self.wait_done(job["job_id"])
+        self.assertEqual(done["status"], "succeeded")
+        self.assertEqual(done["result"], {"keyword": "camping hammock"})
+        events, _ = self.manager.wait_events(job["job_id"], timeout=0)
+        self.assertEqual([e["event"] for e in events], ["queued", "running", "task", "succeeded"])
+
+    def test_async_handlers_and_failures(self):
+        """Test coroutine handlers and that errors end the job as failed"""
+        async def handler(payload, progress):
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        def broken(payload, progress):
+            raise ImportError("No module named 'self_hosted.service'")
+
+        self.assertEqual(self.wait_done(self.manager.submit("a", handler)["job_id"])["result"], "ok")
+        failed = self.wait_done(self.manager.submit("b", broken)["job_id"])
+        self.assertEqual(failed["status"], "failed")
+        self.assertIn("self_hosted.service", failed["error"])
+
+    def test_bounded_concurrency_and_cancel(self):
+        """Test that only max_workers run and queued jobs can be cancelled"""
+        release = threading.Event()
+        running = []
+        lock = threading.Lock()
+
+        def handler(payload, progress):
+            with lock:
+                running.append(payload["n"])
+            release.wait(5)
+
+        jobs = [self.manager.submit("slow", handler, {"n": n}) for n in range(3)]
+        time.sleep(0.2)
+        self.assertEqual(sorted(running), [0, 1])
+        self.assertEqual(self.manager.get(jobs[2]["job_id"])["status"], "queued")
+        self.assertTrue(self.manager.cancel(jobs[2]["job_id"]))
+        self.assertFalse(self.manager.cancel(jobs[0]["job_id"]))
+
+        release.set()
+        for job in jobs[:2]:
+            self.assertEqual(self.wait_done(job["job_id"])["status"], "succeeded")
+        self.assertEqual(self.manager.get(jobs[2]["job_id"])["status"], "cancelled")
+        self.assertEqual(len(running), 2)
+
+    def test_finished_jobs_are_pruned(self):
+        """Test that only the newest max_retained finished jobs are kept"""
+        job_ids = [self.manager.submit("quick", lambda payload, progress: None)["job_id"] for _ in range(5)]
+        for job_id in job_ids[-3:]:
+            self.wait_done(job_id)
+        self.assertEqual(len(self.manager.list()), 3)
+        self.assertIsNone(self.manager.get(job_ids[0]))
+        self.assertEqual(self.manager.stats()["jobs"], {"succeeded": 3})
+
+    def test_async_followers_do_not_hold_threads(self):
+        """Test that many event-loop followers are woken without a thread each"""
+        release = threading.Event()
+
+        def handler(payload, progress):
+            release.wait(5)
+            progress("task", {"n": 1})
+
+        job_id = self.manager.submit("slow", handler)["job_id"]
+
+        async def follow():
+            events, _ = await self.manager.await_events(job_id, after=2, timeout=5)
+            return events[0]["event"]
+
+        async def main():
+            before = threading.active_count()
+            followers = [asyncio.ensure_future(follow()) for _ in range(50)]
+            await asyncio.sleep(0.05)
+            added = threading.active_count() - before
+            release.set()
+            return await asyncio.gather(*followers), added
+
+        events, added = asyncio.run(main())
+        self.assertEqual(set(events), {"task"})
+        self.assertLessEqual(added, 0)
+        self.assertEqual(self.manager._waiters, {})
+        self.assertEqual(asyncio.run(self.manager.await_events(job_id, after=99, timeout=0.01))[0], [])
+
+if __name__ == '__main__':
+    unittest.main()
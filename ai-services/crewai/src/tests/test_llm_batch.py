@@ -0,0 +1,82 @@
+# src/tests/test_llm_batch.py
+
+import shutil
+import tempfile
+import unittest
+from tools.ai.batch import BatchCollector, LocalBatchBackend, analyze_batch
+from tools.ai.usage import get_usage_tracker
+
+class TestBatchCollector(unittest.TestCase):
+    """Test suite for provider batch submission against the local backend"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def make_collector(self, backend):
+        return BatchCollector(backends={"local": backend}, storage_dir=self.storage_dir, poll_interval=0)
+
+    def test_results_map_back_to_callers(self):
+        """Test chunking by batch size and per-request result mapping"""
+        backend = LocalBatchBackend(polls_until_done=3, max_batch_size=40)
+        collector = self.make_collector(backend)
+        futures = {i: collector.add(f"keyword {i}", provider="local") for i in range(100)}
+
+        self.assertEqual(len(collector.submit()), 3)
+        collector.wait(timeout=5)
+
+        for i, future in futures.items():
+            result = future.result(timeout=0)
+            self.assertEqual(result["status"], "success")
+            self.assertEqual(result["analysis"], f"echo: keyword {i}")
+            self.assertEqual(result["model"], "local-echo")
+        self.assertEqual(collector.outstanding(), [])
+
+    def test_request_and_batch_failures(self):
+        """Test that failures resolve callers with error dicts"""
+        def handler(prompt):
+            if "bad" in prompt:
+                raise ValueError("invalid request")
+            return "ok"
+
+        collector = self.make_collector(LocalBatchBackend(handler=handler))
+        good = collector.add("good prompt", provider="local")
+        bad = collector.add("bad prompt", provider="local")
+        collector.wait(timeout=5)
+        self.assertEqual(good.result()["analysis"], "ok")
+        self.assertEqual(bad.result()["status"], "error")
+
+        collector = self.make_collector(LocalBatchBackend(fail_batches=True))
+        failed = collector.add("any prompt", provider="local")
+        collector.wait(timeout=5)
+        self.assertEqual(failed.result()["status"], "error")
+
+    def test_resume_from_manifest(self):
+        """Test that another collector can finish batches from the manifest"""
+        backend = LocalBatchBackend(polls_until_done=2)
+        first = self.make_collector(backend)
+        first.add("resumable", provider="local", custom_id="req-1")
+        batch_ids = first.submit()
+
+        second = self.make_collector(backend)
+        self.assertEqual(second.outstanding(), batch_ids)
+        results = second.resume(timeout=5)
+        self.assertEqual(results["req-1"]["analysis"], "echo: resumable")
+
+    def test_analyze_batch_and_discounted_cost(self):
+        """Test the convenience wrapper keeps order and records batch usage"""
+        tracker = get_usage_tracker()
+        before = tracker.summary("provider").get("local", {}).get("calls", 0)
+        collector = self.make_collector(LocalBatchBackend())
+
+        results = analyze_batch(["a", "b", "c"], provider="local", collector=collector, timeout=5)
+
+        self.assertEqual([r["analysis"] for r in results], ["echo: a", "echo: b", "echo: c"])
+        self.assertEqual(tracker.summary("provider")["local"]["calls"] - before, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+# src/tests/test_llm_gateway.py
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from tools.ai.gateway import AnthropicAdapter, GeminiAdapter, LLMGateway, OpenAIAdapter, ProviderAdapter, ProviderLimits
+from tools.ai.usage import attribute_usage, get_usage_tracker
+
+class RateLimitError(Exception):
+    """Named like the SDK errors the gateway treats as transient"""
+
+class FakeAdapter(ProviderAdapter):
+    """Offline provider that records concurrency and can fail on demand"""
+
+    provider = "fake"
+    default_model = "fake-model"
+
+    def __init__(self, delay=0.05, failures=(), hang=False):
+        self.delay = delay
+        self.failures = list(failures)
+        self.hang = hang
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.clients = 0
+
+    def create_client(self, api_key):
+        self.clients += 1
+        return object()
+
+    async def complete(self, client, model, text, max_tokens, system=None):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(10 if self.hang else self.delay)
+        finally:
+            self.active -= 1
+        return {"text": f"echo: {text}", "prompt_tokens": 10, "completion_tokens": 5}
+
+    async def stream(self, client, model, text, max_tokens, system=None):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        for word in f"echo: {text}".split(" "):
+            await asyncio.sleep(self.delay / 5)
+            yield {"text": word + " "}
+            if self.hang:
+                raise ConnectionError("stream dropped")
+        yield {"prompt_tokens": 10, "completion_tokens": 5}
+
+class PrefixCachingAdapter(FakeAdapter):
+    """Reports cache writes on the first call with a system prefix and reads after"""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.prefixes = set()
+
+    async def complete(self, client, model, text, max_tokens, system=None):
+        result = await super().complete(client, model, text, max_tokens)
+        if system:
+            key = "cache_read_tokens" if system in self.prefixes else "cache_write_tokens"
+            self.prefixes.add(system)
+            result[key] = 1500
+        return result
+
+class TestLLMGateway(unittest.TestCase):
+    """Test suite for the shared async LLM gateway"""
+
+    def make_gateway(self, adapter, **limits):
+        gateway = LLMGateway(adapters={})
+        limits.setdefault("requests_per_minute", 0)
+        limits.setdefault("backoff", 0.01)
+        gateway.register("fake", adapter, ProviderLimits(**limits))
+        return gateway
+
+    def test_concurrency_limit_and_shared_client(self):
+        """Test that parallel callers share a client and respect the semaphore"""
+        adapter = FakeAdapter()
+        gateway = self.make_gateway(adapter, max_concurrency=2)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: gateway.analyze("fake", f"prompt {i}"), range(8)))
+
+        self.assertTrue(all(r["status"] == "success" for r in results))
+        self.assertEqual(results[3]["analysis"], "echo: prompt 3")
+        self.assertEqual(adapter.peak, 2)
+        self.assertEqual(adapter.clients, 1)
+        self.assertEqual(gateway.metrics()["fake"]["calls"], 8)
+
+    def test_retries_transient_errors_only(self):
+        """Test retry with backoff on transient errors and none on others"""
+        adapter = FakeAdapter(failures=[RateLimitError("slow down"), ConnectionError("reset")])
+        gateway = self.make_gateway(adapter)
+        result = gateway.analyze("fake", "hello")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["usage"]["retries"], 2)
+
+        adapter = FakeAdapter(failures=[ValueError("bad request")])
+        gateway = self.make_gateway(adapter)
+        result = gateway.analyze("fake", "hello")
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(adapter.calls, 1)
+
+    def test_timeout(self):
+        """Test that hung calls time out and are reported as errors"""
+        gateway = self.make_gateway(FakeAdapter(hang=True), timeout=0.05, max_retries=1)
+        result = gateway.analyze("fake", "hello")
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(gateway.metrics()["fake"]["timeouts"], 2)
+
+    def test_async_call_keeps_attribution(self):
+        """Test awaiting from another event loop with usage attribution"""
+        gateway = self.make_gateway(FakeAdapter())
+
+        async def call():
+            with attribute_usage(run_id="gateway-run", task="pricing_strategy"):
+                return await gateway.aanalyze("fake", "hello")
+
+        result = asyncio.run(call())
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["usage"]["task"], "pricing_strategy")
+        self.assertEqual(get_usage_tracker().run_usage("gateway-run")["totals"]["prompt_tokens"], 10)
+
+    def test_stream_yields_chunks_and_records_usage(self):
+        """Test sync and async streaming with a retry before the first chunk"""
+        adapter = FakeAdapter(failures=[RateLimitError("slow down")])
+        gateway = self.make_gateway(adapter)
+        with attribute_usage(run_id="stream-run"):
+            chunks = list(gateway.stream("fake", "one two three"))
+        self.assertEqual(chunks, ["echo: ", "one ", "two ", "three "])
+        self.assertEqual(adapter.calls, 2)
+        self.assertEqual(get_usage_tracker().run_usage("stream-run")["totals"]["completion_tokens"], 5)
+
+        async def collect():
+            return [chunk async for chunk in gateway.astream("fake", "four five")]
+        self.assertEqual("".join(asyncio.run(collect())), "echo: four five ")
+
+    def test_stream_failure_after_first_chunk_is_not_retried(self):
+        """Test that a dropped stream raises instead of replaying text"""
+        adapter = FakeAdapter(hang=True)
+        gateway = self.make_gateway(adapter)
+        received = []
+        with self.assertRaises(ConnectionError):
+            for chunk in gateway.stream("fake", "hello"):
+                received.append(chunk)
+        self.assertEqual(received, ["echo: "])
+        self.assertEqual(adapter.calls, 1)
+
+    def test_system_prefix_cache_tokens(self):
+        """Test that cache read/write tokens from a persona prefix are reported"""
+        gateway = self.make_gateway(PrefixCachingAdapter())
+        persona = "You are Diana Price, a strategic pricing specialist."
+
+        first = gateway.analyze("fake", "Price the hammock", system=persona)
+        second = gateway.analyze("fake", "Price the camping chair", system=persona)
+
+        self.assertEqual(first["usage"]["cache_write_tokens"], 1500)
+        self.assertEqual(second["usage"]["cache_read_tokens"], 1500)
+
+    def test_provider_prefix_layout(self):
+        """Test persona placement and cache accounting in provider adapters"""
+        anthropic = AnthropicAdapter()
+        persona = "static persona and task instructions. " * 150
+        params = anthropic._params("claude-3-opus-20240229", "dynamic data", None, persona)
+        self.assertEqual(params["system"][0]["cache_control"], {"type": "ephemeral"})
+        self.assertEqual(params["messages"][-1]["content"], "dynamic data")
+        self.assertNotIn("cache_control", anthropic._params("claude-3-haiku-20240307", "data", None, persona)["system"][0])
+        self.assertNotIn("cache_control", anthropic._params("claude-3-opus-20240229", "data", None, "static persona")["system"][0])
+
+        openai = OpenAIAdapter()
+        self.assertEqual(openai._messages("dynamic data", "static persona")[0]["role"], "system")
+        usage = SimpleNamespace(
+            prompt_tokens=2000, completion_tokens=10,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1536)
+        )
+        self.assertEqual(openai._usage(usage), {"prompt_tokens": 464, "completion_tokens": 10, "cache_read_tokens": 1536})
+
+    def test_gemini_requests_go_to_the_per_key_client(self):
+        """Test that Gemini calls are sent on the given client with the persona as system_instruction"""
+        from google.ai import generativelanguage as glm
+
+        class RecordingClient:
+            def __init__(self):
+                self.requests = []
+
+            async def generate_content(self, request):
+                self.requests.append(request)
+                return glm.GenerateContentResponse(
+                    candidates=[glm.Candidate(content=glm.Content(parts=[glm.Part(text="ok")]))],
+                    usage_metadata=glm.GenerateContentResponse.UsageMetadata(
+                        prompt_token_count=12, candidates_token_count=1
+                    )
+                )
+
+        adapter = GeminiAdapter()
+        client = RecordingClient()
+        result = asyncio.run(adapter.complete(client, "gemini-1.5-flash", "Price the hammock", 50, system="persona"))
+
+        request = client.requests[0]
+        self.assertEqual((result["text"], result["prompt_tokens"], result["completion_tokens"]), ("ok", 12, 1))
+        self.assertEqual(request.model, "models/gemini-1.5-flash")
+        self.assertEqual(request.system_instruction.parts[0].text, "persona")
+        self.assertEqual(request.contents[0].parts[0].text, "Price the hammock")
+        self.assertEqual(request.generation_config.max_output_tokens, 50)
+
+    def test_unknown_provider(self):
+        """Test error dict for unregistered providers"""
+        gateway = self.make_gateway(FakeAdapter())
+        self.assertEqual(gateway.analyze("missing", "hello")["status"], "error")
+
+if __name__ == '__main__':
+    unittest.main()
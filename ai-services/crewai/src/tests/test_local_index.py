@@ -0,0 +1,124 @@
+# src/tests/test_local_index.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+from tools.ai.gateway import LLMGateway, ProviderLimits
+from tools.search.local_index import LocalIndex, LocalSearchTool, match_expression
+from tools.search.perplexity import PerplexitySearchTool
+from tools.search.search_cache import SearchCache
+from tests.test_llm_gateway import FakeAdapter
+from tests.test_search_cache import CannedSerpSearch
+
+class CannedPerplexitySearch(PerplexitySearchTool):
+    """Perplexity tool answering from a canned chat completions response"""
+
+    def __init__(self, response, **kwargs):
+        super().__init__(api_key="test-key", **kwargs)
+        self.response = response
+
+    def _request(self, query):
+        return self.response
+
+class TestLocalIndex(unittest.TestCase):
+    """Test suite for the local BM25 index of fetched results and analyses"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+        self.index = LocalIndex(os.path.join(self.storage_dir, "index.db"))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.index.close()
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def test_bm25_ranking_and_replacement(self):
+        """Test relevance order, stemming, ref replacement and filters"""
+        self.index.add("web_search", "Bamboo cutting boards wholesale from Zhejiang factories", title="Bamboo supplier", ref="a")
+        self.index.add("web_search", "Camping hammocks with tree straps", title="Hammock guide", ref="b")
+        self.index.add("llm", "Hammock market is concentrated; hammocks under $30 dominate", title="Hammock analysis")
+
+        results = self.index.search("hammock market")
+        self.assertEqual(results[0]["title"], "Hammock analysis")
+        self.assertEqual({r["ref"] for r in results[1:]}, {"b"})
+        self.assertEqual(self.index.search("bamboo factory")[0]["ref"], "a")
+
+        self.index.add("web_search", "Hammock stands and frames", title="Hammock stands", ref="b")
+        self.assertEqual(self.index.count(), 3)
+        self.assertEqual(self.index.search("tree straps"), [])
+        self.assertEqual([r["source"] for r in self.index.search("hammock", sources=["llm"])], ["llm"])
+        self.assertEqual(self.index.search("hammock", max_age=timedelta(seconds=-1)), [])
+
+    def test_match_expression_is_safe(self):
+        """Test that FTS operators and punctuation in queries are neutralized"""
+        self.assertEqual(match_expression('hammock NEAR("x") OR -'), '"hammock" OR "near" OR "x" OR "or"')
+        self.assertEqual(self.index.search('"unbalanced (query*'), [])
+        self.assertEqual(self.index.search("!!!"), [])
+
+    def test_lookup_tool(self):
+        """Test the agent-facing lookup tool"""
+        self.index.add("perplexity", "Top hammock brands are Wise Owl and ENO", query="top hammock brands")
+        tool = LocalSearchTool(self.index)
+        self.assertTrue(tool.search("hammock brands")["found"])
+        self.assertFalse(tool.search("kayak paddles")["found"])
+
+    def test_gateway_and_web_search_write_through(self):
+        """Test that fresh LLM analyses and search results are indexed"""
+        gateway = LLMGateway(adapters={}, index=self.index)
+        gateway.register("fake", FakeAdapter(delay=0), ProviderLimits(requests_per_minute=0))
+        gateway.analyze("fake", "Assess hammock demand seasonality")
+        self.assertEqual(self.index.search("hammock seasonality", sources=["llm"])[0]["body"],
+                         "echo: Assess hammock demand seasonality")
+
+        with mock.patch.dict(os.environ, {"SERP_API_KEY": "test-key"}):
+            tool = CannedSerpSearch(
+                {"hammock supplier": ["https://acme.com/hammocks", "https://www.acme.com/hammocks/"]},
+                cache=SearchCache(os.path.join(self.storage_dir, "cache")),
+                index=self.index
+            )
+            tool.search("hammock supplier")
+        self.assertEqual(len(self.index.search("hammock supplier", sources=["web_search"])), 1)
+
+    def test_perplexity_answers_are_indexed(self):
+        """Test that the answer and citations of a Perplexity response are indexed"""
+        tool = CannedPerplexitySearch({
+            "choices": [{"message": {"role": "assistant", "content": "Hammock demand peaks in May and June"}}],
+            "citations": ["https://example.com/hammock-trends"],
+            "search_results": [{"title": "Hammock trends", "url": "https://example.com/hammock-trends", "date": "2026-04-01"}]
+        }, index=self.index)
+        result = tool.search("When does hammock demand peak?")
+        self.assertEqual(result["answer"], "Hammock demand peaks in May and June")
+        self.assertEqual(result["results"][0]["link"], "https://example.com/hammock-trends")
+
+        hit = self.index.search("hammock demand peak", sources=["perplexity"])[0]
+        self.assertEqual(hit["body"], "Hammock demand peaks in May and June")
+        self.assertEqual(hit["metadata"]["citations"], ["https://example.com/hammock-trends"])
+        self.assertEqual(PerplexitySearchTool(api_key="", index=self.index).search("hammock")["status"], "error")
+
+    def test_web_search_answers_from_index_first(self):
+        """Test that enough fresh indexed results answer a search without SerpAPI"""
+        for i in range(3):
+            self.index.add("web_search", f"Hammock supplier number {i}", title=f"Supplier {i}",
+                           ref=f"https://acme{i}.com", metadata={"link": f"https://acme{i}.com"})
+        self.index.add("web_search", "Hammock straps review", title="Straps", ref="https://straps.com")
+
+        with mock.patch.dict(os.environ, {"SERP_API_KEY": "test-key"}):
+            tool = CannedSerpSearch(
+                {"supplier hammock": ["https://new.com"], "hammock straps": ["https://straps.com"]},
+                cache=SearchCache(os.path.join(self.storage_dir, "cache")),
+                index=self.index,
+                local_min_results=3
+            )
+            local = tool.search("supplier hammock")
+            fetched = tool.search("hammock straps")
+        self.assertTrue(local["local"])
+        self.assertEqual({r["link"] for r in local["results"]}, {f"https://acme{i}.com" for i in range(3)})
+        self.assertNotIn("local", fetched)
+        self.assertEqual((tool.stats()["local_hits"], tool.stats()["api_calls"]), (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# src/tests/test_model_router.py
+
+import unittest
+from tools.ai.gateway import LLMGateway, ProviderLimits
+from tools.ai.router import ModelRouter, classify_request
+from tests.test_llm_gateway import FakeAdapter
+
+class ModelRecordingAdapter(FakeAdapter):
+    """Remembers which model each call was sent to"""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.models = []
+
+    async def complete(self, client, model, text, max_tokens, system=None):
+        self.models.append(model)
+        return await super().complete(client, model, text, max_tokens, system)
+
+class TestModelRouter(unittest.TestCase):
+    """Test suite for cost/latency-aware model routing"""
+
+    def test_classify_request(self):
+        """Test that only clear extraction/summarization prompts route down"""
+        self.assertEqual(classify_request("Extract the ASINs and prices as JSON"), "extraction")
+        self.assertEqual(classify_request("Summarize these reviews in three bullets"), "summarization")
+        self.assertEqual(classify_request("Should we enter this niche given the competition?"), "reasoning")
+        self.assertEqual(classify_request("Summarize " + "x" * 9000), "reasoning")
+        self.assertEqual(classify_request("Please list the top 5 brands by share"), "extraction")
+        self.assertEqual(classify_request("Give a summary of competitive risks and key points"), "reasoning")
+        self.assertEqual(classify_request("Assess the niche and format your reasoning as bullets"), "reasoning")
+
+    def test_cheapest_model_meeting_tier(self):
+        """Test tier eligibility, provider restriction and agent overrides"""
+        router = ModelRouter()
+        self.assertEqual(router.route("Extract the brand names")["model"], "gemini-1.5-flash")
+        self.assertEqual(router.route("Extract the brand names", providers=["anthropic"])["model"], "claude-3-haiku-20240307")
+        self.assertEqual(router.route("Plan a launch strategy", providers=["anthropic"])["model"], "claude-3-opus-20240229")
+        # No premium Gemini model: fall back to the provider's best
+        self.assertEqual(router.route("Plan a launch strategy", providers=["google"])["model"], "gemini-1.5-pro")
+
+        router.set_agent_override("Market Analyst", tier="standard")
+        route = router.route("Extract the brand names", agent="Market Analyst", providers=["openai"])
+        self.assertEqual((route["model"], route["tier"]), ("gpt-4o", "standard"))
+        router.set_agent_override("Listing Optimizer", model="claude-3-5-sonnet-20240620")
+        route = router.route("Plan a launch strategy", agent="Listing Optimizer")
+        self.assertEqual((route["provider"], route["model"]), ("anthropic", "claude-3-5-sonnet-20240620"))
+        with self.assertRaises(ValueError):
+            router.set_agent_override("Market Analyst", tier="gold")
+
+    def test_latency_breaks_price_ties(self):
+        """Test that observed latency picks between equally priced models"""
+        catalog = [
+            {"provider": "a", "model": "gpt-4-turbo", "tier": "premium"},
+            {"provider": "b", "model": "gpt-4-turbo-preview", "tier": "premium"}
+        ]
+        router = ModelRouter(catalog=catalog)
+        router.observe("reasoning", "gpt-4-turbo", latency=4.0, cost=0.01)
+        router.observe("reasoning", "gpt-4-turbo-preview", latency=1.0, cost=0.01)
+        self.assertEqual(router.route("Plan a launch")["provider"], "b")
+        self.assertEqual(router.stats()["reasoning"]["gpt-4-turbo"]["avg_latency"], 4.0)
+
+    def test_gateway_routes_unpinned_calls(self):
+        """Test gateway routing, auto provider selection and route stats"""
+        catalog = [
+            {"provider": "cheap", "model": "gpt-4o-mini", "tier": "basic"},
+            {"provider": "smart", "model": "claude-3-opus-20240229", "tier": "premium"}
+        ]
+        cheap, smart = ModelRecordingAdapter(), ModelRecordingAdapter()
+        gateway = LLMGateway(adapters={}, router=ModelRouter(catalog=catalog))
+        gateway.register("cheap", cheap, ProviderLimits(requests_per_minute=0))
+        gateway.register("smart", smart, ProviderLimits(requests_per_minute=0))
+
+        result = gateway.analyze("auto", "Extract the price from this listing", use_cache=False)
+        self.assertEqual((result["provider"], result["model"], result["route"]), ("cheap", "gpt-4o-mini", "extraction"))
+        result = gateway.analyze("auto", "Assess the niche", use_cache=False)
+        self.assertEqual((result["provider"], result["route"]), ("smart", "reasoning"))
+        gateway.analyze("cheap", "Assess the niche", model="pinned-model", use_cache=False)
+        self.assertEqual(cheap.models, ["gpt-4o-mini", "pinned-model"])
+
+        stats = gateway.router_stats()
+        self.assertEqual(stats["extraction"]["gpt-4o-mini"]["calls"], 1)
+        self.assertEqual(stats["reasoning"]["claude-3-opus-20240229"]["calls"], 1)
+        self.assertEqual(LLMGateway(adapters={}).analyze("auto", "hi")["status"], "error")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# src/tests/test_preflight.py
+
+import unittest
+from tools.ai.budget import TRUNCATION_MARKER
+from tools.ai.gateway import LLMGateway, ProviderLimits
+from tools.ai.preflight import PromptSection, count_tokens, fit_sections, preflight
+from tests.test_llm_gateway import FakeAdapter
+
+class TestPreflight(unittest.TestCase):
+    """Test suite for local token counting and pre-flight prompt budgeting"""
+
+    def test_count_tokens_per_provider(self):
+        """Test that counts are positive and denser for Claude's approximation"""
+        text = "Portable camping hammock with tree straps. " * 50
+        self.assertEqual(count_tokens(""), 0)
+        self.assertGreater(count_tokens(text, "gpt-4o", "openai"), 0)
+        self.assertGreater(
+            count_tokens(text, "claude-3-haiku-20240307", "anthropic"),
+            count_tokens(text, "gemini-1.5-flash", "google")
+        )
+
+    def test_preflight_clamps_prompt_and_output(self):
+        """Test output clamping, prompt truncation and impossible requests"""
+        checked = preflight("openai", "gpt-4-turbo-preview", "short prompt", max_tokens=50000)
+        self.assertEqual(checked["max_tokens"], 4096)
+        self.assertFalse(checked["truncated"])
+
+        checked = preflight("google", "gemini-pro", "line of data\n" * 20000, prompt_budget=500)
+        self.assertTrue(checked["truncated"])
+        self.assertTrue(checked["text"].endswith(TRUNCATION_MARKER))
+        self.assertLessEqual(count_tokens(checked["text"], "gemini-pro", "google"), 500)
+
+        long_prompt = "line of data\n" * 5000
+        self.assertFalse(preflight("google", "gemini-pro", long_prompt)["truncated"])
+        self.assertTrue(preflight("google", "gemini-pro", long_prompt, prompt_budget=6000)["truncated"])
+
+        with self.assertRaises(ValueError):
+            preflight("google", "gemini-pro", "hi", system="persona " * 40000)
+
+    def test_fit_sections_shrinks_lowest_priority_first(self):
+        """Test summary substitution, fair sharing within a level and dropping"""
+        sections = [
+            PromptSection("headline", "Search volume 142,377", priority=2),
+            PromptSection("asins", "- B0000001 hammock\n" * 200, priority=0, summary="ASINs: B0000001"),
+            PromptSection("brands", "- Brand\n" * 10, priority=1),
+            PromptSection("reviews", "great product\n" * 200, priority=1)
+        ]
+        text = fit_sections(sections, 150)
+
+        self.assertLessEqual(count_tokens(text), 150)
+        self.assertTrue(text.startswith("Search volume 142,377"))
+        self.assertIn("- Brand\n" * 10, text)
+        self.assertIn("great product", text)
+        self.assertNotIn("B0000001", text)
+        self.assertLess(text.index("Brand"), text.index("great product"))
+
+        text = fit_sections(sections[:3], 60)
+        self.assertIn("ASINs: B0000001", text)
+
+    def test_gateway_rejects_before_network(self):
+        """Test that an unfittable request fails without calling the provider"""
+        adapter = FakeAdapter(delay=0)
+        adapter.default_model = "gemini-pro"
+        gateway = LLMGateway(adapters={})
+        gateway.register("fake", adapter, ProviderLimits(requests_per_minute=0))
+
+        result = gateway.analyze("fake", "hi", system="persona " * 40000, use_cache=False)
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(adapter.calls, 0)
+        result = gateway.analyze("fake", "data " * 40000, use_cache=False)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(gateway.metrics()["fake"]["truncated"], 1)
+        self.assertEqual(gateway.metrics()["fake"]["rejected"], 1)
+
+        result = gateway.analyze("fake", "data " * 2000, use_cache=False, prompt_budget=500)
+        self.assertLessEqual(count_tokens(result["analysis"], "gemini-pro", "google"), 510)
+        self.assertEqual(gateway.metrics()["fake"]["truncated"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# src/tests/test_response_cache.py
+
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from tools.ai.gateway import LLMGateway, ProviderLimits
+from tools.ai.response_cache import ResponseCache, response_key
+from tests.test_llm_gateway import FakeAdapter
+
+def bag_of_words(text):
+    """Tiny deterministic embedder for near-duplicate tests"""
+    vocabulary = ["hammock", "camping", "chair", "price", "competition", "trend", "the", "for"]
+    words = text.lower().split()
+    return [words.count(term) for term in vocabulary]
+
+class TestResponseCache(unittest.TestCase):
+    """Test suite for the LLM prompt-response cache"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def test_key_normalization(self):
+        """Test that whitespace differences share a key and parameters do not"""
+        self.assertEqual(
+            response_key("openai", "gpt-4o", "Analyze  hammock\nmarket"),
+            response_key("openai", "gpt-4o", " Analyze hammock market ")
+        )
+        self.assertNotEqual(
+            response_key("openai", "gpt-4o", "Analyze hammock market", {"max_tokens": 100}),
+            response_key("openai", "gpt-4o", "Analyze hammock market", {"max_tokens": 200})
+        )
+
+    def test_memory_and_disk_hits(self):
+        """Test LRU memory hits and reloading from disk"""
+        cache = ResponseCache(storage_dir=self.storage_dir, max_memory_entries=1)
+        cache.put("openai", "gpt-4o", "prompt a", {"analysis": "a"})
+        cache.put("openai", "gpt-4o", "prompt b", {"analysis": "b"})
+
+        self.assertEqual(cache.get("openai", "gpt-4o", "prompt b")["analysis"], "b")
+        self.assertEqual(cache.get("openai", "gpt-4o", "prompt a")["analysis"], "a")
+        self.assertIsNone(cache.get("anthropic", "gpt-4o", "prompt a"))
+
+        reopened = ResponseCache(storage_dir=self.storage_dir)
+        self.assertEqual(reopened.get("openai", "gpt-4o", "prompt a")["analysis"], "a")
+
+        metrics = cache.metrics()
+        self.assertEqual((metrics["memory_hits"], metrics["disk_hits"], metrics["misses"]), (1, 1, 1))
+        self.assertAlmostEqual(metrics["hit_rate"], 2 / 3)
+
+    def test_ttl_and_size_eviction(self):
+        """Test expiry and least-recently-used eviction past the size limit"""
+        cache = ResponseCache(storage_dir=self.storage_dir, ttl=timedelta(seconds=-1))
+        cache.put("openai", "gpt-4o", "stale", {"analysis": "old"})
+        self.assertIsNone(cache.get("openai", "gpt-4o", "stale"))
+        self.assertEqual(cache.metrics()["expired"], 1)
+
+        cache = ResponseCache(storage_dir=self.storage_dir, max_disk_bytes=2000)
+        for i in range(20):
+            cache.put("openai", "gpt-4o", f"prompt {i}", {"analysis": "x" * 100})
+        self.assertLessEqual(cache.metrics()["disk_bytes"], 2000)
+        self.assertGreater(cache.metrics()["evictions"], 0)
+        self.assertIsNotNone(cache.get("openai", "gpt-4o", "prompt 19"))
+
+    def test_near_duplicate_lookup(self):
+        """Test similarity fallback within the same provider and model"""
+        cache = ResponseCache(storage_dir=self.storage_dir, embedder=bag_of_words, similarity_threshold=0.95)
+        cache.put("openai", "gpt-4o", "price competition for the hammock", {"analysis": "cached"})
+
+        hit = cache.get("openai", "gpt-4o", "the hammock price competition for")
+        self.assertEqual(hit["analysis"], "cached")
+        self.assertIsNone(cache.get("openai", "gpt-4o", "camping chair trend"))
+        self.assertIsNone(cache.get("google", "gemini-pro", "the hammock price competition for"))
+        self.assertEqual(cache.metrics()["semantic_hits"], 1)
+
+    def test_gateway_serves_repeat_prompts_from_cache(self):
+        """Test that the gateway skips the provider for repeated prompts"""
+        adapter = FakeAdapter()
+        gateway = LLMGateway(adapters={}, cache=ResponseCache(storage_dir=self.storage_dir))
+        gateway.register("fake", adapter, ProviderLimits(requests_per_minute=0))
+
+        first = gateway.analyze("fake", "Analyze the hammock market")
+        second = gateway.analyze("fake", "Analyze the  hammock market")
+        bypass = gateway.analyze("fake", "Analyze the hammock market", use_cache=False)
+
+        self.assertNotIn("cached", first)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["analysis"], first["analysis"])
+        self.assertNotIn("cached", bypass)
+        self.assertEqual(adapter.calls, 2)
+        self.assertEqual(gateway.cache_metrics()["hits"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
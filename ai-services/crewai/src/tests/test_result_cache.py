@@ -0,0 +1,58 @@
+# src/tests/test_result_cache.py
+
+import unittest
+import tempfile
+from datetime import timedelta
+from crews.result_cache import CrewResultCache, stable_hash
+
+class TestCrewResultCache(unittest.TestCase):
+    """Test suite for whole-run crew result memoization"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CrewResultCache(storage_dir=self.tmp.name)
+        self.result = {"status": "success", "market_data": "strong demand"}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.tmp.cleanup()
+
+    def test_stable_hash(self):
+        """Test that key hashing ignores dict ordering but not values"""
+        self.assertEqual(stable_hash({"a": 1, "b": [1, 2]}), stable_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(stable_hash({"a": 1}), stable_hash({"a": 2}))
+
+    def test_round_trip_and_stats(self):
+        """Test storing and retrieving a crew result"""
+        self.assertIsNone(self.cache.get("k1"))
+        self.cache.put("k1", "hammock", self.result)
+        self.assertEqual(self.cache.get("k1"), self.result)
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(self.cache.stats["misses"], 1)
+
+        # Entries survive a new cache instance
+        self.assertEqual(CrewResultCache(storage_dir=self.tmp.name).get("k1"), self.result)
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses"""
+        self.cache.put("k1", "hammock", self.result, ttl=timedelta(seconds=-1))
+        self.cache.put("k2", "hammock", self.result)
+        self.assertIsNone(self.cache.get("k1"))
+        self.cache.put("k3", "tent", self.result, ttl=timedelta(seconds=-1))
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertIsNotNone(self.cache.get("k2"))
+
+    def test_invalidation(self):
+        """Test explicit invalidation by key and keyword"""
+        self.cache.put("k1", "hammock", self.result)
+        self.cache.put("k2", "hammock", self.result)
+        self.cache.put("k3", "tent", self.result)
+
+        self.assertTrue(self.cache.invalidate("k3"))
+        self.assertFalse(self.cache.invalidate("k3"))
+        self.assertEqual(self.cache.invalidate_keyword("hammock"), 2)
+        self.assertIsNone(self.cache.get("k1"))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
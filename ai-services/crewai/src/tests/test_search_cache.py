@@ -0,0 +1,181 @@
+# src/tests/test_search_cache.py
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from tools.search.fusion import canonical_url, reciprocal_rank_fusion
+from tools.search.local_index import LocalIndex
+from tools.search.search_cache import QuotaCounter, SearchCache, normalize_query
+from tools.search.web_search import WebSearchTool
+
+class FakeSerpSearch(WebSearchTool):
+    """WebSearchTool with the SerpAPI request replaced by a slow canned response"""
+
+    def __init__(self, *args, delay=0.0, **kwargs):
+        kwargs.setdefault("index", LocalIndex(":memory:"))
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+
+    def _request(self, query):
+        with self._requests_lock:
+            self.requests += 1
+        time.sleep(self.delay)
+        return {"organic_results": [
+            {"title": f"{query} result", "link": "https://example.com/a", "snippet": "...", "position": 1}
+        ]}
+
+class CannedSerpSearch(FakeSerpSearch):
+    """Returns fixed links per query and fails for queries it does not know"""
+
+    def __init__(self, links, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.links = links
+
+    def _request(self, query):
+        time.sleep(self.delay)
+        if query not in self.links:
+            raise ConnectionError("SerpAPI unavailable")
+        return {"organic_results": [
+            {"title": link, "link": link, "position": i + 1} for i, link in enumerate(self.links[query])
+        ]}
+
+class TestSearchCache(unittest.TestCase):
+    """Test suite for the cached, coalescing SerpAPI layer"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"SERP_API_KEY": "test-key"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def make_tool(self, **kwargs):
+        return FakeSerpSearch(cache=SearchCache(self.storage_dir), **kwargs)
+
+    def test_normalize_query(self):
+        """Test that case, spacing and punctuation are ignored but words and order are kept"""
+        self.assertEqual(normalize_query("Bamboo  Cutting Board, SUPPLIERS?"), "bamboo cutting board suppliers")
+        self.assertEqual(normalize_query("hammocks under $20."), "hammocks under $20")
+        self.assertNotEqual(normalize_query("flights from NYC to LA"), normalize_query("flights from LA to NYC"))
+        self.assertNotEqual(normalize_query("best camping hammock"), normalize_query("camping hammock"))
+        self.assertNotEqual(normalize_query("bamboo board"), normalize_query("bamboo boards"))
+
+    def test_repeat_searches_hit_persistent_cache(self):
+        """Test that equivalent queries are served from disk across instances"""
+        tool = self.make_tool()
+        first = tool.search("hammock wholesale supplier")
+        self.assertNotIn("cached", first)
+
+        second = self.make_tool().search("Hammock  Wholesale SUPPLIER")
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["results"], first["results"])
+        self.assertEqual(tool.stats()["api_calls"], 1)
+
+        expired = FakeSerpSearch(cache=SearchCache(self.storage_dir, ttl=timedelta(seconds=-1)))
+        expired.search("hammock straps")
+        self.assertNotIn("cached", expired.search("hammock straps"))
+        self.assertEqual(expired.requests, 2)
+
+    def test_concurrent_identical_searches_coalesce(self):
+        """Test single-flight: one SerpAPI call for simultaneous duplicates"""
+        tool = self.make_tool(delay=0.1)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: tool.search("camping hammock", use_cache=False), range(8)))
+
+        self.assertEqual(tool.requests, 1)
+        self.assertTrue(all(r["status"] == "success" for r in results))
+        self.assertEqual(tool.stats()["coalesced"], 7)
+
+    def test_monthly_quota(self):
+        """Test that searches fail fast once the quota is spent and counts persist"""
+        tool = self.make_tool(monthly_quota=2)
+        tool.search("a hammock")
+        tool.search("b hammock")
+        result = tool.search("c hammock")
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(tool.requests, 2)
+        self.assertEqual(tool.search("a hammock")["status"], "success")
+        stats = self.make_tool(monthly_quota=2).stats()
+        self.assertEqual((stats["quota_used"], stats["quota_remaining"]), (2, 0))
+
+    def test_quota_shared_across_counters(self):
+        """Test that counters on one file (as in separate processes) never lose increments"""
+        path = os.path.join(self.storage_dir, "quota.json")
+        counters = [QuotaCounter(path, monthly_limit=150) for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            granted = list(executor.map(lambda i: counters[i % 4].consume(), range(200)))
+
+        self.assertEqual(sum(granted), 150)
+        self.assertEqual(QuotaCounter(path).used(), 150)
+
+class TestSearchMany(unittest.TestCase):
+    """Test suite for concurrent multi-query search with rank fusion"""
+
+    RESULTS = {
+        "hammock supplier": ["https://www.acme.com/hammocks/", "https://b.com", "https://c.com"],
+        "hammock wholesale": ["https://c.com/?utm_source=serp", "https://acme.com/hammocks#top", "https://d.com"],
+        "hammock manufacturer": ["https://acme.com/hammocks", "https://e.com"]
+    }
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"SERP_API_KEY": "test-key"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def make_tool(self, delay=0.0):
+        return CannedSerpSearch(self.RESULTS, cache=SearchCache(self.storage_dir), delay=delay)
+
+    def test_canonical_url(self):
+        """Test host, slash, fragment and tracking-parameter normalization"""
+        self.assertEqual(canonical_url("http://WWW.Acme.com/p/?utm_source=x&id=2#top"), "https://acme.com/p?id=2")
+        self.assertEqual(canonical_url("https://acme.com"), "https://acme.com/")
+
+    def test_reciprocal_rank_fusion(self):
+        """Test that agreement across queries outranks a single top hit"""
+        merged = reciprocal_rank_fusion({
+            "q1": [{"link": "https://x.com"}, {"link": "https://y.com"}],
+            "q2": [{"link": "https://y.com"}],
+            "q3": [{"link": "https://z.com"}]
+        })
+        self.assertEqual([r["link"] for r in merged][0], "https://y.com")
+        self.assertEqual(merged[0]["queries"], ["q1", "q2"])
+        self.assertEqual([r["position"] for r in merged], [1, 2, 3])
+
+    def test_search_many_runs_concurrently_and_dedupes(self):
+        """Test concurrent execution, canonical dedupe and partial failures"""
+        tool = self.make_tool(delay=0.2)
+        start = time.perf_counter()
+        result = tool.search_all(list(self.RESULTS) + ["hammock hanger", "hammock supplier"])
+
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(result["status"], "success")
+        links = [canonical_url(r["link"]) for r in result["results"]]
+        self.assertEqual(len(links), len(set(links)))
+        self.assertEqual(links[0], "https://acme.com/hammocks")
+        self.assertEqual(len(result["results"][0]["queries"]), 3)
+        self.assertEqual(list(result["errors"]), ["hammock hanger"])
+
+        failed = tool.search_all(["hammock hanger"])
+        self.assertEqual(failed["status"], "error")
+
+if __name__ == '__main__':
+    unittest.main()
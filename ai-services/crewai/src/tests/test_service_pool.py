@@ -0,0 +1,130 @@
+# src/tests/test_service_pool.py
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from api.service_pool import ServicePool, ServiceUnavailableError, service_factory
+
+class FakeCrewService:
+    """Counts constructions and answers create_crew after a short delay"""
+
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with FakeCrewService.lock:
+            FakeCrewService.created += 1
+
+    async def create_crew(self, config):
+        await asyncio.sleep(0.05)
+        return {"crew_id": config["name"]}
+
+class FlakyFactory:
+    """Fails the first ``failures`` builds, then builds FakeCrewService"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("license server unreachable")
+        return FakeCrewService()
+
+class TestServicePool(unittest.TestCase):
+    """Test suite for the warm crew service pool"""
+
+    def setUp(self):
+        """Set up test environment"""
+        FakeCrewService.created = 0
+        self.pool = ServicePool(
+            {"enterprise": FakeCrewService, "self_hosted": service_factory("self_hosted.service:SelfHostedCrewService")},
+            size=2,
+            timeout=0.2
+        )
+        self.addCleanup(self.pool.close)
+
+    def create(self, mode, name):
+        with self.pool.acquire(mode) as service:
+            return asyncio.run(service.create_crew({"name": name}))
+
+    def test_services_are_built_once_and_reused(self):
+        """Test that warm builds the pool and requests never construct more"""
+        self.pool.warm()
+        self.assertEqual(FakeCrewService.created, 2)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda i: self.create("enterprise", f"crew-{i}"), range(6)))
+
+        self.assertEqual([r["crew_id"] for r in results], [f"crew-{i}" for i in range(6)])
+        self.assertEqual(FakeCrewService.created, 2)
+        metrics = self.pool.metrics()["enterprise"]
+        self.assertEqual((metrics["requests"], metrics["errors"], metrics["latency_samples"]), (6, 0, 6))
+        self.assertGreaterEqual(metrics["latency_p50"], 0.05)
+
+    def test_missing_mode_is_reported_unavailable(self):
+        """Test that a service that cannot be imported shows in readiness"""
+        self.pool.warm()
+        readiness = self.pool.readiness()
+        self.assertTrue(readiness["ready"])
+        self.assertEqual(readiness["modes"]["enterprise"], {"available": True, "warm": 2, "idle": 2, "error": None})
+        self.assertFalse(readiness["modes"]["self_hosted"]["available"])
+        self.assertIn("ModuleNotFoundError", readiness["modes"]["self_hosted"]["error"])
+        with self.assertRaises(ServiceUnavailableError):
+            self.create("self_hosted", "crew")
+
+    def test_failed_mode_is_rebuilt_in_the_background(self):
+        """Test that a build error clears once a background retry after the backoff succeeds"""
+        factory = FlakyFactory(failures=2)
+        pool = ServicePool({"enterprise": factory}, size=1, retry_base=0.05)
+        self.addCleanup(pool.close)
+        with self.assertRaises(ServiceUnavailableError):
+            with pool.acquire("enterprise"):
+                pass
+        self.assertIn("ConnectionError", pool.readiness()["modes"]["enterprise"]["error"])
+        self.assertEqual(factory.calls, 1)
+
+        deadline = time.monotonic() + 2
+        while not pool.readiness()["ready"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(factory.calls, 3)
+        self.assertEqual(pool.readiness()["modes"]["enterprise"], {"available": True, "warm": 1, "idle": 1, "error": None})
+        with pool.acquire("enterprise") as service:
+            self.assertIsInstance(service, FakeCrewService)
+
+    def test_readiness_does_not_wait_for_builds(self):
+        """Test that readiness and metrics answer while a mode is being built"""
+        def slow_factory():
+            time.sleep(0.3)
+            return FakeCrewService()
+
+        pool = ServicePool({"enterprise": slow_factory, "self_hosted": FakeCrewService}, size=1)
+        self.addCleanup(pool.close)
+        building = threading.Thread(target=pool.warm)
+        building.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        readiness = pool.readiness()
+        pool.metrics()
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertFalse(readiness["modes"]["enterprise"]["available"])
+        with pool.acquire("self_hosted"):
+            pass
+        building.join()
+        self.assertTrue(pool.readiness()["modes"]["enterprise"]["available"])
+
+    def test_busy_pool_waits_then_times_out(self):
+        """Test that checkouts beyond the pool size wait and give up after the timeout"""
+        with self.pool.acquire("enterprise"), self.pool.acquire("enterprise"):
+            self.assertEqual(self.pool.readiness()["modes"]["enterprise"]["idle"], 0)
+            started = time.perf_counter()
+            with self.assertRaises(ServiceUnavailableError):
+                self.create("enterprise", "crew")
+            self.assertGreaterEqual(time.perf_counter() - started, 0.2)
+        self.assertEqual(self.pool.metrics()["enterprise"]["waits"], 1)
+        self.assertEqual(self.pool.readiness()["modes"]["enterprise"]["idle"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
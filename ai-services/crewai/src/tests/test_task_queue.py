@@ -0,0 +1,130 @@
+# src/tests/test_task_queue.py
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from api.task_queue import TaskQueue, QueueWorker
+
+class TestTaskQueue(unittest.TestCase):
+    """Test suite for the durable SQLite task queue and its workers"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.storage_dir, "queue.db")
+        self.queue = self.make_queue()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def make_queue(self, **kwargs):
+        kwargs.setdefault("backoff_base", 0.05)
+        queue = TaskQueue(self.path, **kwargs)
+        self.addCleanup(queue.close)
+        return queue
+
+    def test_priority_order_and_durability(self):
+        """Test that higher priority leases first and tasks survive a reopen"""
+        self.queue.enqueue("amazon_research", {"keyword": "yoga mat"})
+        urgent = self.queue.enqueue("sov_sweep", {"seeds": ["hammock"]}, priority=5)
+        self.assertEqual(self.queue.enqueue("sov_sweep", {}, task_id=urgent), urgent)
+
+        reopened = self.make_queue()
+        self.assertEqual(reopened.stats()["tasks"]["pending"], 2)
+        task = reopened.lease("w1")
+        self.assertEqual((task["id"], task["payload"], task["attempts"]), (urgent, {"seeds": ["hammock"]}, 1))
+        self.assertEqual(reopened.lease("w1", kinds=["sov_sweep"]), None)
+        self.assertEqual(reopened.lease("w1")["kind"], "amazon_research")
+
+    def test_concurrent_workers_never_share_a_task(self):
+        """Test that leases from separate connections are exclusive"""
+        for i in range(20):
+            self.queue.enqueue("amazon_research", {"n": i})
+        queues = [self.make_queue() for _ in range(4)]
+
+        def drain(index):
+            leased = []
+            while (task := queues[index].lease(f"w{index}")) is not None:
+                leased.append(task["payload"]["n"])
+            return leased
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leased = [n for batch in executor.map(drain, range(4)) for n in batch]
+        self.assertEqual(sorted(leased), list(range(20)))
+
+    def test_expired_lease_is_retried_and_heartbeat_keeps_it(self):
+        """Test visibility timeout: lapsed leases move on, heartbeats hold them"""
+        task_id = self.queue.enqueue("amazon_research", {})
+        self.queue.lease("w1", lease_seconds=0.1)
+        self.assertTrue(self.queue.heartbeat(task_id, "w1", lease_seconds=0.1, progress={"event": "task"}))
+        time.sleep(0.05)
+        self.assertIsNone(self.queue.lease("w2"))
+
+        time.sleep(0.15)
+        task = self.queue.lease("w2")
+        self.assertEqual((task["lease_owner"], task["attempts"], task["progress"]), ("w2", 2, {"event": "task"}))
+        self.assertFalse(self.queue.complete(task_id, "w1", "stale"))
+        self.assertTrue(self.queue.complete(task_id, "w2", {"ok": True}))
+        self.assertEqual(self.queue.get(task_id)["result"], {"ok": True})
+
+    def test_backoff_dead_letter_and_requeue(self):
+        """Test exponential retry delays, dead-lettering and requeue"""
+        task_id = self.queue.enqueue("sov_sweep", {}, max_attempts=2)
+        self.queue.lease("w1")
+        self.assertEqual(self.queue.fail(task_id, "w1", "JungleScout 503"), "pending")
+        self.assertIsNone(self.queue.lease("w1"))
+
+        time.sleep(0.06)
+        self.queue.lease("w1")
+        self.assertEqual(self.queue.fail(task_id, "w1", "JungleScout 503"), "dead")
+        self.assertEqual(self.queue.backoff(2), 0.1)
+        self.assertEqual([t["id"] for t in self.queue.list("dead")], [task_id])
+
+        self.assertTrue(self.queue.requeue(task_id))
+        self.assertFalse(self.queue.requeue(task_id))
+        self.assertEqual(self.queue.lease("w1")["attempts"], 1)
+
+    def test_worker_runs_retries_and_dead_letters(self):
+        """Test the worker loop with succeeding, flaky and broken handlers"""
+        calls = {"flaky": 0}
+
+        def flaky(payload, progress):
+            calls["flaky"] += 1
+            progress("attempt", calls["flaky"])
+            if calls["flaky"] < 2:
+                raise ConnectionError("provider unavailable")
+            return "recovered"
+
+        async def research(payload, progress):
+            return {"keyword": payload["keyword"]}
+
+        def broken(payload, progress):
+            raise KeyError("seeds")
+
+        ok = self.queue.enqueue("amazon_research", {"keyword": "yoga mat"})
+        retried = self.queue.enqueue("create_crew", {})
+        dead = self.queue.enqueue("sov_sweep", {}, max_attempts=1)
+        worker = QueueWorker(
+            self.queue,
+            {"amazon_research": research, "create_crew": flaky, "sov_sweep": broken},
+            worker_id="w1",
+            concurrency=2,
+            poll_interval=0.02
+        )
+        worker.start()
+        deadline = time.monotonic() + 5
+        while self.queue.stats()["tasks"]["pending"] + self.queue.stats()["tasks"]["leased"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        worker.stop()
+
+        self.assertEqual(self.queue.get(ok)["result"], {"keyword": "yoga mat"})
+        self.assertEqual((self.queue.get(retried)["result"], self.queue.get(retried)["attempts"]), ("recovered", 2))
+        self.assertEqual(self.queue.get(dead)["status"], "dead")
+        self.assertEqual(worker.stats, {"succeeded": 2, "failed": 2, "lost_leases": 0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# src/tests/test_tool_registry.py
+
+import unittest
+from tools.registry import ToolRegistry, ToolSpec, get_registry
+
+class DummyClient:
+    """Minimal client standing in for an SDK wrapper"""
+    instances = 0
+
+    def __init__(self, api_key=None):
+        DummyClient.instances += 1
+        self.api_key = api_key
+
+    def analyze(self, text):
+        return {"status": "success", "analysis": text}
+
+class TestToolRegistry(unittest.TestCase):
+    """Test suite for the shared tool registry"""
+
+    def setUp(self):
+        """Set up test environment"""
+        DummyClient.instances = 0
+        self.registry = ToolRegistry()
+        self.registry.register("dummy", ToolSpec(
+            DummyClient,
+            default_credentials=lambda: {"api_key": "default"},
+            tracked_methods=("analyze",)
+        ))
+
+    def test_lazy_singleton_per_credentials(self):
+        """Test one client per (provider, credentials)"""
+        self.assertEqual(DummyClient.instances, 0)
+        first = self.registry.get("dummy")
+        second = self.registry.get("dummy")
+        other = self.registry.get("dummy", api_key="other")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(other.api_key, "other")
+        self.assertEqual(DummyClient.instances, 2)
+
+    def test_usage_tracking(self):
+        """Test acquisition and call counters"""
+        client = self.registry.get("dummy")
+        self.registry.get("dummy")
+        client.analyze("hammock")
+        client.analyze("hammock stand")
+
+        usage = self.registry.usage()
+        self.assertEqual(len(usage), 1)
+        stats = next(iter(usage.values()))
+        self.assertEqual(stats, {"acquisitions": 2, "calls": 2})
+        self.assertTrue(all(k.startswith("dummy:") for k in usage))
+        self.assertNotIn("default", next(iter(usage)))
+
+    def test_unknown_provider(self):
+        """Test that unregistered providers are rejected"""
+        with self.assertRaises(KeyError):
+            self.registry.get("missing")
+
+    def test_default_registry(self):
+        """Test that the process-wide registry is shared and preconfigured"""
+        self.assertIs(get_registry(), get_registry())
+        for provider in ["junglescout", "gpt4", "claude", "gemini", "web_search", "perplexity"]:
+            self.assertIn(provider, get_registry()._specs)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,95 @@
+# src/tests/test_usage_tracker.py
+
+import unittest
+import threading
+from tools.ai.usage import UsageTracker, attribute_usage, estimate_cost, merge_usage, split_model
+
+class TestUsageTracker(unittest.TestCase):
+    """Test suite for LLM token and cost accounting"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tracker = UsageTracker()
+
+    def test_cost_estimate(self):
+        """Test per-model pricing"""
+        self.assertAlmostEqual(estimate_cost("gpt-4-turbo-preview", 1000, 1000), 0.04)
+        self.assertEqual(estimate_cost("unknown-model", 1000, 1000), 0.0)
+
+    def test_prompt_cache_pricing(self):
+        """Test that cache reads and writes are priced per provider"""
+        uncached = estimate_cost("claude-3-opus-20240229", 10000, 0)
+        self.assertAlmostEqual(estimate_cost("claude-3-opus-20240229", 0, 0, cache_read_tokens=10000, provider="anthropic"), uncached * 0.1)
+        self.assertAlmostEqual(estimate_cost("claude-3-opus-20240229", 0, 0, cache_write_tokens=10000, provider="anthropic"), uncached * 1.25)
+
+        record = self.tracker.record("anthropic", "claude-3-opus-20240229", 100, 50, cache_read_tokens=2000)
+        self.assertEqual(record["total_tokens"], 2150)
+        self.assertEqual(self.tracker.summary("provider")["anthropic"]["cache_read_tokens"], 2000)
+
+    def test_split_model_provider(self):
+        """Test that crewAI model routes and bare names map to a priced provider"""
+        self.assertEqual(split_model("anthropic/claude-3-haiku-20240307"), ("anthropic", "claude-3-haiku-20240307"))
+        self.assertEqual(split_model("gemini/gemini-1.5-flash"), ("google", "gemini-1.5-flash"))
+        self.assertEqual(split_model("gpt-4o"), ("openai", "gpt-4o"))
+        self.assertEqual(split_model("ollama/llama3"), (None, "llama3"))
+        self.assertEqual(split_model(None), (None, None))
+
+    def test_attribution_and_aggregation(self):
+        """Test aggregation by provider, agent, task and run"""
+        with attribute_usage(run_id="run-1", agent="market_researcher"):
+            with attribute_usage(task="market_research"):
+                self.tracker.record("openai", "gpt-4-turbo-preview", 1000, 500, latency=1.5)
+            self.tracker.record("anthropic", "claude-3-opus-20240229", 2000, 100, latency=3.0, status="error")
+        self.tracker.record("google", "gemini-pro", 10, 10)
+
+        by_provider = self.tracker.summary("provider")
+        self.assertEqual(by_provider["openai"]["prompt_tokens"], 1000)
+        self.assertEqual(by_provider["anthropic"]["errors"], 1)
+
+        run = self.tracker.run_usage("run-1")
+        self.assertEqual(run["totals"]["calls"], 2)
+        self.assertEqual(run["totals"]["total_tokens"], 3600)
+        self.assertEqual(set(run["by_task"]), {"market_research"})
+        self.assertAlmostEqual(run["by_agent"]["market_researcher"]["latency"], 4.5)
+
+        metrics = self.tracker.metrics()
+        self.assertEqual(metrics["totals"]["calls"], 3)
+        self.assertEqual(metrics["runs_tracked"], 1)
+
+    def test_run_aggregates_are_bounded(self):
+        """Test that persisted runs are evicted and the oldest runs age out"""
+        tracker = UsageTracker(max_runs=2)
+        for run_id in ("run-a", "run-b", "run-c"):
+            tracker.record("openai", "gpt-4o", 10, 5, run_id=run_id)
+        self.assertEqual(set(tracker.summary("run_id")), {"run-b", "run-c"})
+        self.assertEqual(tracker.run_usage("run-a")["totals"]["calls"], 0)
+
+        first = tracker.run_usage("run-c")
+        tracker.evict_run("run-c")
+        self.assertEqual(tracker.metrics()["runs_tracked"], 1)
+        self.assertNotIn("run-c", tracker.summary("run_id"))
+        self.assertEqual(tracker.metrics()["totals"]["calls"], 3)
+
+        tracker.record("anthropic", "claude-3-haiku-20240307", 20, 5, run_id="run-c", agent="pricing_strategist")
+        merged = merge_usage(first, tracker.run_usage("run-c"))
+        self.assertEqual(merged["totals"]["total_tokens"], 40)
+        self.assertEqual(set(merged["by_provider"]), {"openai", "anthropic"})
+        self.assertEqual(merged["by_agent"]["pricing_strategist"]["calls"], 1)
+
+    def test_attribution_is_context_local(self):
+        """Test that attribution does not leak across threads"""
+        def worker():
+            self.tracker.record("openai", "gpt-4o", 1, 1)
+
+        with attribute_usage(run_id="run-2"):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        self.assertIsNone(self.tracker.records[-1]["run_id"])
+
+        with self.assertRaises(ValueError):
+            with attribute_usage(customer="acme"):
+                pass
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,142 @@
+# src/tests/test_vector_index.py
+
+import hashlib
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+from crews.amazon.amazon_memory_store import AmazonMemoryStore
+from tools.ai.vector_index import VectorIndex, SemanticRecallTool
+from tests.amazon.test_research_brief import share_of_voice
+
+class HashingEmbedder:
+    """Offline bag-of-words embedder that counts its batch calls"""
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return vectors
+
+class TestVectorIndex(unittest.TestCase):
+    """Test suite for the local embedding index and semantic recall"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.storage_dir = tempfile.mkdtemp()
+        self.embedder = HashingEmbedder()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def make_index(self, **kwargs):
+        return VectorIndex(self.storage_dir, embedder=self.embedder, **kwargs)
+
+    def test_batched_incremental_indexing(self):
+        """Test that writes are embedded in batches and searched by cosine"""
+        index = self.make_index(batch_size=4)
+        topics = ["camping hammock straps", "bamboo cutting board", "yoga mat grip",
+                  "hammock stand frame", "silicone baking mat"]
+        for i, topic in enumerate(topics):
+            index.add(f"doc-{i}", f"Research on {topic}", {"topic": topic})
+        index.flush()
+        self.assertEqual(sum(self.embedder.batches), 5)
+        self.assertLessEqual(len(self.embedder.batches), 2)
+
+        batches = len(self.embedder.batches)
+        results = index.search("hammock", k=2)
+        self.assertEqual(self.embedder.batches[batches:], [1])
+        self.assertEqual({r["id"] for r in results}, {"doc-0", "doc-3"})
+        self.assertEqual(index.search("hammock", k=1, where=lambda m: "stand" in m["topic"])[0]["id"], "doc-3")
+
+    def test_writes_never_wait_on_the_embedder(self):
+        """Test that a full batch is embedded in the background, not inside add"""
+        release = threading.Event()
+
+        def slow_embedder(texts):
+            release.wait(5)
+            return self.embedder(texts)
+
+        index = VectorIndex(self.storage_dir, embedder=slow_embedder, batch_size=2)
+        started = time.perf_counter()
+        index.add("a", "camping hammock market")
+        index.add("b", "bamboo cutting board suppliers")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        release.set()
+        self.assertEqual(index.search("hammock", k=1)[0]["id"], "a")
+
+    def test_processes_sharing_a_dir_stay_aligned(self):
+        """Test that appends from two index instances interleave without mixing rows"""
+        first, second = self.make_index(), self.make_index()
+        for i in range(10):
+            (first if i % 2 else second).add(f"doc-{i}", f"topic{chr(97 + i)} research notes")
+            first.flush()
+            second.flush()
+
+        for index in (first, second, self.make_index()):
+            self.assertEqual(len(index), 10)
+            for i in range(10):
+                self.assertEqual(index.search(f"topic{chr(97 + i)}", k=1)[0]["id"], f"doc-{i}")
+
+    def test_persistence_replacement_and_torn_writes(self):
+        """Test reload from disk, replacement by id and trimming a torn tail"""
+        index = self.make_index()
+        index.add("a", "bamboo cutting board suppliers")
+        index.add("b", "camping hammock market")
+        index.flush()
+        index.add("a", "yoga mat grip analysis")
+        index.flush()
+
+        with open(index._documents_path, 'a') as f:
+            f.write('{"id": "torn", "text": "half')
+        reopened = self.make_index()
+        self.assertEqual(len(reopened), 2)
+        self.assertNotIn("bamboo cutting board suppliers", [r["text"] for r in reopened.search("bamboo board")])
+        self.assertEqual(reopened.search("yoga mat", k=1)[0]["text"], "yoga mat grip analysis")
+
+        reopened.add("c", "silicone baking mat")
+        reopened.flush()
+        self.assertEqual(self.make_index().search("silicone baking", k=1)[0]["id"], "c")
+
+    def test_approximate_index_above_threshold(self):
+        """Test that large corpora switch to IVF and still find exact matches"""
+        index = self.make_index(batch_size=64, ann_threshold=200)
+        words = [f"term{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}" for i in range(600)]
+        for i in range(600):
+            index.add(f"doc-{i}", f"{words[i]} {words[(i * 7) % 600]} {words[(i * 13) % 600]}")
+        index.flush()
+
+        self.assertIsNotNone(index._ivf)
+        hits = sum(index.search(f"{words[i]} {words[(i * 7) % 600]} {words[(i * 13) % 600]}", k=1)[0]["id"] == f"doc-{i}"
+                   for i in range(0, 600, 20))
+        self.assertGreaterEqual(hits, 27)
+
+    def test_memory_store_writes_are_recallable(self):
+        """Test that stored insights and agent outputs feed the recall tool"""
+        index = self.make_index()
+        store = AmazonMemoryStore(storage_dir=self.storage_dir + "/memory", vector_index=index)
+        store.store_market_insight("camping hammock", share_of_voice(8, 3))
+        store.store_competition_analysis("camping hammock", share_of_voice(8, 3))
+        store.start_run("run-1", "yoga mat")
+        store.store_task_output("run-1", "pricing_strategy", "Price yoga mats at $29 to undercut leaders")
+        store.finish_run("run-1", "success")
+
+        tool = SemanticRecallTool(index)
+        result = tool.recall("yoga mat pricing", k=1)
+        self.assertEqual(result["results"][0]["metadata"]["task"], "pricing_strategy")
+        result = tool.recall("hammock competition price gaps", k=1, category="competition")
+        self.assertIn("Competition analysis for 'camping hammock'", result["results"][0]["text"])
+        self.assertEqual(tool.recall("hammock", category="market_research")["total_results"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
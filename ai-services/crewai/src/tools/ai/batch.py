@@ -0,0 +1,437 @@
+# src/tools/ai/batch.py
+
+from typing import Dict, Any, List, Optional, Callable
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from .preflight import preflight
+from .usage import get_usage_tracker
+
+logger = logging.getLogger(__name__)
+
+# Providers bill batch jobs at half the synchronous price
+BATCH_COST_FACTOR = 0.5
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchBackend:
+    """Contract for a provider's asynchronous batch API
+
+    ``submit`` takes request dicts (custom_id, model, prompt, max_tokens)
+    and returns a batch ID; ``status`` returns one of in_progress,
+    completed, failed, expired or cancelled; ``results`` maps custom_id to
+    {"status", "analysis" | "error", "prompt_tokens", "completion_tokens"}.
+    """
+
+    provider = ""
+    default_model = ""
+    max_batch_size = 10000
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        raise NotImplementedError
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API over /v1/chat/completions"""
+
+    provider = "openai"
+    default_model = "gpt-4-turbo-preview"
+    max_batch_size = 50000
+
+    def __init__(self, api_key: Optional[str] = None):
+        import openai
+        self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+
+    def submit(self, requests):
+        lines = []
+        for request in requests:
+            body = {
+                "model": request["model"],
+                "messages": [{"role": "user", "content": request["prompt"]}]
+            }
+            if request.get("max_tokens"):
+                body["max_tokens"] = request["max_tokens"]
+            lines.append(json.dumps({
+                "custom_id": request["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        upload = self.client.files.create(
+            file=("batch.jsonl", io.BytesIO("\n".join(lines).encode())),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    def status(self, batch_id):
+        status = self.client.batches.retrieve(batch_id).status
+        if status == "cancelling":
+            return "in_progress"
+        return status if status in TERMINAL_STATUSES else "in_progress"
+
+    def results(self, batch_id):
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                body = response.get("body") or {}
+                if item.get("error") or response.get("status_code", 200) >= 400:
+                    error = item.get("error") or body.get("error") or {}
+                    results[item["custom_id"]] = {
+                        "status": "error",
+                        "error": error.get("message", "Batch request failed") if isinstance(error, dict) else str(error)
+                    }
+                    continue
+                usage = body.get("usage") or {}
+                results[item["custom_id"]] = {
+                    "status": "success",
+                    "analysis": body["choices"][0]["message"]["content"],
+                    "prompt_tokens": usage.get("prompt_tokens", 0),
+                    "completion_tokens": usage.get("completion_tokens", 0)
+                }
+        return results
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API"""
+
+    provider = "anthropic"
+    default_model = "claude-3-opus-20240229"
+    max_batch_size = 100000
+
+    def __init__(self, api_key: Optional[str] = None):
+        import anthropic
+        self.client = anthropic.Anthropic(api_key=api_key or os.getenv("ANTHROPIC_API_KEY"))
+
+    def submit(self, requests):
+        batch = self.client.messages.batches.create(requests=[{
+            "custom_id": request["custom_id"],
+            "params": {
+                "model": request["model"],
+                "max_tokens": request.get("max_tokens") or 1000,
+                "messages": [{"role": "user", "content": request["prompt"]}]
+            }
+        } for request in requests])
+        return batch.id
+
+    def status(self, batch_id):
+        batch = self.client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return "in_progress"
+        counts = batch.request_counts
+        if counts.succeeded == 0 and counts.errored == 0:
+            return "expired" if counts.expired else "cancelled"
+        return "completed"
+
+    def results(self, batch_id):
+        results = {}
+        for entry in self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type != "succeeded":
+                error = getattr(result, "error", None)
+                results[entry.custom_id] = {
+                    "status": "error",
+                    "error": str(getattr(error, "error", error) or result.type)
+                }
+                continue
+            message = result.message
+            results[entry.custom_id] = {
+                "status": "success",
+                "analysis": "".join(getattr(block, "text", "") for block in message.content),
+                "prompt_tokens": message.usage.input_tokens,
+                "completion_tokens": message.usage.output_tokens
+            }
+        return results
+
+
+class LocalBatchBackend(BatchBackend):
+    """In-process stand-in implementing the batch contract
+
+    Batches complete after ``polls_until_done`` status checks and are
+    answered by ``handler(prompt)``, so batch flows can be exercised
+    without provider credentials.
+    """
+
+    provider = "local"
+    default_model = "local-echo"
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[str], str]] = None,
+        polls_until_done: int = 1,
+        max_batch_size: int = 10000,
+        fail_batches: bool = False
+    ):
+        self.handler = handler or (lambda prompt: f"echo: {prompt}")
+        self.polls_until_done = polls_until_done
+        self.max_batch_size = max_batch_size
+        self.fail_batches = fail_batches
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def submit(self, requests):
+        batch_id = f"local-{uuid.uuid4().hex[:12]}"
+        self.batches[batch_id] = {"requests": list(requests), "polls": 0}
+        return batch_id
+
+    def status(self, batch_id):
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        if batch["polls"] < self.polls_until_done:
+            return "in_progress"
+        return "failed" if self.fail_batches else "completed"
+
+    def results(self, batch_id):
+        results = {}
+        for request in self.batches[batch_id]["requests"]:
+            try:
+                analysis = self.handler(request["prompt"])
+            except Exception as e:
+                results[request["custom_id"]] = {"status": "error", "error": str(e)}
+                continue
+            results[request["custom_id"]] = {
+                "status": "success",
+                "analysis": analysis,
+                "prompt_tokens": len(request["prompt"]) // 4,
+                "completion_tokens": len(analysis) // 4
+            }
+        return results
+
+
+DEFAULT_BACKENDS = {
+    "openai": OpenAIBatchBackend,
+    "anthropic": AnthropicBatchBackend
+}
+
+
+class BatchCollector:
+    """Collects analyze requests and runs them as provider batch jobs
+
+    ``add`` queues a prompt and returns a Future; ``submit`` sends pending
+    requests per provider in chunks of the backend's maximum batch size;
+    ``wait`` polls until every batch finishes and resolves each Future with
+    the same result dict ``analyze`` returns. Submitted batch IDs are kept
+    in a JSON manifest so a restarted process can ``resume`` collecting.
+    """
+
+    def __init__(
+        self,
+        backends: Optional[Dict[str, BatchBackend]] = None,
+        storage_dir: str = "memory/llm_batches",
+        poll_interval: float = 60.0
+    ):
+        self.backends = dict(backends or {})
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.pending: Dict[str, List[Dict[str, Any]]] = {}
+        self.futures: Dict[str, Future] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self._lock = threading.Lock()
+
+    def _backend(self, provider: str) -> BatchBackend:
+        if provider not in self.backends:
+            if provider not in DEFAULT_BACKENDS:
+                raise KeyError(f"No batch backend for provider: {provider}")
+            self.backends[provider] = DEFAULT_BACKENDS[provider]()
+        return self.backends[provider]
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.storage_dir / "manifest.json"
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._manifest_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading batch manifest: {str(e)}")
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = self._manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        tmp_path.replace(self._manifest_path)
+
+    def add(
+        self,
+        prompt: str,
+        provider: str = "openai",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        custom_id: Optional[str] = None
+    ) -> Future:
+        """Queue one analysis request; the Future resolves after ``wait``
+
+        Raises ValueError for requests that cannot fit the model's context.
+        """
+        backend = self._backend(provider)
+        model = model or backend.default_model
+        checked = preflight(provider, model, prompt, max_tokens=max_tokens)
+        custom_id = custom_id or uuid.uuid4().hex
+        future: Future = Future()
+        with self._lock:
+            if custom_id in self.futures:
+                raise ValueError(f"Duplicate custom_id: {custom_id}")
+            self.futures[custom_id] = future
+            self.pending.setdefault(provider, []).append({
+                "custom_id": custom_id,
+                "model": model,
+                "prompt": checked["text"],
+                "max_tokens": checked["max_tokens"]
+            })
+        return future
+
+    def submit(self) -> List[str]:
+        """Submit every pending request and return the new batch IDs"""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+
+        batch_ids = []
+        for provider, requests in pending.items():
+            backend = self._backend(provider)
+            for i in range(0, len(requests), backend.max_batch_size):
+                chunk = requests[i:i + backend.max_batch_size]
+                try:
+                    batch_id = backend.submit(chunk)
+                except Exception as e:
+                    logger.error(f"Error submitting {provider} batch: {str(e)}")
+                    for request in chunk:
+                        self._resolve(request["custom_id"], {"status": "error", "error": str(e)})
+                    continue
+                logger.info(f"Submitted {provider} batch {batch_id} with {len(chunk)} requests")
+                self.manifest[batch_id] = {
+                    "provider": provider,
+                    "models": {r["custom_id"]: r["model"] for r in chunk},
+                    "status": "in_progress",
+                    "submitted_at": datetime.now().isoformat()
+                }
+                batch_ids.append(batch_id)
+        self._save_manifest()
+        return batch_ids
+
+    def outstanding(self) -> List[str]:
+        """Submitted batches that have not reached a terminal status"""
+        return [batch_id for batch_id, entry in self.manifest.items() if entry["status"] not in TERMINAL_STATUSES]
+
+    def poll(self) -> List[str]:
+        """Check each outstanding batch once; collect and return the finished ones"""
+        finished = []
+        for batch_id in self.outstanding():
+            entry = self.manifest[batch_id]
+            backend = self._backend(entry["provider"])
+            try:
+                status = backend.status(batch_id)
+            except Exception as e:
+                logger.error(f"Error polling batch {batch_id}: {str(e)}")
+                continue
+            if status not in TERMINAL_STATUSES:
+                continue
+
+            results = {}
+            if status == "completed":
+                try:
+                    results = backend.results(batch_id)
+                except Exception as e:
+                    logger.error(f"Error fetching results for batch {batch_id}: {str(e)}")
+                    continue
+            self._collect(batch_id, entry, status, results)
+            finished.append(batch_id)
+        if finished:
+            self._save_manifest()
+        return finished
+
+    def _collect(self, batch_id: str, entry: Dict[str, Any], status: str, results: Dict[str, Dict[str, Any]]):
+        """Map a finished batch's results back to their callers"""
+        tracker = get_usage_tracker()
+        for custom_id, model in entry["models"].items():
+            result = results.get(custom_id) or {
+                "status": "error",
+                "error": f"Batch {batch_id} {status} without a result for this request"
+            }
+            if result["status"] == "success":
+                tracker.record(
+                    entry["provider"],
+                    model,
+                    prompt_tokens=result.get("prompt_tokens", 0),
+                    completion_tokens=result.get("completion_tokens", 0),
+                    cost_factor=BATCH_COST_FACTOR
+                )
+                result = {
+                    "status": "success",
+                    "analysis": result["analysis"],
+                    "provider": entry["provider"],
+                    "model": model,
+                    "batch_id": batch_id
+                }
+            self._resolve(custom_id, result)
+        entry["status"] = status
+        entry["finished_at"] = datetime.now().isoformat()
+        logger.info(f"Collected {entry['provider']} batch {batch_id} ({status})")
+
+    def _resolve(self, custom_id: str, result: Dict[str, Any]):
+        with self._lock:
+            self.results[custom_id] = result
+            future = self.futures.pop(custom_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Submit anything pending, then poll until all batches finish"""
+        if self.pending:
+            self.submit()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            self.poll()
+            if not self.outstanding():
+                return self.results
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"{len(self.outstanding())} batches still in progress")
+            time.sleep(self.poll_interval)
+
+    def resume(self, timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Collect batches submitted by an earlier process from the manifest"""
+        logger.info(f"Resuming {len(self.outstanding())} outstanding batches")
+        return self.wait(timeout)
+
+
+def analyze_batch(
+    prompts: List[str],
+    provider: str = "openai",
+    model: Optional[str] = None,
+    collector: Optional[BatchCollector] = None,
+    timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Run many prompts as batch jobs and return results in prompt order"""
+    collector = collector or BatchCollector()
+    futures = [collector.add(prompt, provider=provider, model=model) for prompt in prompts]
+    collector.wait(timeout)
+    return [future.result() for future in futures]
@@ -0,0 +1,16 @@
+# src/tools/ai/budget.py
+import os
+
+# Rough English/JSON average where no tokenizer is available
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n[... truncated to fit token budget ...]"
+
+
+def default_prompt_budget() -> int:
+    """Token budget for the context assembled into crew task prompts (LLM_MAX_PROMPT_TOKENS)
+
+    LLM calls are otherwise limited only by the model's context window;
+    pass this as ``prompt_budget`` to cap a single call.
+    """
+    return int(os.getenv("LLM_MAX_PROMPT_TOKENS", "6000"))
+
@@ -0,0 +1,26 @@
+# src/tools/ai/embeddings.py
+from typing import List, Optional
+import os
+
+
+class OpenAIEmbedder:
+    """Batch text embeddings via OpenAI's embeddings endpoint"""
+
+    MODEL = "text-embedding-3-small"
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None, batch_size: int = 256):
+        import openai
+        self.model = model or self.MODEL
+        self.batch_size = batch_size
+        self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in as few requests as the batch size allows"""
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(model=self.model, input=texts[i:i + self.batch_size])
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+        return vectors
+
+    def __call__(self, text: str) -> List[float]:
+        return self.embed([text])[0]
@@ -0,0 +1,788 @@
+# src/tools/ai/gateway.py
+
+from typing import Dict, Any, Optional, Tuple, List, Callable, Iterator, AsyncIterator
+import asyncio
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from .preflight import count_tokens, preflight
+from .response_cache import ResponseCache
+from .hedging import HedgePolicy, LatencyTracker, hedged_call, policies_from_env
+from .router import ModelRouter
+from .usage import current_attribution, get_usage_tracker
+from tools.search.local_index import LocalIndex, get_local_index
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying; 529 is Anthropic's "overloaded"
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_NAMES = (
+    "RateLimit", "Timeout", "APIConnection", "InternalServer",
+    "Overloaded", "ServiceUnavailable", "ResourceExhausted", "DeadlineExceeded"
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Transient provider errors: timeouts, rate limits, 5xx and dropped connections"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status in RETRYABLE_STATUS:
+        return True
+    return any(name in type(error).__name__ for name in RETRYABLE_NAMES)
+
+
+class ProviderLimits:
+    """Concurrency, rate, timeout and retry settings for one provider"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        requests_per_minute: int = 60,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff: float = 1.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    @classmethod
+    def from_env(cls, provider: str, **defaults) -> "ProviderLimits":
+        """Defaults overridden by LLM_<PROVIDER>_MAX_CONCURRENCY, _RPM, _TIMEOUT, _MAX_RETRIES"""
+        prefix = f"LLM_{provider.upper()}_"
+        limits = cls(**defaults)
+        limits.max_concurrency = int(os.getenv(prefix + "MAX_CONCURRENCY", limits.max_concurrency))
+        limits.requests_per_minute = int(os.getenv(prefix + "RPM", limits.requests_per_minute))
+        limits.timeout = float(os.getenv(prefix + "TIMEOUT", limits.timeout))
+        limits.max_retries = int(os.getenv(prefix + "MAX_RETRIES", limits.max_retries))
+        return limits
+
+
+async def _with_idle_timeout(events: AsyncIterator[Dict[str, Any]], timeout: float) -> AsyncIterator[Dict[str, Any]]:
+    """Re-yield stream events, failing if the provider goes quiet for ``timeout`` seconds"""
+    iterator = events.__aiter__()
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(iterator.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+class RateLimiter:
+    """Spaces request starts evenly to stay under a requests-per-minute limit"""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class ProviderAdapter:
+    """How the gateway talks to one provider's async SDK
+
+    ``complete`` returns the completion text plus token counts and
+    ``stream`` yields it incrementally; adapters disable SDK-level retries
+    because the gateway owns retry policy. ``system`` is a static prefix
+    (e.g. an agent persona) sent ahead of the dynamic prompt and marked
+    cacheable where the provider supports it. ``prompt_tokens`` excludes
+    prompt-cache reads and writes, which are reported separately.
+    """
+
+    provider = ""
+    default_model = ""
+    api_key_env = ""
+
+    def create_client(self, api_key: Optional[str]) -> Any:
+        raise NotImplementedError
+
+    async def complete(
+        self, client: Any, model: str, text: str, max_tokens: Optional[int], system: Optional[str] = None
+    ) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def stream(
+        self, client: Any, model: str, text: str, max_tokens: Optional[int], system: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield {"text": chunk} events, then one event with the token counts"""
+        raise NotImplementedError
+        yield
+
+
+class OpenAIAdapter(ProviderAdapter):
+    provider = "openai"
+    default_model = "gpt-4-turbo-preview"
+    api_key_env = "OPENAI_API_KEY"
+
+    def create_client(self, api_key):
+        import openai
+        return openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+
+    def _messages(self, text, system):
+        # OpenAI caches repeated prefixes automatically, so the static part goes first
+        messages = [{"role": "system", "content": system}] if system else []
+        return messages + [{"role": "user", "content": text}]
+
+    def _usage(self, usage):
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+        return {
+            "prompt_tokens": (getattr(usage, "prompt_tokens", 0) or 0) - cached,
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+            "cache_read_tokens": cached
+        }
+
+    async def complete(self, client, model, text, max_tokens, system=None):
+        params = {"max_tokens": max_tokens} if max_tokens else {}
+        response = await client.chat.completions.create(
+            model=model,
+            messages=self._messages(text, system),
+            **params
+        )
+        return {"text": response.choices[0].message.content, **self._usage(response.usage)}
+
+    async def stream(self, client, model, text, max_tokens, system=None):
+        params = {"max_tokens": max_tokens} if max_tokens else {}
+        response = await client.chat.completions.create(
+            model=model,
+            messages=self._messages(text, system),
+            stream=True,
+            stream_options={"include_usage": True},
+            **params
+        )
+        async for chunk in response:
+            if chunk.choices:
+                yield {"text": chunk.choices[0].delta.content or ""}
+            if chunk.usage:
+                yield self._usage(chunk.usage)
+
+
+class AnthropicAdapter(ProviderAdapter):
+    provider = "anthropic"
+    default_model = "claude-3-opus-20240229"
+    api_key_env = "ANTHROPIC_API_KEY"
+    # Shortest prefix Anthropic will cache; shorter ones are billed as normal input
+    min_cache_tokens = {"claude-3-haiku-20240307": 2048}
+    default_min_cache_tokens = 1024
+
+    def create_client(self, api_key):
+        import anthropic
+        return anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+
+    def _params(self, model, text, max_tokens, system):
+        params = {
+            "model": model,
+            "max_tokens": max_tokens or 1000,
+            "messages": [{"role": "user", "content": text}]
+        }
+        if system:
+            block = {"type": "text", "text": system}
+            minimum = self.min_cache_tokens.get(model, self.default_min_cache_tokens)
+            if count_tokens(system, model, self.provider) >= minimum:
+                # Cache breakpoint after the static prefix; reads cost ~10% of input
+                block["cache_control"] = {"type": "ephemeral"}
+            params["system"] = [block]
+        return params
+
+    def _usage(self, usage):
+        return {
+            "prompt_tokens": getattr(usage, "input_tokens", 0),
+            "completion_tokens": getattr(usage, "output_tokens", 0),
+            "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0
+        }
+
+    async def complete(self, client, model, text, max_tokens, system=None):
+        response = await client.messages.create(**self._params(model, text, max_tokens, system))
+        return {
+            "text": "".join(getattr(block, "text", "") for block in response.content),
+            **self._usage(response.usage)
+        }
+
+    async def stream(self, client, model, text, max_tokens, system=None):
+        async with client.messages.stream(**self._params(model, text, max_tokens, system)) as response:
+            async for chunk in response.text_stream:
+                yield {"text": chunk}
+            message = await response.get_final_message()
+        yield self._usage(message.usage)
+
+
+class GeminiAdapter(ProviderAdapter):
+    provider = "google"
+    default_model = "gemini-pro"
+    api_key_env = "GOOGLE_API_KEY"
+
+    def create_client(self, api_key):
+        # A client per key; genai.configure would switch the key for every caller in the process
+        from google.ai import generativelanguage as glm
+        return glm.GenerativeServiceAsyncClient(client_options={"api_key": api_key})
+
+    def _request(self, model, text, max_tokens, system):
+        """GenerateContentRequest sent straight to the per-key client"""
+        from google.ai import generativelanguage as glm
+        request = {
+            "model": model if model.startswith("models/") else f"models/{model}",
+            "contents": [glm.Content(role="user", parts=[glm.Part(text=text)])]
+        }
+        if system:
+            request["system_instruction"] = glm.Content(parts=[glm.Part(text=system)])
+        if max_tokens:
+            request["generation_config"] = glm.GenerationConfig(max_output_tokens=max_tokens)
+        return glm.GenerateContentRequest(**request)
+
+    def _text(self, response):
+        candidates = list(getattr(response, "candidates", None) or [])
+        if not candidates:
+            return ""
+        return "".join(part.text for part in candidates[0].content.parts)
+
+    def _usage(self, metadata):
+        cached = getattr(metadata, "cached_content_token_count", 0) or 0
+        return {
+            "prompt_tokens": (getattr(metadata, "prompt_token_count", 0) or 0) - cached,
+            "completion_tokens": getattr(metadata, "candidates_token_count", 0),
+            "cache_read_tokens": cached
+        }
+
+    async def complete(self, client, model, text, max_tokens, system=None):
+        response = await client.generate_content(self._request(model, text, max_tokens, system))
+        return {"text": self._text(response), **self._usage(getattr(response, "usage_metadata", None))}
+
+    async def stream(self, client, model, text, max_tokens, system=None):
+        response = await client.stream_generate_content(self._request(model, text, max_tokens, system))
+        metadata = None
+        async for chunk in response:
+            metadata = getattr(chunk, "usage_metadata", None) or metadata
+            yield {"text": self._text(chunk)}
+        yield self._usage(metadata)
+
+
+# Provider name that lets the model router pick the provider as well
+AUTO_PROVIDER = "auto"
+
+DEFAULT_ADAPTERS = {
+    "openai": (OpenAIAdapter(), {"max_concurrency": 8, "requests_per_minute": 500}),
+    "anthropic": (AnthropicAdapter(), {"max_concurrency": 4, "requests_per_minute": 50}),
+    "google": (GeminiAdapter(), {"max_concurrency": 4, "requests_per_minute": 60})
+}
+
+
+class LLMGateway:
+    """Single async entry point for GPT-4, Claude and Gemini
+
+    All calls run on one background event loop with shared async clients
+    (one per provider and API key), so parallel crews share connection
+    pools. Each provider has a concurrency semaphore, a request-rate limiter,
+    a per-attempt timeout and jittered exponential backoff on transient
+    errors. ``analyze`` is the blocking form for threads; ``aanalyze`` can be
+    awaited from any event loop. ``stream``/``astream`` yield text chunks
+    as the provider produces them. With a ``cache``, identical prompts are
+    answered from the ResponseCache without a provider call.
+
+    Hedging is opt-in per provider via ``set_hedge`` (or LLM_HEDGE): if the
+    primary has not answered by its observed p95 latency, the same prompt
+    goes to the secondary provider and the first good answer wins.
+
+    With a ``router``, calls that do not name a model are routed to the
+    cheapest model meeting the request's quality tier within the requested
+    provider; provider ``"auto"`` lets the router choose the provider too.
+
+    With an ``index``, every fresh completion is written to the local
+    full-text index so later lookups can be answered without a call.
+    """
+
+    def __init__(
+        self,
+        adapters: Optional[Dict[str, Tuple[ProviderAdapter, Dict[str, Any]]]] = None,
+        cache: Optional[ResponseCache] = None,
+        hedges: Optional[Dict[str, HedgePolicy]] = None,
+        router: Optional[ModelRouter] = None,
+        index: Optional[LocalIndex] = None
+    ):
+        self.cache = cache
+        self.index = index
+        self.router = router
+        self.hedges: Dict[str, HedgePolicy] = dict(hedges or {})
+        self.latencies = LatencyTracker()
+        self._adapters: Dict[str, ProviderAdapter] = {}
+        self._limits: Dict[str, ProviderLimits] = {}
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, Dict[str, int]] = {}
+        for provider, (adapter, limits) in (DEFAULT_ADAPTERS if adapters is None else adapters).items():
+            self.register(provider, adapter, ProviderLimits.from_env(provider, **limits))
+
+    def register(self, provider: str, adapter: ProviderAdapter, limits: Optional[ProviderLimits] = None):
+        """Register (or replace) a provider adapter and its limits"""
+        with self._lock:
+            self._adapters[provider] = adapter
+            self._limits[provider] = limits or ProviderLimits()
+            self._semaphores.pop(provider, None)
+            self._rate_limiters.pop(provider, None)
+            self.stats[provider] = {
+                "calls": 0, "errors": 0, "retries": 0, "timeouts": 0, "in_flight": 0,
+                "hedges": 0, "hedge_wins": 0, "truncated": 0, "rejected": 0
+            }
+
+    def set_hedge(self, provider: str, policy: Optional[HedgePolicy]):
+        """Enable (or with None, disable) hedging for a primary provider"""
+        with self._lock:
+            if policy is None:
+                self.hedges.pop(provider, None)
+            else:
+                self.hedges[provider] = policy
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Background event loop, started on first use"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="llm-gateway", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _client(self, provider: str, api_key: Optional[str]) -> Any:
+        adapter = self._adapters[provider]
+        api_key = api_key or os.getenv(adapter.api_key_env)
+        key = (provider, api_key)
+        if key not in self._clients:
+            logger.info(f"Creating shared async {provider} client")
+            self._clients[key] = adapter.create_client(api_key)
+        return self._clients[key]
+
+    def _primitives(self, provider: str) -> Tuple[asyncio.Semaphore, RateLimiter]:
+        # Created lazily on the gateway loop so they bind to it
+        if provider not in self._semaphores:
+            limits = self._limits[provider]
+            self._semaphores[provider] = asyncio.Semaphore(limits.max_concurrency)
+            self._rate_limiters[provider] = RateLimiter(limits.requests_per_minute)
+        return self._semaphores[provider], self._rate_limiters[provider]
+
+    def analyze(self, provider: str, text: str, **options) -> Dict[str, Any]:
+        """Blocking analysis call; safe to use from any thread except the gateway loop"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Use aanalyze() from inside the gateway loop")
+        options.setdefault("labels", current_attribution())
+        future = asyncio.run_coroutine_threadsafe(self._analyze(provider, text, **options), self.loop)
+        return future.result()
+
+    async def aanalyze(self, provider: str, text: str, **options) -> Dict[str, Any]:
+        """Awaitable analysis call usable from any event loop"""
+        options.setdefault("labels", current_attribution())
+        coroutine = self._analyze(provider, text, **options)
+        if asyncio.get_running_loop() is self.loop:
+            return await coroutine
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self.loop))
+
+    def _route(self, provider: str, text: str, options: Dict[str, Any], task_type: Optional[str] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Fill in the model (and for "auto", the provider) from the router"""
+        if options.get("model") or self.router is None:
+            if provider == AUTO_PROVIDER:
+                raise ValueError("Provider 'auto' needs a model router")
+            return provider, None
+        providers = list(self._adapters) if provider == AUTO_PROVIDER else [provider]
+        route = self.router.route(
+            text,
+            task_type=task_type,
+            agent=(options.get("labels") or {}).get("agent"),
+            providers=providers
+        )
+        options["model"] = route["model"]
+        return route["provider"], route
+
+    async def _analyze(
+        self,
+        provider: str,
+        text: str,
+        hedge: bool = True,
+        task_type: Optional[str] = None,
+        **options
+    ) -> Dict[str, Any]:
+        try:
+            provider, route = self._route(provider, text, options, task_type)
+        except ValueError as e:
+            return {"status": "error", "error": str(e)}
+
+        policy = self.hedges.get(provider) if hedge else None
+        if policy is None or policy.secondary not in self._adapters:
+            result = await self._complete(provider, text, **options)
+        else:
+            secondary_options = dict(options, model=policy.secondary_model, api_key=None)
+            delay = policy.delay(self.latencies, provider)
+            result, winner = await hedged_call(
+                lambda: self._complete(provider, text, **options),
+                lambda: self._hedge(provider, policy.secondary, text, secondary_options, task_type),
+                delay
+            )
+            if winner == "secondary":
+                self.stats[provider]["hedge_wins"] += 1
+                logger.info(f"Hedged {provider} call answered by {policy.secondary} (delay {delay:.2f}s)")
+            result = dict(result, hedged=winner == "secondary")
+
+        if route is not None:
+            result = dict(result, route=route["task_type"])
+            if not result.get("cached"):
+                usage = result.get("usage") or {}
+                self.router.observe(
+                    route["task_type"],
+                    result.get("model", route["model"]),
+                    usage.get("latency", 0.0),
+                    usage.get("cost", 0.0),
+                    result.get("status", "error")
+                )
+        return result
+
+    async def _hedge(
+        self,
+        provider: str,
+        secondary: str,
+        text: str,
+        options: Dict[str, Any],
+        task_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        self.stats[provider]["hedges"] += 1
+        secondary, _ = self._route(secondary, text, options, task_type)
+        return await self._complete(secondary, text, **options)
+
+    async def _complete(
+        self,
+        provider: str,
+        text: str,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        api_key: Optional[str] = None,
+        labels: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        system: Optional[str] = None,
+        prompt_budget: Optional[int] = None
+    ) -> Dict[str, Any]:
+        if provider not in self._adapters:
+            return {"status": "error", "error": f"Unknown LLM provider: {provider}"}
+        adapter = self._adapters[provider]
+        limits = self._limits[provider]
+        model = model or adapter.default_model
+        try:
+            text, max_tokens = self._preflight(provider, model, text, max_tokens, system, prompt_budget)
+        except ValueError as e:
+            return {"status": "error", "error": str(e)}
+        params = {"max_tokens": max_tokens, "system": system}
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = await asyncio.to_thread(self.cache.get, provider, model, text, params)
+            if cached is not None:
+                return dict(cached, cached=True)
+
+        semaphore, rate_limiter = self._primitives(provider)
+        stats = self.stats[provider]
+
+        start = time.perf_counter()
+        retries = 0
+        async with semaphore:
+            stats["in_flight"] += 1
+            try:
+                while True:
+                    await rate_limiter.acquire()
+                    try:
+                        client = self._client(provider, api_key)
+                        result = await asyncio.wait_for(
+                            adapter.complete(client, model, text, max_tokens, system=system), limits.timeout
+                        )
+                        break
+                    except Exception as e:
+                        if not await self._should_retry(provider, model, e, retries, start, labels):
+                            return {"status": "error", "error": str(e) or type(e).__name__}
+                        retries += 1
+            finally:
+                stats["in_flight"] -= 1
+
+        stats["calls"] += 1
+        self.latencies.observe(provider, time.perf_counter() - start)
+        usage = get_usage_tracker().record(
+            provider,
+            model,
+            prompt_tokens=result.get("prompt_tokens", 0),
+            completion_tokens=result.get("completion_tokens", 0),
+            cache_read_tokens=result.get("cache_read_tokens", 0),
+            cache_write_tokens=result.get("cache_write_tokens", 0),
+            latency=time.perf_counter() - start,
+            retries=retries,
+            **(labels or {})
+        )
+        response = {
+            "status": "success",
+            "analysis": result["text"],
+            "provider": provider,
+            "model": model
+        }
+        if use_cache:
+            await asyncio.to_thread(self.cache.put, provider, model, text, response, params)
+        if self.index is not None:
+            await asyncio.to_thread(self._index_analysis, provider, model, text, response["analysis"])
+        return dict(response, usage=usage)
+
+    def _index_analysis(self, provider: str, model: str, text: str, analysis: str):
+        try:
+            self.index.add(
+                "llm",
+                analysis,
+                title=text.strip().split("\n", 1)[0][:200],
+                query=text,
+                metadata={"provider": provider, "model": model}
+            )
+        except Exception as e:
+            logger.warning(f"Could not index {provider} analysis locally: {str(e)}")
+
+    def _preflight(
+        self,
+        provider: str,
+        model: str,
+        text: str,
+        max_tokens: Optional[int],
+        system: Optional[str],
+        prompt_budget: Optional[int] = None
+    ) -> Tuple[str, Optional[int]]:
+        """Fit the prompt and output budget to the model before any network call"""
+        try:
+            checked = preflight(provider, model, text, max_tokens=max_tokens, system=system, prompt_budget=prompt_budget)
+        except ValueError:
+            self.stats[provider]["rejected"] += 1
+            raise
+        if checked["truncated"]:
+            self.stats[provider]["truncated"] += 1
+        return checked["text"], checked["max_tokens"]
+
+    async def _should_retry(
+        self,
+        provider: str,
+        model: str,
+        error: Exception,
+        retries: int,
+        start: float,
+        labels: Optional[Dict[str, Any]],
+        retryable: bool = True
+    ) -> bool:
+        """Back off and return True for a retryable error, else record the failure"""
+        limits = self._limits[provider]
+        stats = self.stats[provider]
+        if isinstance(error, asyncio.TimeoutError):
+            stats["timeouts"] += 1
+        if not retryable or retries >= limits.max_retries or not is_retryable(error):
+            stats["calls"] += 1
+            stats["errors"] += 1
+            get_usage_tracker().record(
+                provider, model, latency=time.perf_counter() - start,
+                retries=retries, status="error", **(labels or {})
+            )
+            logger.error(f"{provider} call failed after {retries} retries: {str(error) or type(error).__name__}")
+            return False
+        # Full jitter keeps parallel crews from retrying in lockstep
+        delay = random.uniform(0, limits.backoff * 2 ** retries)
+        stats["retries"] += 1
+        logger.warning(f"{provider} call failed ({type(error).__name__}), retry {retries + 1} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+        return True
+
+    def stream(self, provider: str, text: str, **options) -> Iterator[str]:
+        """Blocking generator of completion text chunks as they arrive"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Use astream() from inside the gateway loop")
+        options.setdefault("labels", current_attribution())
+        chunks: "queue.Queue" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._pump(self._stream(provider, text, **options), chunks.put), self.loop
+        )
+        try:
+            while True:
+                kind, value = chunks.get()
+                if kind == "chunk":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    break
+        finally:
+            # Stops the provider stream if the consumer goes away early
+            future.cancel()
+
+    async def astream(self, provider: str, text: str, **options) -> AsyncIterator[str]:
+        """Async generator of completion text chunks usable from any event loop"""
+        options.setdefault("labels", current_attribution())
+        if asyncio.get_running_loop() is self.loop:
+            async for chunk in self._stream(provider, text, **options):
+                yield chunk
+            return
+
+        caller_loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._pump(
+                self._stream(provider, text, **options),
+                lambda item: caller_loop.call_soon_threadsafe(chunks.put_nowait, item)
+            ),
+            self.loop
+        )
+        try:
+            while True:
+                kind, value = await chunks.get()
+                if kind == "chunk":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    break
+        finally:
+            future.cancel()
+
+    async def _pump(self, chunks: AsyncIterator[str], put: Callable[[Tuple[str, Any]], Any]):
+        """Forward a stream running on the gateway loop to another thread or loop"""
+        try:
+            async for chunk in chunks:
+                put(("chunk", chunk))
+        except Exception as e:
+            put(("error", e))
+        finally:
+            await chunks.aclose()
+            put(("done", None))
+
+    async def _stream(
+        self,
+        provider: str,
+        text: str,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        api_key: Optional[str] = None,
+        labels: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        system: Optional[str] = None,
+        prompt_budget: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        if self.router is not None and not model and provider in self._adapters:
+            model = self.router.route(text, agent=(labels or {}).get("agent"), providers=[provider])["model"]
+        if provider not in self._adapters:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        adapter = self._adapters[provider]
+        limits = self._limits[provider]
+        model = model or adapter.default_model
+        text, max_tokens = self._preflight(provider, model, text, max_tokens, system, prompt_budget)
+        params = {"max_tokens": max_tokens, "system": system}
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = await asyncio.to_thread(self.cache.get, provider, model, text, params)
+            if cached is not None:
+                yield cached["analysis"]
+                return
+
+        semaphore, rate_limiter = self._primitives(provider)
+        stats = self.stats[provider]
+
+        start = time.perf_counter()
+        retries = 0
+        parts: List[str] = []
+        counts: Dict[str, int] = {}
+        async with semaphore:
+            stats["in_flight"] += 1
+            try:
+                while True:
+                    await rate_limiter.acquire()
+                    try:
+                        client = self._client(provider, api_key)
+                        events = adapter.stream(client, model, text, max_tokens, system=system)
+                        async for event in _with_idle_timeout(events, limits.timeout):
+                            if "text" in event:
+                                if event["text"]:
+                                    parts.append(event["text"])
+                                    yield event["text"]
+                            else:
+                                counts.update(event)
+                        break
+                    except Exception as e:
+                        # Once text has been sent a retry would duplicate it
+                        if not await self._should_retry(provider, model, e, retries, start, labels, retryable=not parts):
+                            raise
+                        retries += 1
+            finally:
+                stats["in_flight"] -= 1
+
+        stats["calls"] += 1
+        get_usage_tracker().record(
+            provider,
+            model,
+            prompt_tokens=counts.get("prompt_tokens", 0),
+            completion_tokens=counts.get("completion_tokens", 0),
+            cache_read_tokens=counts.get("cache_read_tokens", 0),
+            cache_write_tokens=counts.get("cache_write_tokens", 0),
+            latency=time.perf_counter() - start,
+            retries=retries,
+            **(labels or {})
+        )
+        if use_cache:
+            response = {"status": "success", "analysis": "".join(parts), "provider": provider, "model": model}
+            await asyncio.to_thread(self.cache.put, provider, model, text, response, params)
+        if self.index is not None:
+            await asyncio.to_thread(self._index_analysis, provider, model, text, "".join(parts))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-provider call, retry, timeout and in-flight counters with limits"""
+        return {
+            provider: {
+                **stats,
+                **self.latencies.snapshot(provider),
+                "max_concurrency": self._limits[provider].max_concurrency,
+                "requests_per_minute": self._limits[provider].requests_per_minute,
+                "hedge_to": self.hedges[provider].secondary if provider in self.hedges else None
+            }
+            for provider, stats in self.stats.items()
+        }
+
+    def router_stats(self) -> Dict[str, Any]:
+        """Observed latency and cost per route and model, or empty without a router"""
+        return self.router.stats() if self.router is not None else {}
+
+    def cache_metrics(self) -> Dict[str, Any]:
+        """Response cache hit rates, or an empty dict without a cache"""
+        return self.cache.metrics() if self.cache is not None else {}
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide LLM gateway"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            # LLM_CACHE_ENABLED=0 turns the response cache off
+            cache = ResponseCache.from_env() if os.getenv("LLM_CACHE_ENABLED", "1") != "0" else None
+            # Routing is opt-in (LLM_ROUTING=1); otherwise calls stay on their provider's default model
+            router = ModelRouter.from_env() if os.getenv("LLM_ROUTING", "0") == "1" else None
+            _gateway = LLMGateway(cache=cache, hedges=policies_from_env(), router=router, index=get_local_index())
+        return _gateway
@@ -1,25 +1,43 @@
 # src/tools/gemini_api.py
-from typing import Dict, Any
-import os
-import google.generativeai as genai
+from typing import Dict, Any, Optional, Iterator, AsyncIterator
+from .gateway import get_gateway
 
 class GeminiAPI:
     """Google's Gemini API implementation"""
+
+    PROVIDER = "google"
     
-    def __init__(self):
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-pro')
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        # A model pins every call; without one the gateway's router picks
+        # the cheapest model that meets each request's quality tier
+        self.api_key = api_key
+        self.model = model
+        self.gateway = get_gateway()
         
-    def analyze(self, text: str) -> Dict[str, Any]:
-        """Analyze text using Gemini"""
-        try:
-            response = self.model.generate_content(text)
-            return {
-                "status": "success",
-                "analysis": response.text
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "error": str(e)
-            }
\ No newline at end of file
+    def analyze(self, text: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze text using Gemini
+
+        ``system`` is a static prefix such as an agent persona; it is sent
+        ahead of ``text`` and cached by the provider across calls.
+        """
+        return self.gateway.analyze(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
+
+    async def aanalyze(self, text: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze text using Gemini without blocking the caller's event loop"""
+        return await self.gateway.aanalyze(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
+
+    def stream(self, text: str, system: Optional[str] = None) -> Iterator[str]:
+        """Yield Gemini's completion text as it is generated"""
+        return self.gateway.stream(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
+
+    def astream(self, text: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of stream()"""
+        return self.gateway.astream(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
@@ -1,29 +1,43 @@
 # src/tools/gpt4_api.py
-from typing import Dict, Any
-import os
-import openai
+from typing import Dict, Any, Optional, Iterator, AsyncIterator
+from .gateway import get_gateway
 
 class GPT4API:
     """OpenAI's GPT-4 API implementation"""
+
+    PROVIDER = "openai"
     
-    def __init__(self):
-        self.client = openai.OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        # A model pins every call; without one the gateway's router picks
+        # the cheapest model that meets each request's quality tier
+        self.api_key = api_key
+        self.model = model
+        self.gateway = get_gateway()
         
-    def analyze(self, text: str) -> Dict[str, Any]:
-        """Analyze text using GPT-4"""
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[{"role": "user", "content": text}]
-            )
-            return {
-                "status": "success",
-                "analysis": response.choices[0].message.content
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "error": str(e)
-            }
\ No newline at end of file
+    def analyze(self, text: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze text using GPT-4
+
+        ``system`` is a static prefix such as an agent persona; it is sent
+        ahead of ``text`` and cached by the provider across calls.
+        """
+        return self.gateway.analyze(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
+
+    async def aanalyze(self, text: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze text using GPT-4 without blocking the caller's event loop"""
+        return await self.gateway.aanalyze(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
+
+    def stream(self, text: str, system: Optional[str] = None) -> Iterator[str]:
+        """Yield GPT-4's completion text as it is generated"""
+        return self.gateway.stream(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
+
+    def astream(self, text: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of stream()"""
+        return self.gateway.astream(
+            self.PROVIDER, text, model=self.model, api_key=self.api_key, system=system
+        )
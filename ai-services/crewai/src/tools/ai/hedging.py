@@ -0,0 +1,132 @@
+# src/tools/ai/hedging.py
+
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+from collections import defaultdict, deque
+import asyncio
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling per-provider latency percentiles from recent successful calls"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def observe(self, provider: str, latency: float):
+        with self._lock:
+            self._samples[provider].append(latency)
+
+    def percentile(self, provider: str, q: float) -> Optional[float]:
+        """Latency at quantile ``q`` (0-1), or None with no samples"""
+        with self._lock:
+            samples = list(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        return float(np.percentile(samples, q * 100))
+
+    def count(self, provider: str) -> int:
+        with self._lock:
+            return len(self._samples.get(provider, ()))
+
+    def snapshot(self, provider: str) -> Dict[str, Any]:
+        return {
+            "latency_samples": self.count(provider),
+            "latency_p50": self.percentile(provider, 0.5),
+            "latency_p95": self.percentile(provider, 0.95)
+        }
+
+
+class HedgePolicy:
+    """When and where to send a backup request for a slow primary provider
+
+    The backup fires once the primary has been outstanding for its observed
+    ``percentile`` latency (clamped to [min_delay, max_delay]); until
+    ``min_samples`` latencies are known, ``default_delay`` is used.
+    """
+
+    def __init__(
+        self,
+        secondary: str,
+        secondary_model: Optional[str] = None,
+        percentile: float = 0.95,
+        default_delay: float = 10.0,
+        min_delay: float = 0.5,
+        max_delay: float = 60.0,
+        min_samples: int = 20
+    ):
+        self.secondary = secondary
+        self.secondary_model = secondary_model
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+
+    def delay(self, latencies: LatencyTracker, provider: str) -> float:
+        """Seconds to wait on the primary before hedging"""
+        if latencies.count(provider) < self.min_samples:
+            return self.default_delay
+        observed = latencies.percentile(provider, self.percentile)
+        return min(max(observed, self.min_delay), self.max_delay)
+
+
+def policies_from_env() -> Dict[str, HedgePolicy]:
+    """Opt-in policies from LLM_HEDGE, e.g. 'openai:anthropic,anthropic:openai'"""
+    policies = {}
+    for pair in filter(None, (p.strip() for p in os.getenv("LLM_HEDGE", "").split(","))):
+        primary, _, secondary = pair.partition(":")
+        if primary and secondary:
+            policies[primary] = HedgePolicy(secondary)
+    return policies
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[Dict[str, Any]]],
+    secondary: Callable[[], Awaitable[Dict[str, Any]]],
+    delay: float
+) -> Tuple[Dict[str, Any], str]:
+    """Race a primary call against a backup started after ``delay`` seconds
+
+    Returns the first successful result and which side produced it
+    ("primary" or "secondary"); the other call is cancelled. A primary that
+    fails before the delay falls over to the secondary immediately. If both
+    fail, the first error is returned.
+    """
+    tasks = {asyncio.ensure_future(primary()): "primary"}
+    first_error = None
+    try:
+        done, _ = await asyncio.wait(set(tasks), timeout=delay)
+        if done:
+            result = _result(done.pop())
+            if result.get("status") == "success":
+                return result, "primary"
+            first_error = (result, "primary")
+
+        tasks[asyncio.ensure_future(secondary())] = "secondary"
+        pending = {task for task in tasks if not task.done()}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = _result(task)
+                if result.get("status") == "success":
+                    return result, tasks[task]
+                first_error = first_error or (result, tasks[task])
+        return first_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def _result(task: asyncio.Future) -> Dict[str, Any]:
+    try:
+        return task.result()
+    except Exception as e:
+        return {"status": "error", "error": str(e) or type(e).__name__}
@@ -0,0 +1,197 @@
+# src/tools/ai/preflight.py
+
+from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+import logging
+import os
+
+from .budget import CHARS_PER_TOKEN, TRUNCATION_MARKER
+
+logger = logging.getLogger(__name__)
+
+# (context window, max output tokens) per model
+MODEL_LIMITS = {
+    "gpt-4-turbo-preview": (128000, 4096),
+    "gpt-4-turbo": (128000, 4096),
+    "gpt-4o": (128000, 16384),
+    "gpt-4o-mini": (128000, 16384),
+    "claude-3-opus-20240229": (200000, 4096),
+    "claude-3-5-sonnet-20240620": (200000, 8192),
+    "claude-3-haiku-20240307": (200000, 4096),
+    "gemini-pro": (30720, 2048),
+    "gemini-1.5-flash": (1048576, 8192),
+    "gemini-1.5-pro": (2097152, 8192)
+}
+DEFAULT_LIMITS = (8192, 4096)
+
+# Approximate characters per token where no local tokenizer exists;
+# Claude's tokenizer runs denser than OpenAI's on English and JSON
+PROVIDER_CHARS_PER_TOKEN = {
+    "anthropic": 3.5,
+    "google": 4.0
+}
+# Sections squeezed below this are dropped rather than kept as a stub
+MIN_SECTION_TOKENS = 20
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """tiktoken encoding for an OpenAI model, or None if unavailable"""
+    if os.getenv("LLM_EXACT_TOKENIZER", "1") == "0":
+        return None
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline we approximate
+        logger.warning(f"No local tokenizer for {model}, approximating token counts: {e}")
+        return None
+
+
+def _is_openai(provider: Optional[str], model: Optional[str]) -> bool:
+    return provider == "openai" or (provider is None and bool(model) and model.startswith("gpt-"))
+
+
+def count_tokens(text: str, model: Optional[str] = None, provider: Optional[str] = None) -> int:
+    """Token count for ``text`` under a model's tokenizer
+
+    Exact for OpenAI models when tiktoken and its encodings are available,
+    otherwise a per-provider characters-per-token estimate.
+    """
+    if not text:
+        return 0
+    if _is_openai(provider, model):
+        encoding = _encoding(model or "gpt-4")
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    ratio = PROVIDER_CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN)
+    return int(-(-len(text) // ratio))
+
+
+def model_limits(model: Optional[str]) -> Tuple[int, int]:
+    """(context window, max output tokens) for a model"""
+    return MODEL_LIMITS.get(model, DEFAULT_LIMITS)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None, provider: Optional[str] = None) -> str:
+    """Keep the beginning of ``text`` within ``max_tokens``, marking the cut"""
+    if count_tokens(text, model, provider) <= max_tokens:
+        return text
+    budget = max(max_tokens - count_tokens(TRUNCATION_MARKER, model, provider), 0)
+    encoding = _encoding(model or "gpt-4") if _is_openai(provider, model) else None
+    if encoding is not None:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    else:
+        head = text[:int(budget * PROVIDER_CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN))]
+    cut = head.rfind("\n")
+    if cut >= len(head) // 2:
+        head = head[:cut]
+    return head + TRUNCATION_MARKER
+
+
+class PromptSection:
+    """One block of a prompt with a priority for pre-flight budgeting
+
+    Higher ``priority`` sections are kept intact first. ``summary`` is an
+    optional compact form used instead of truncating the full text when
+    the section does not fit.
+    """
+
+    def __init__(self, name: str, text: str, priority: int = 0, summary: Optional[str] = None):
+        self.name = name
+        self.text = text
+        self.priority = priority
+        self.summary = summary
+
+
+def fit_sections(
+    sections: List[PromptSection],
+    max_tokens: int,
+    model: Optional[str] = None,
+    provider: Optional[str] = None,
+    separator: str = "\n\n"
+) -> str:
+    """Join sections within ``max_tokens``, shrinking the lowest priorities first
+
+    Budget is granted to priority levels from highest to lowest; sections in
+    the same level share what is left, smallest first, so one oversized
+    section cannot starve its peers. A section that does not fit is replaced
+    by its summary, else truncated, else dropped. Original order is kept.
+    """
+    sizes = [count_tokens(s.text, model, provider) for s in sections]
+    overhead = count_tokens(separator, model, provider) * max(len(sections) - 1, 0)
+    if sum(sizes) + overhead <= max_tokens:
+        return separator.join(s.text for s in sections)
+
+    remaining = max_tokens - overhead
+    rendered: Dict[int, str] = {}
+    for priority in sorted({s.priority for s in sections}, reverse=True):
+        level = sorted((i for i, s in enumerate(sections) if s.priority == priority), key=lambda i: sizes[i])
+        for n, i in enumerate(level):
+            share = max(remaining, 0) // (len(level) - n)
+            text = _fit_section(sections[i], sizes[i], share, model, provider)
+            if text:
+                rendered[i] = text
+                remaining -= count_tokens(text, model, provider)
+
+    dropped = [s.name for i, s in enumerate(sections) if i not in rendered]
+    if dropped:
+        logger.info(f"Dropped prompt sections to fit {max_tokens} tokens: {', '.join(dropped)}")
+    return separator.join(rendered[i] for i in sorted(rendered))
+
+
+def _fit_section(section: PromptSection, size: int, share: int, model: Optional[str], provider: Optional[str]) -> str:
+    if size <= share:
+        return section.text
+    if section.summary and count_tokens(section.summary, model, provider) <= share:
+        return section.summary
+    if share < MIN_SECTION_TOKENS:
+        return ""
+    return truncate_to_tokens(section.text, share, model, provider)
+
+
+def preflight(
+    provider: str,
+    model: str,
+    text: str,
+    max_tokens: Optional[int] = None,
+    system: Optional[str] = None,
+    prompt_budget: Optional[int] = None
+) -> Dict[str, Any]:
+    """Fit a request to the model's context and output limits before sending
+
+    The output budget is clamped to the model's maximum and reserved out of
+    the context window along with the system prefix; the prompt gets what is
+    left, further capped by ``prompt_budget`` when one is given.
+    Returns the text and max_tokens to send plus token counts; raises
+    ValueError when the request cannot fit at all.
+    """
+    context, max_output = model_limits(model)
+    output = min(max_tokens or max_output, max_output)
+    system_tokens = count_tokens(system or "", model, provider)
+    available = context - output - system_tokens
+    if available < MIN_SECTION_TOKENS:
+        raise ValueError(
+            f"{model} context of {context} tokens cannot fit a {system_tokens} token system prompt "
+            f"and {output} output tokens"
+        )
+    budget = available if prompt_budget is None else min(available, prompt_budget)
+
+    prompt_tokens = count_tokens(text, model, provider)
+    truncated = prompt_tokens > budget
+    if truncated:
+        logger.warning(f"Prompt of {prompt_tokens} tokens truncated to {budget} for {model}")
+        text = truncate_to_tokens(text, budget, model, provider)
+        prompt_tokens = count_tokens(text, model, provider)
+    return {
+        "text": text,
+        "max_tokens": min(max_tokens, max_output) if max_tokens else None,
+        "prompt_tokens": prompt_tokens + system_tokens,
+        "truncated": truncated
+    }
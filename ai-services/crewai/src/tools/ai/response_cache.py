@@ -0,0 +1,300 @@
+# src/tools/ai/response_cache.py
+
+from typing import Dict, Any, Optional, Callable, Sequence, List, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share an entry"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def response_key(provider: str, model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """SHA-256 of (provider, model, normalized prompt, parameters)"""
+    payload = json.dumps(
+        {"provider": provider, "model": model, "prompt": normalize_prompt(prompt), "params": params or {}},
+        sort_keys=True, default=str, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _scope(provider: str, model: str, params: Optional[Dict[str, Any]]) -> str:
+    # Near-duplicate matches never cross provider, model or parameters
+    return response_key(provider, model, "", params)
+
+
+class ResponseCache:
+    """Prompt-response cache for LLM calls: in-memory LRU over a disk store
+
+    Entries are JSON files named after their key and expire after ``ttl``.
+    The disk store is trimmed to ``max_disk_bytes`` by evicting the least
+    recently used files; the hottest ``max_memory_entries`` are also held
+    in memory. With an ``embedder`` and ``similarity_threshold``, a miss
+    falls back to the most similar cached prompt for the same provider,
+    model and parameters when its cosine similarity clears the threshold.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str = "memory/llm_cache",
+        ttl: timedelta = timedelta(hours=24),
+        max_memory_entries: int = 1024,
+        max_disk_bytes: int = 100 * 1024 * 1024,
+        embedder: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: Optional[float] = None
+    ):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._vectors: Dict[str, List[Tuple[str, np.ndarray]]] = {}
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0
+        }
+        self._load_index()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Cache configured by LLM_CACHE_DIR, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_MB and LLM_CACHE_SIMILARITY"""
+        threshold = os.getenv("LLM_CACHE_SIMILARITY")
+        embedder = None
+        if threshold:
+            from .embeddings import OpenAIEmbedder
+            embedder = OpenAIEmbedder()
+        return cls(
+            storage_dir=os.getenv("LLM_CACHE_DIR", "memory/llm_cache"),
+            ttl=timedelta(hours=float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))),
+            max_disk_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024),
+            embedder=embedder,
+            similarity_threshold=float(threshold) if threshold else None
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.storage_dir / f"{key}.json"
+
+    def _load_index(self):
+        """Size the disk store and rebuild the similarity index from it"""
+        for path in self.storage_dir.glob("*.json"):
+            self._disk_bytes += path.stat().st_size
+            if self.embedder is None:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    entry = json.load(f)
+            except Exception:
+                continue
+            if entry.get("embedding"):
+                self._index_vector(entry["scope"], entry["key"], entry["embedding"])
+
+    def _index_vector(self, scope: str, key: str, embedding: Sequence[float]):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            self._vectors.setdefault(scope, []).append((key, vector / norm))
+
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        try:
+            return list(map(float, self.embedder(normalize_prompt(prompt))))
+        except Exception as e:
+            logger.error(f"Error embedding prompt for response cache: {str(e)}")
+            return None
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _drop(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            for scope, vectors in self._vectors.items():
+                self._vectors[scope] = [(k, v) for k, v in vectors if k != key]
+            path = self._path(key)
+            if path.exists():
+                self._disk_bytes -= path.stat().st_size
+                path.unlink(missing_ok=True)
+
+    def _load(self, key: str, stat: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Read an entry from memory or disk, counting the hit under ``stat`` or its source"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                source = "memory_hits"
+        if entry is None:
+            path = self._path(key)
+            try:
+                with open(path, 'r') as f:
+                    entry = json.load(f)
+                source = "disk_hits"
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.error(f"Error reading response cache entry {key}: {str(e)}")
+                return None
+
+        if datetime.fromisoformat(entry["expires_at"]) <= datetime.now():
+            self._drop(key)
+            self._count("expired")
+            return None
+
+        if source == "disk_hits":
+            self._remember(key, entry)
+        try:
+            # Touch the file so size-based eviction sees it as recently used
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+        self._count(stat or source)
+        return entry
+
+    def get(self, provider: str, model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a prompt, or None"""
+        entry = self._load(response_key(provider, model, prompt, params))
+        if entry is None and self.embedder is not None and self.similarity_threshold:
+            entry = self._nearest(_scope(provider, model, params), prompt)
+        if entry is None:
+            self._count("misses")
+            return None
+        return entry["response"]
+
+    def _nearest(self, scope: str, prompt: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            candidates = list(self._vectors.get(scope, []))
+        if not candidates:
+            return None
+        embedding = self._embed(prompt)
+        if embedding is None:
+            return None
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = np.stack([v for _, v in candidates]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        entry = self._load(candidates[best][0], stat="semantic_hits")
+        if entry is not None:
+            logger.info(f"Response cache near-duplicate hit (similarity {scores[best]:.3f})")
+        return entry
+
+    def put(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        response: Dict[str, Any],
+        params: Optional[Dict[str, Any]] = None,
+        ttl: Optional[timedelta] = None
+    ):
+        """Store a successful response"""
+        key = response_key(provider, model, prompt, params)
+        scope = _scope(provider, model, params)
+        now = datetime.now()
+        entry = {
+            "key": key,
+            "scope": scope,
+            "provider": provider,
+            "model": model,
+            "created_at": now.isoformat(),
+            "expires_at": (now + (ttl or self.ttl)).isoformat(),
+            "response": response
+        }
+        if self.embedder is not None and self.similarity_threshold:
+            entry["embedding"] = self._embed(prompt)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, default=str)
+            with self._lock:
+                previous = path.stat().st_size if path.exists() else 0
+                tmp_path.replace(path)
+                self._disk_bytes += path.stat().st_size - previous
+                if entry.get("embedding") and not previous:
+                    self._index_vector(scope, key, entry["embedding"])
+        except Exception as e:
+            logger.error(f"Error storing response cache entry {key}: {str(e)}")
+            return
+        self._remember(key, entry)
+        self._count("stores")
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until the store fits its size limit"""
+        with self._lock:
+            paths = sorted(self.storage_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            target = self.max_disk_bytes * 0.9
+            for path in paths:
+                if self._disk_bytes <= target:
+                    break
+                self._drop(path.stem)
+                self.stats["evictions"] += 1
+
+    def purge_expired(self) -> int:
+        """Delete entries whose TTL has passed"""
+        removed = 0
+        now = datetime.now()
+        for path in list(self.storage_dir.glob("*.json")):
+            try:
+                with open(path, 'r') as f:
+                    expires_at = datetime.fromisoformat(json.load(f)["expires_at"])
+            except Exception:
+                continue
+            if expires_at <= now:
+                self._drop(path.stem)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            for path in self.storage_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self._memory.clear()
+            self._vectors.clear()
+            self._disk_bytes = 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and store size"""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics["memory_entries"] = len(self._memory)
+            metrics["disk_bytes"] = self._disk_bytes
+        hits = metrics["memory_hits"] + metrics["disk_hits"] + metrics["semantic_hits"]
+        lookups = hits + metrics["misses"]
+        metrics["hits"] = hits
+        metrics["hit_rate"] = hits / lookups if lookups else 0.0
+        return metrics
@@ -0,0 +1,171 @@
+# src/tools/ai/router.py
+
+from typing import Dict, Any, List, Optional, Iterable
+from collections import defaultdict
+import json
+import logging
+import os
+import re
+import threading
+
+from .usage import MODEL_PRICING
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("basic", "standard", "premium")
+
+# provider, model, quality tier; cost comes from MODEL_PRICING
+MODEL_CATALOG = [
+    {"provider": "openai", "model": "gpt-4o-mini", "tier": "basic"},
+    {"provider": "openai", "model": "gpt-4o", "tier": "standard"},
+    {"provider": "openai", "model": "gpt-4-turbo-preview", "tier": "premium"},
+    {"provider": "anthropic", "model": "claude-3-haiku-20240307", "tier": "basic"},
+    {"provider": "anthropic", "model": "claude-3-5-sonnet-20240620", "tier": "standard"},
+    {"provider": "anthropic", "model": "claude-3-opus-20240229", "tier": "premium"},
+    {"provider": "google", "model": "gemini-1.5-flash", "tier": "basic"},
+    {"provider": "google", "model": "gemini-1.5-pro", "tier": "standard"}
+]
+
+# Minimum quality tier per request class
+ROUTE_TIERS = {
+    "extraction": "basic",
+    "summarization": "basic",
+    "reasoning": "premium"
+}
+
+# Only a leading imperative counts: "Summarize these reviews" routes down,
+# "Give a summary of competitive risks" or "format your reasoning" do not
+_PATTERNS = {
+    "extraction": re.compile(
+        r"^\s*(please\s+)?(extract|parse|list (the|all)|convert|reformat|pull out|classify)\b", re.I
+    ),
+    "summarization": re.compile(r"^\s*(please\s+)?(summari[sz]e|tl;?dr|condense|shorten|recap)\b", re.I)
+}
+# Long prompts carry enough context that a shallow model is a false economy
+REASONING_MIN_CHARS = 8000
+
+
+def classify_request(text: str) -> str:
+    """Classify a prompt as extraction, summarization or reasoning
+
+    Only prompts that open with an extraction or summarization instruction
+    are routed down; anything else is treated as reasoning. Callers that
+    know the task should pass ``task_type`` to ``ModelRouter.route`` instead.
+    """
+    if len(text) >= REASONING_MIN_CHARS:
+        return "reasoning"
+    for task_type in ("extraction", "summarization"):
+        if _PATTERNS[task_type].match(text):
+            return task_type
+    return "reasoning"
+
+
+def _unit_cost(model: str) -> float:
+    # Blended price for a typical 3:1 input/output call
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return 0.75 * input_price + 0.25 * output_price
+
+
+class ModelRouter:
+    """Pick the cheapest, fastest model that meets a request's quality tier
+
+    Requests are classified into extraction, summarization or reasoning,
+    each mapped to a minimum tier. Among catalog models at or above that
+    tier, the lowest blended price wins, with observed latency breaking
+    ties. Per-agent overrides can pin a tier or an exact model. Latency,
+    cost and error stats are kept per route and model.
+    """
+
+    def __init__(
+        self,
+        catalog: Optional[List[Dict[str, str]]] = None,
+        route_tiers: Optional[Dict[str, str]] = None,
+        agent_overrides: Optional[Dict[str, Dict[str, str]]] = None
+    ):
+        self.catalog = list(catalog or MODEL_CATALOG)
+        self.route_tiers = {**ROUTE_TIERS, **(route_tiers or {})}
+        self.agent_overrides = dict(agent_overrides or {})
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(
+            lambda: defaultdict(lambda: {"calls": 0, "errors": 0, "latency": 0.0, "cost": 0.0})
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        """Router with overrides from LLM_ROUTE_TIERS and LLM_AGENT_MODELS (JSON)"""
+        return cls(
+            route_tiers=json.loads(os.getenv("LLM_ROUTE_TIERS", "{}")),
+            agent_overrides=json.loads(os.getenv("LLM_AGENT_MODELS", "{}"))
+        )
+
+    def set_agent_override(self, agent: str, tier: Optional[str] = None, provider: Optional[str] = None, model: Optional[str] = None):
+        """Pin an agent's requests to a tier or to a specific model"""
+        if tier is not None and tier not in TIERS:
+            raise ValueError(f"Unknown quality tier: {tier}")
+        self.agent_overrides[agent] = {k: v for k, v in {"tier": tier, "provider": provider, "model": model}.items() if v}
+
+    def route(
+        self,
+        text: str,
+        task_type: Optional[str] = None,
+        agent: Optional[str] = None,
+        providers: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Choose provider and model for a request
+
+        ``providers`` restricts the choice, e.g. to the provider a wrapper
+        is bound to. If no model there meets the tier, its best model is used.
+        """
+        task_type = task_type or classify_request(text)
+        override = self.agent_overrides.get(agent, {}) if agent else {}
+        tier = override.get("tier") or self.route_tiers.get(task_type, "premium")
+        providers = set(providers) if providers else None
+
+        if override.get("model"):
+            provider = override.get("provider") or next(
+                (m["provider"] for m in self.catalog if m["model"] == override["model"]), None
+            )
+            if provider and (providers is None or provider in providers):
+                return {"provider": provider, "model": override["model"], "task_type": task_type, "tier": tier}
+
+        candidates = [m for m in self.catalog if providers is None or m["provider"] in providers]
+        if not candidates:
+            raise ValueError(f"No routable models for providers: {', '.join(sorted(providers or []))}")
+        eligible = [m for m in candidates if TIERS.index(m["tier"]) >= TIERS.index(tier)]
+        if eligible:
+            choice = min(eligible, key=lambda m: (_unit_cost(m["model"]), self._latency(task_type, m["model"])))
+        else:
+            choice = max(candidates, key=lambda m: TIERS.index(m["tier"]))
+        return {"provider": choice["provider"], "model": choice["model"], "task_type": task_type, "tier": tier}
+
+    def _latency(self, task_type: str, model: str) -> float:
+        with self._lock:
+            stats = self._stats.get(task_type, {}).get(model)
+            if not stats or not stats["calls"]:
+                return 0.0
+            return stats["latency"] / stats["calls"]
+
+    def observe(self, task_type: str, model: str, latency: float, cost: float, status: str = "success"):
+        """Record the outcome of a routed call"""
+        with self._lock:
+            stats = self._stats[task_type][model]
+            stats["calls"] += 1
+            stats["errors"] += 0 if status == "success" else 1
+            stats["latency"] += latency
+            stats["cost"] += cost
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Per route and model: calls, errors, average latency and total cost"""
+        with self._lock:
+            return {
+                task_type: {
+                    model: {
+                        "calls": s["calls"],
+                        "errors": s["errors"],
+                        "avg_latency": s["latency"] / s["calls"] if s["calls"] else 0.0,
+                        "cost": s["cost"]
+                    }
+                    for model, s in models.items()
+                }
+                for task_type, models in self._stats.items()
+            }
@@ -0,0 +1,277 @@
+# src/tools/ai/usage.py
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens (input, output); unknown models are costed at zero
+MODEL_PRICING = {
+    "gpt-4-turbo-preview": (10.00, 30.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "claude-3-opus-20240229": (15.00, 75.00),
+    "claude-3-5-sonnet-20240620": (3.00, 15.00),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+    "gemini-pro": (0.50, 1.50),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00)
+}
+
+# Prompt-cache price relative to normal input tokens: (read, write)
+CACHE_PRICE_FACTORS = {
+    "anthropic": (0.10, 1.25),
+    "openai": (0.50, 1.00),
+    "google": (0.25, 1.00)
+}
+
+# crewAI/LiteLLM model routes ("anthropic/claude-...") and bare model-name prefixes
+MODEL_ROUTE_PROVIDERS = {
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "gemini": "google",
+    "google": "google",
+    "vertex_ai": "google"
+}
+MODEL_NAME_PROVIDERS = (("gpt-", "openai"), ("o1", "openai"), ("claude", "anthropic"), ("gemini", "google"))
+
+ATTRIBUTION_FIELDS = ("run_id", "agent", "task")
+DIMENSIONS = ("provider", "model") + ATTRIBUTION_FIELDS
+
+_attribution: ContextVar = ContextVar("llm_usage_attribution", default={})
+
+
+@contextmanager
+def attribute_usage(**labels):
+    """Attribute LLM calls made inside the block to a run, agent and/or task"""
+    unknown = set(labels) - set(ATTRIBUTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown attribution fields: {', '.join(sorted(unknown))}")
+    token = _attribution.set({**_attribution.get(), **{k: v for k, v in labels.items() if v}})
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def current_attribution() -> Dict[str, Any]:
+    return dict(_attribution.get())
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+    provider: Optional[str] = None
+) -> float:
+    """Estimated USD cost of a call
+
+    ``prompt_tokens`` are uncached input tokens; prompt-cache reads and
+    writes are priced with the provider's CACHE_PRICE_FACTORS.
+    """
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    read_factor, write_factor = CACHE_PRICE_FACTORS.get(provider, (1.0, 1.0))
+    input_tokens = prompt_tokens + cache_read_tokens * read_factor + cache_write_tokens * write_factor
+    return (input_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def split_model(model: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(provider, bare model name) for a model string such as "anthropic/claude-3-haiku-20240307"
+
+    The provider is None when it cannot be told from the name.
+    """
+    if not model:
+        return None, model
+    route, _, name = model.rpartition("/")
+    if route:
+        return MODEL_ROUTE_PROVIDERS.get(route.split("/")[0]), name
+    for prefix, provider in MODEL_NAME_PROVIDERS:
+        if model.startswith(prefix):
+            return provider, model
+    return None, model
+
+
+def _empty_totals() -> Dict[str, float]:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "retries": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+        "total_tokens": 0,
+        "latency": 0.0,
+        "cost": 0.0
+    }
+
+
+def merge_usage(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """Sum two ``run_usage`` breakdowns, e.g. a run's earlier attempt and its resume"""
+    def add(a: Dict[str, float], b: Dict[str, float]) -> Dict[str, float]:
+        return {field: a.get(field, 0) + b.get(field, 0) for field in _empty_totals()}
+
+    merged = {"totals": add(first.get("totals", {}), second.get("totals", {}))}
+    for breakdown in ("by_provider", "by_agent", "by_task"):
+        a, b = first.get(breakdown, {}), second.get(breakdown, {})
+        merged[breakdown] = {key: add(a.get(key, {}), b.get(key, {})) for key in {**a, **b}}
+    return merged
+
+
+class UsageTracker:
+    """In-memory token, latency and cost accounting for LLM calls
+
+    Every call is aggregated by provider, model, run, agent and task. The
+    last ``max_records`` raw records are kept for inspection. Per-run
+    aggregates are dropped with ``evict_run`` once a run's usage has been
+    persisted, and beyond ``max_runs`` the least recently active run goes.
+    """
+
+    def __init__(self, max_records: int = 10000, max_runs: int = 1000):
+        self.records = deque(maxlen=max_records)
+        self.max_runs = max_runs
+        self._totals = _empty_totals()
+        self._by_dimension = {dim: defaultdict(_empty_totals) for dim in DIMENSIONS}
+        self._runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        latency: float = 0.0,
+        retries: int = 0,
+        status: str = "success",
+        cost_factor: float = 1.0,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        **labels
+    ) -> Dict[str, Any]:
+        """Record one LLM call, attributed to the current run/agent/task
+
+        ``cost_factor`` scales the list-price estimate, e.g. 0.5 for batch jobs.
+        """
+        prompt_tokens = prompt_tokens or 0
+        completion_tokens = completion_tokens or 0
+        cache_read_tokens = cache_read_tokens or 0
+        cache_write_tokens = cache_write_tokens or 0
+        attribution = {**current_attribution(), **{k: v for k, v in labels.items() if v}}
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_write_tokens": cache_write_tokens,
+            "total_tokens": prompt_tokens + completion_tokens + cache_read_tokens + cache_write_tokens,
+            "latency": latency,
+            "retries": retries,
+            "status": status,
+            "cost": estimate_cost(
+                model, prompt_tokens, completion_tokens, cache_read_tokens, cache_write_tokens, provider
+            ) * cost_factor,
+            **{field: attribution.get(field) for field in ATTRIBUTION_FIELDS}
+        }
+
+        with self._lock:
+            self.records.append(record)
+            buckets = [self._totals]
+            for dim in DIMENSIONS:
+                if record[dim]:
+                    buckets.append(self._by_dimension[dim][record[dim]])
+            if record["run_id"]:
+                run = self._runs.setdefault(record["run_id"], {
+                    "totals": _empty_totals(),
+                    "by_provider": defaultdict(_empty_totals),
+                    "by_agent": defaultdict(_empty_totals),
+                    "by_task": defaultdict(_empty_totals)
+                })
+                self._runs.move_to_end(record["run_id"])
+                while len(self._runs) > self.max_runs:
+                    oldest, _ = self._runs.popitem(last=False)
+                    self._by_dimension["run_id"].pop(oldest, None)
+                buckets.append(run["totals"])
+                buckets.append(run["by_provider"][provider])
+                if record["agent"]:
+                    buckets.append(run["by_agent"][record["agent"]])
+                if record["task"]:
+                    buckets.append(run["by_task"][record["task"]])
+            for bucket in buckets:
+                self._add(bucket, record)
+        return record
+
+    def _add(self, bucket: Dict[str, float], record: Dict[str, Any]):
+        bucket["calls"] += 1
+        bucket["errors"] += 0 if record["status"] == "success" else 1
+        for field in (
+            "retries", "prompt_tokens", "completion_tokens", "cache_read_tokens",
+            "cache_write_tokens", "total_tokens", "latency", "cost"
+        ):
+            bucket[field] += record[field]
+
+    def summary(self, dimension: str) -> Dict[str, Dict[str, float]]:
+        """Totals grouped by provider, model, run_id, agent or task"""
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown usage dimension: {dimension}")
+        with self._lock:
+            return {key: dict(totals) for key, totals in self._by_dimension[dimension].items()}
+
+    def run_usage(self, run_id: str) -> Dict[str, Any]:
+        """Usage for one run, broken down by provider, agent and task"""
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return {"totals": _empty_totals(), "by_provider": {}, "by_agent": {}, "by_task": {}}
+            return {
+                "totals": dict(run["totals"]),
+                "by_provider": {k: dict(v) for k, v in run["by_provider"].items()},
+                "by_agent": {k: dict(v) for k, v in run["by_agent"].items()},
+                "by_task": {k: dict(v) for k, v in run["by_task"].items()}
+            }
+
+    def evict_run(self, run_id: str):
+        """Drop a run's aggregates, e.g. after its usage has been persisted"""
+        with self._lock:
+            self._runs.pop(run_id, None)
+            self._by_dimension["run_id"].pop(run_id, None)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of all aggregates for a metrics endpoint"""
+        with self._lock:
+            snapshot = {"totals": dict(self._totals)}
+            for dim in ("provider", "model", "agent", "task"):
+                snapshot[f"by_{dim}"] = {k: dict(v) for k, v in self._by_dimension[dim].items()}
+            snapshot["runs_tracked"] = len(self._runs)
+        return snapshot
+
+    def reset(self):
+        """Clear all records and aggregates"""
+        with self._lock:
+            self.records.clear()
+            self._totals = _empty_totals()
+            self._by_dimension = {dim: defaultdict(_empty_totals) for dim in DIMENSIONS}
+            self._runs.clear()
+
+
+_tracker: Optional[UsageTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_usage_tracker() -> UsageTracker:
+    """Process-wide usage tracker"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = UsageTracker()
+        return _tracker
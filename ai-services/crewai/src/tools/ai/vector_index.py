@@ -0,0 +1,341 @@
+# src/tools/ai/vector_index.py
+
+from typing import Dict, Any, List, Optional, Callable, Sequence, Iterator
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import fcntl
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Stored text per document; recall returns findings, not whole payloads
+MAX_DOCUMENT_CHARS = 4000
+
+
+class IVFIndex:
+    """Approximate nearest neighbours by k-means buckets (inverted file)
+
+    Vectors are assigned to their nearest of ``sqrt(n)`` centroids; a query
+    scans only the ``nprobe`` closest buckets. Trained once the corpus
+    passes the exact-search threshold and retrained when it doubles.
+    """
+
+    def __init__(self, vectors: np.ndarray, nprobe: int = 8, iterations: int = 10, seed: int = 0):
+        self.nprobe = nprobe
+        n_lists = max(int(np.sqrt(len(vectors))), 1)
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = vectors[assignment == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+        self.centroids = centroids
+        self.trained_size = len(vectors)
+        self.lists: List[List[int]] = [[] for _ in range(n_lists)]
+        self.add(vectors, 0)
+
+    def add(self, vectors: np.ndarray, offset: int):
+        """Assign rows ``offset..offset+len(vectors)`` to their buckets"""
+        for i, c in enumerate(np.argmax(vectors @ self.centroids.T, axis=1)):
+            self.lists[c].append(offset + i)
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        probe = np.argsort(self.centroids @ query)[::-1][:self.nprobe]
+        return np.fromiter((i for c in probe for i in self.lists[c]), dtype=np.int64)
+
+
+class VectorIndex:
+    """Persistent embedding index for semantic recall of stored research
+
+    ``add`` only queues documents, so callers on a write path never wait
+    on the embedding API. Once ``batch_size`` documents are queued (or on
+    ``flush(wait=False)``) a background thread embeds them in one batch
+    and appends them to disk; ``flush()`` and ``search`` do it inline.
+    Search is exact brute-force cosine up to ``ann_threshold`` vectors and
+    approximate (IVF) beyond it. Re-adding a document id replaces the
+    earlier copy.
+
+    Several processes may share one storage dir: appends to both files
+    happen under an exclusive ``flock`` and every process reads the rows
+    the others appended before it writes or searches.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str = "memory/vector_index",
+        embedder: Optional[Callable[[List[str]], Sequence[Sequence[float]]]] = None,
+        batch_size: int = 32,
+        ann_threshold: int = 20000
+    ):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.ann_threshold = ann_threshold
+        self._vectors_path = self.storage_dir / "vectors.f32"
+        self._documents_path = self.storage_dir / "documents.jsonl"
+        self._lock_path = self.storage_dir / "index.lock"
+        self._documents: List[Dict[str, Any]] = []
+        self._documents_bytes = 0
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._pending: List[Dict[str, Any]] = []
+        self._ivf: Optional[IVFIndex] = None
+        self._lock = threading.RLock()
+        self._flusher: Optional[ThreadPoolExecutor] = None
+        self._scheduled: Optional[Future] = None
+        self.stats = {"documents": 0, "embedding_batches": 0, "searches": 0}
+        self._load()
+
+    @classmethod
+    def from_env(cls) -> "VectorIndex":
+        """Index at VECTOR_INDEX_DIR embedding with OpenAI; VECTOR_INDEX_ANN_THRESHOLD sets the cut-over"""
+        from .embeddings import OpenAIEmbedder
+        return cls(
+            storage_dir=os.getenv("VECTOR_INDEX_DIR", "memory/vector_index"),
+            embedder=OpenAIEmbedder().embed,
+            ann_threshold=int(os.getenv("VECTOR_INDEX_ANN_THRESHOLD", "20000"))
+        )
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        """Cross-process lock on the storage dir (shared for reads, exclusive for writes)"""
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        with self._lock, self._file_lock(exclusive=True):
+            self._repair()
+            self._catch_up()
+
+    def _repair(self):
+        """Trim a half-written tail left by a crash mid-append (caller holds the exclusive lock)"""
+        documents = []
+        torn = False
+        if self._documents_path.exists():
+            with open(self._documents_path, 'r') as f:
+                for line in f:
+                    try:
+                        documents.append(json.loads(line))
+                    except ValueError:
+                        torn = True
+                        break
+        if not documents or not self._vectors_path.exists():
+            # Nothing usable: start both files over rather than leave them misaligned
+            if torn or documents or self._vectors_path.exists():
+                self._documents_path.unlink(missing_ok=True)
+                self._vectors_path.unlink(missing_ok=True)
+            return
+        dim = documents[0]["dim"]
+        vector_count = self._vectors_path.stat().st_size // (dim * 4)
+        count = min(len(documents), vector_count)
+        if torn or count < len(documents) or self._vectors_path.stat().st_size != count * dim * 4:
+            # Cut both files back to the rows they agree on so appends stay aligned
+            logger.warning(f"Trimming vector index at {self.storage_dir} to {count} consistent documents")
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(count * dim * 4)
+            with open(self._documents_path, 'w') as f:
+                f.writelines(json.dumps(doc, default=str) + "\n" for doc in documents[:count])
+
+    def _catch_up(self):
+        """Load rows appended since the last read, by this or another process (caller holds a file lock)"""
+        if not self._documents_path.exists() or self._documents_path.stat().st_size <= self._documents_bytes:
+            return
+        with open(self._documents_path, 'rb') as f:
+            f.seek(self._documents_bytes)
+            # Writers append whole lines under the exclusive lock; a partial last line is never expected
+            lines = f.read().split(b"\n")[:-1]
+        if not lines:
+            return
+        documents = [json.loads(line) for line in lines]
+        dim = documents[0]["dim"]
+        with open(self._vectors_path, 'rb') as f:
+            f.seek(len(self._documents) * dim * 4)
+            vectors = np.frombuffer(f.read(len(documents) * dim * 4), dtype=np.float32)
+        count = len(vectors) // dim
+        self._documents_bytes += sum(len(line) + 1 for line in lines[:count])
+        self._append_rows(documents[:count], vectors[:count * dim].reshape(count, dim).copy())
+
+    def _append_rows(self, documents: List[Dict[str, Any]], vectors: np.ndarray):
+        offset = len(self._documents)
+        self._vectors = vectors if offset == 0 else np.vstack([self._vectors, vectors])
+        for i, doc in enumerate(documents):
+            self._rows[doc["id"]] = offset + i
+        self._documents.extend(documents)
+        self.stats["documents"] = len(self._rows)
+
+        if len(self._vectors) > self.ann_threshold:
+            if self._ivf is None or len(self._vectors) >= 2 * self._ivf.trained_size:
+                self._ivf = IVFIndex(self._vectors)
+            else:
+                self._ivf.add(vectors, offset)
+
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None):
+        """Queue a document; a full batch is embedded in the background"""
+        if not text or not text.strip():
+            return
+        with self._lock:
+            self._pending.append({
+                "id": doc_id,
+                "text": text[:MAX_DOCUMENT_CHARS],
+                "metadata": metadata or {},
+                "created_at": datetime.now().isoformat()
+            })
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush(wait=False)
+
+    def flush(self, wait: bool = True):
+        """Embed queued documents in one batch and append them to the index
+
+        With ``wait=False`` the batch is embedded on a background thread.
+        """
+        if wait:
+            scheduled = self._scheduled
+            if scheduled is not None:
+                scheduled.result()
+            self._flush()
+            return
+        with self._lock:
+            if self._scheduled is not None and not self._scheduled.done():
+                return
+            if self._flusher is None:
+                self._flusher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-index")
+            self._scheduled = self._flusher.submit(self._flush_in_background)
+
+    def _flush_in_background(self):
+        try:
+            self._flush()
+        except Exception as e:
+            logger.warning(f"Background embedding of {self.storage_dir} failed: {str(e)}")
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        if self.embedder is None:
+            raise ValueError("VectorIndex needs an embedder to index documents")
+        try:
+            vectors = np.asarray(self.embedder([doc["text"] for doc in pending]), dtype=np.float32)
+        except Exception:
+            with self._lock:
+                self._pending = pending + self._pending
+            raise
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        with self._lock, self._file_lock(exclusive=True):
+            # Pick up other writers' rows first so our rows land after theirs in both files
+            self._catch_up()
+            lines = []
+            for doc in pending:
+                doc["dim"] = vectors.shape[1]
+                lines.append((json.dumps(doc, default=str) + "\n").encode())
+            with open(self._vectors_path, 'ab') as f:
+                f.write(vectors.tobytes())
+            with open(self._documents_path, 'ab') as f:
+                f.writelines(lines)
+            self._documents_bytes += sum(len(line) for line in lines)
+            self._append_rows(pending, vectors)
+            self.stats["embedding_batches"] += 1
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """Top-k stored documents by cosine similarity to ``query``
+
+        ``where`` filters on each document's metadata.
+        """
+        self.flush()
+        with self._lock, self._file_lock(exclusive=False):
+            self._catch_up()
+        if not self._rows:
+            return []
+        vector = np.asarray(self.embedder([query])[0], dtype=np.float32)
+        vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        with self._lock:
+            rows = self._ivf.candidates(vector) if self._ivf is not None else np.arange(len(self._vectors))
+            scores = self._vectors[rows] @ vector
+            self.stats["searches"] += 1
+
+            results = []
+            for i in np.argsort(scores)[::-1]:
+                row = int(rows[i])
+                doc = self._documents[row]
+                # Skip copies superseded by a later add of the same id
+                if self._rows.get(doc["id"]) != row:
+                    continue
+                if where is not None and not where(doc["metadata"]):
+                    continue
+                results.append({
+                    "id": doc["id"],
+                    "text": doc["text"],
+                    "metadata": doc["metadata"],
+                    "created_at": doc["created_at"],
+                    "score": float(scores[i])
+                })
+                if len(results) >= k:
+                    break
+            return results
+
+    def __len__(self) -> int:
+        with self._lock, self._file_lock(exclusive=False):
+            self._catch_up()
+            return len(self._rows) + len(self._pending)
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Process-wide index, or None when disabled (VECTOR_INDEX_ENABLED=0) or without an OpenAI key"""
+    global _index
+    if os.getenv("VECTOR_INDEX_ENABLED", "1") == "0" or not os.getenv("OPENAI_API_KEY"):
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex.from_env()
+        return _index
+
+
+class SemanticRecallTool:
+    """Top-k prior findings relevant to a question, from past research runs"""
+
+    def __init__(self, index: Optional[VectorIndex] = None):
+        self.name = "Prior Research Recall"
+        self.index = index
+
+    def recall(self, query: str, k: int = 5, category: Optional[str] = None) -> Dict[str, Any]:
+        """Find stored insights, analyses and agent outputs similar to ``query``"""
+        index = self.index or get_vector_index()
+        if index is None:
+            return {"status": "error", "error": "Vector index is not configured"}
+        try:
+            where = (lambda metadata: metadata.get("category") == category) if category else None
+            results = index.search(query, k=k, where=where)
+        except Exception as e:
+            logger.error(f"Semantic recall failed: {str(e)}")
+            return {"status": "error", "error": str(e)}
+        return {
+            "status": "success",
+            "results": results,
+            "total_results": len(results)
+        }
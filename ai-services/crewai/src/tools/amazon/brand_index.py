@@ -0,0 +1,234 @@
+# src/tools/amazon/brand_index.py
+
+from typing import Dict, Any, List, Optional, Set
+from collections import defaultdict
+from pathlib import Path
+import json
+import logging
+import math
+import re
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Corporate suffixes that never distinguish one Amazon brand from another
+CORPORATE_SUFFIXES = {"inc", "llc", "ltd", "co", "corp", "company", "gmbh", "official", "store"}
+
+# Share of Voice brand fields merged when several rows resolve to one brand
+ADDITIVE_SUFFIXES = ("_products", "_sov")
+AVERAGED_INFIX = "_average_"
+
+
+def normalize_brand(name: str) -> str:
+    """Reduce a brand string to a spacing/case/punctuation-insensitive key"""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    tokens = re.findall(r"[a-z0-9]+", text.lower())
+    while len(tokens) > 1 and tokens[-1] in CORPORATE_SUFFIXES:
+        tokens.pop()
+    return "".join(tokens)
+
+
+def brand_ngrams(key: str, n: int = 3) -> Set[str]:
+    """Padded character n-grams of a normalized brand key"""
+    padded = f"{'^' * (n - 1)}{key}$"
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class BrandMatch:
+    """Result of resolving a raw brand string"""
+
+    def __init__(self, brand_id: str, name: str, score: float, method: str):
+        self.brand_id = brand_id
+        self.name = name
+        self.score = score
+        self.method = method  # alias, exact, fuzzy or new
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "brand_id": self.brand_id,
+            "name": self.name,
+            "score": self.score,
+            "method": self.method
+        }
+
+
+class BrandIndex:
+    """Canonical brand registry with a character n-gram index for fuzzy lookup
+
+    Resolution order is: hand-maintained alias table, exact normalized key,
+    then Dice similarity over character trigrams. Candidate generation uses
+    prefix filtering on the rarest query grams, so lookups stay sub-millisecond
+    with hundreds of thousands of known brands.
+    """
+
+    def __init__(self, threshold: float = 0.8, alias_path: Optional[str] = None, ngram: int = 3):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.alias_path = Path(alias_path) if alias_path else None
+
+        self.names: Dict[str, str] = {}                  # brand_id -> canonical display name
+        self.aliases: Dict[str, str] = {}                # normalized alias -> brand_id
+        self.manual_aliases: Dict[str, List[str]] = {}   # canonical name -> raw aliases (persisted)
+        self._grams: Dict[str, int] = {}                 # brand_id -> gram count
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+
+        if self.alias_path and self.alias_path.exists():
+            self.load_aliases(self.alias_path)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def add_brand(self, name: str) -> str:
+        """Register a canonical brand and return its ID"""
+        key = normalize_brand(name)
+        if not key:
+            raise ValueError(f"Brand name has no usable characters: {name!r}")
+        if key in self.aliases:
+            return self.aliases[key]
+        if key not in self.names:
+            grams = brand_ngrams(key, self.ngram)
+            for gram in grams:
+                self._postings[gram].add(key)
+            self._grams[key] = len(grams)
+            self.names[key] = name.strip()
+        return key
+
+    def add_alias(self, alias: str, canonical: str, persist: bool = True) -> str:
+        """Map an alias onto a canonical brand, overriding any fuzzy match"""
+        brand_id = self.add_brand(canonical)
+        alias_key = normalize_brand(alias)
+        if alias_key and alias_key != brand_id:
+            self.aliases[alias_key] = brand_id
+            if persist:
+                known = self.manual_aliases.setdefault(self.names[brand_id], [])
+                if alias not in known:
+                    known.append(alias)
+        return brand_id
+
+    def lookup(self, name: str) -> Optional[BrandMatch]:
+        """Find the canonical brand for a raw string without registering it"""
+        key = normalize_brand(name)
+        if not key:
+            return None
+        if key in self.aliases:
+            brand_id = self.aliases[key]
+            return BrandMatch(brand_id, self.names[brand_id], 1.0, "alias")
+        if key in self.names:
+            return BrandMatch(key, self.names[key], 1.0, "exact")
+
+        brand_id, score = self._best_fuzzy_match(key)
+        if brand_id is None:
+            return None
+        return BrandMatch(brand_id, self.names[brand_id], score, "fuzzy")
+
+    def resolve(self, name: str, register: bool = True) -> Optional[BrandMatch]:
+        """Resolve a raw brand string, registering it as a new brand if unknown"""
+        match = self.lookup(name)
+        if match is not None:
+            if match.method == "fuzzy":
+                # Remember the spelling so the next lookup is a dict hit
+                self.aliases[normalize_brand(name)] = match.brand_id
+            return match
+        if not register or not normalize_brand(name):
+            return None
+        brand_id = self.add_brand(name)
+        return BrandMatch(brand_id, self.names[brand_id], 1.0, "new")
+
+    def canonical_id(self, name: str) -> Optional[str]:
+        """Shortcut returning only the canonical brand ID"""
+        match = self.resolve(name)
+        return match.brand_id if match else None
+
+    def _best_fuzzy_match(self, key: str):
+        """Dice similarity search over the n-gram postings"""
+        grams = brand_ngrams(key, self.ngram)
+        size = len(grams)
+        t = self.threshold
+
+        # A candidate needs at least this many shared grams to reach the threshold
+        min_overlap = max(1, math.ceil(t * size / (2 - t)))
+        min_len = t / (2 - t) * size
+        max_len = (2 - t) / t * size
+
+        ordered = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        prefix = ordered[:size - min_overlap + 1]
+
+        candidates: Dict[str, int] = defaultdict(int)
+        for gram in prefix:
+            for brand_id in self._postings.get(gram, ()):
+                if min_len <= self._grams[brand_id] <= max_len:
+                    candidates[brand_id] += 1
+
+        best_id, best_score = None, 0.0
+        rest = ordered[len(prefix):]
+        for brand_id, shared in candidates.items():
+            for gram in rest:
+                if brand_id in self._postings.get(gram, ()):
+                    shared += 1
+            score = 2.0 * shared / (size + self._grams[brand_id])
+            if score > best_score or (score == best_score and best_id is not None and brand_id < best_id):
+                best_id, best_score = brand_id, score
+
+        if best_id is None or best_score < t:
+            return None, 0.0
+        return best_id, best_score
+
+    def canonicalize_brands(self, brands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge Share of Voice brand rows that resolve to the same canonical brand"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        weights: Dict[str, float] = defaultdict(float)
+
+        for row in brands:
+            match = self.resolve(row.get("brand") or "")
+            if match is None:
+                continue
+            weight = row.get("combined_products") or 1
+            target = merged.get(match.brand_id)
+            if target is None:
+                target = dict(row, brand=match.name, brand_id=match.brand_id)
+                merged[match.brand_id] = target
+            else:
+                for field, value in row.items():
+                    if not isinstance(value, (int, float)) or isinstance(value, bool):
+                        continue
+                    current = target.get(field)
+                    if field.endswith(ADDITIVE_SUFFIXES):
+                        target[field] = (current or 0) + value
+                    elif AVERAGED_INFIX in field:
+                        if current is None:
+                            target[field] = value
+                        else:
+                            total = weights[match.brand_id] + weight
+                            target[field] = (current * weights[match.brand_id] + value * weight) / total
+            weights[match.brand_id] += weight
+
+        return sorted(
+            merged.values(),
+            key=lambda x: x.get("combined_weighted_sov", 0),
+            reverse=True
+        )
+
+    def load_aliases(self, path: str):
+        """Load a hand-editable alias table: {"Canonical Name": ["alias", ...]}"""
+        try:
+            with open(path, 'r') as f:
+                table = json.load(f)
+            for canonical, aliases in table.items():
+                self.add_brand(canonical)
+                for alias in aliases:
+                    self.add_alias(alias, canonical)
+            logger.info(f"Loaded {len(table)} canonical brands from {path}")
+        except Exception as e:
+            logger.error(f"Error loading brand aliases from {path}: {str(e)}")
+            raise
+
+    def save_aliases(self, path: Optional[str] = None):
+        """Persist the manual alias table"""
+        path = Path(path) if path else self.alias_path
+        if path is None:
+            raise ValueError("No alias table path configured")
+        with open(path, 'w') as f:
+            json.dump(self.manual_aliases, f, indent=2, sort_keys=True)
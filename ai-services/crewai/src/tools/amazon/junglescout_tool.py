@@ -5,6 +5,7 @@ from typing import Dict, Any
 import os
 from crewai_tools import tool
 from .junglescout_api import JungleScoutAPI
+from .research_brief import build_research_brief, render_brief
 
 # Initialize the API client
 api = JungleScoutAPI(
@@ -30,33 +31,8 @@ def analyze_market(keyword: str) -> str:
         if "data" not in result or "attributes" not in result["data"]:
             return "No market data available"
             
-        attrs = result["data"]["attributes"]
-        
-        # Format comprehensive analysis
-        response = [
-            f"\nAdvanced Market Analysis for '{keyword}':",
-            
-            "\n1. Market Size and Demand:",
-            f"- Monthly Search Volume: {attrs['estimated_30_day_search_volume']:,}",
-            f"- Total Products: {attrs['product_count']:,}",
-            f"- Market Saturation: {len(attrs.get('brands', [])) / attrs['product_count']:.2%}",
-            
-            "\n2. Competitive Landscape:",
-            "Top Brands Performance:"
-        ]
-        
-        # Add detailed brand analysis
-        for brand in sorted(attrs.get('brands', [])[:5], key=lambda x: x['combined_weighted_sov'], reverse=True):
-            market_dominance = (brand['combined_weighted_sov'] * 100) / brand['combined_average_position']
-            response.extend([
-                f"\n{brand['brand']}:",
-                f"- Market Share: {brand['combined_weighted_sov']:.1%}",
-                f"- Products: {brand['combined_products']}",
-                f"- Average Position: {brand['combined_average_position']:.1f}",
-                f"- Market Dominance Score: {market_dominance:.2f}"
-            ])
-        
-        return "\n".join(response)
+        # Compact brief instead of the full payload keeps agent prompts small
+        return render_brief(build_research_brief(keyword, result))
         
     except Exception as e:
         return f"Error analyzing market data: {str(e)}"
\ No newline at end of file
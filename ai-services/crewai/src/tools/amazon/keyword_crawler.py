@@ -0,0 +1,312 @@
+# src/tools/amazon/keyword_crawler.py
+
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+import heapq
+import json
+import logging
+import re
+
+from .junglescout_api import JungleScoutAPI
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = {
+    "a", "an", "and", "the", "for", "with", "of", "in", "on", "to", "by", "or",
+    "pack", "set", "pcs", "piece", "inch", "inches", "ft", "lbs", "lb", "x"
+}
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Lowercase and collapse whitespace so visited checks are spelling-stable"""
+    return " ".join(str(keyword).lower().split())
+
+
+def opportunity_score(search_volume: int, brands: List[Dict]) -> float:
+    """Opportunity score from search volume and top-3 concentration
+
+    Mirrors MarketResearchAgent._calculate_opportunity_score so crawl priorities
+    line up with what the research crew later reports.
+    """
+    top_sov = sum(
+        b.get("combined_weighted_sov", 0) for b in sorted(
+            brands,
+            key=lambda x: x.get("combined_weighted_sov", 0),
+            reverse=True
+        )[:3]
+    )
+    if top_sov > 0.7:
+        multiplier = 0.4
+    elif top_sov > 0.4:
+        multiplier = 0.7
+    else:
+        multiplier = 1.0
+    return min(search_volume / 100000, 1.0) * multiplier
+
+
+def extract_related_terms(
+    keyword: str,
+    attributes: Dict[str, Any],
+    max_terms: int = 10,
+    include_brand_terms: bool = False
+) -> List[Tuple[str, float]]:
+    """Derive related keywords from top ASIN names and brand data
+
+    Returns (term, weight) pairs where weight is the share of top ASIN names
+    the phrase appears in. Phrases must contain a word of the parent keyword
+    and brand names are stripped out unless brand terms are requested.
+    """
+    parent_tokens = set(normalize_keyword(keyword).split())
+    brand_tokens = set()
+    for brand in attributes.get("brands", []):
+        brand_tokens.update(re.findall(r"[a-z0-9]+", str(brand.get("brand", "")).lower()))
+    brand_tokens -= parent_tokens
+
+    names = [a.get("name") for a in attributes.get("top_asins", []) if a.get("name")]
+    counts: Counter = Counter()
+    for name in names:
+        words = [
+            w for w in re.findall(r"[a-z][a-z0-9\-]*", name.lower())
+            if w not in STOPWORDS and w not in brand_tokens
+        ]
+        phrases = set()
+        for size in (2, 3):
+            for i in range(len(words) - size + 1):
+                window = words[i:i + size]
+                if parent_tokens & set(window) and len(set(window)) == size:
+                    phrases.add(" ".join(window))
+        counts.update(phrases)
+
+    parent = normalize_keyword(keyword)
+    total = max(len(names), 1)
+    related = [
+        (term, count / total) for term, count in counts.most_common()
+        if term != parent
+    ][:max_terms]
+
+    if include_brand_terms:
+        for brand in attributes.get("brands", [])[:3]:
+            name = normalize_keyword(brand.get("brand", ""))
+            if name:
+                related.append((f"{name} {parent}", brand.get("combined_weighted_sov", 0)))
+
+    return related
+
+
+class KeywordDiscoveryCrawler:
+    """Best-first crawler that grows the keyword universe from seed terms
+
+    Keywords are fetched with Share of Voice, scored for opportunity and
+    expanded through related terms. The frontier is a priority queue ordered
+    by estimated opportunity (parent score weighted by how often the term
+    appears in the parent's top ASIN names). A keyword whose lookup fails is
+    re-queued until it has failed ``max_attempts`` times; only keywords that
+    succeeded or ran out of attempts count as visited, and ``retry_failed``
+    gives the abandoned ones another round. Progress is checkpointed to JSON
+    so an overnight run can be stopped and resumed within quota.
+    """
+
+    def __init__(
+        self,
+        api: JungleScoutAPI,
+        memory_store=None,
+        max_requests: int = 500,
+        max_depth: int = 3,
+        max_concurrency: int = 4,
+        min_search_volume: int = 1000,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10,
+        include_brand_terms: bool = False,
+        max_attempts: int = 3
+    ):
+        self.api = api
+        self.memory_store = memory_store
+        self.max_requests = max_requests
+        self.max_depth = max_depth
+        self.max_concurrency = max_concurrency
+        self.min_search_volume = min_search_volume
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_every = checkpoint_every
+        self.include_brand_terms = include_brand_terms
+        self.max_attempts = max_attempts
+
+        self.frontier: List[Tuple[float, int, str, int]] = []
+        # Keywords that succeeded or ran out of attempts
+        self.visited = set()
+        # Failed lookups: keyword -> attempts, depth and priority for re-queuing
+        self.failed: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "errors": 0, "retries": 0, "discovered": 0}
+        self._queued = set()
+        self._sequence = 0
+
+        if self.checkpoint_path and self.checkpoint_path.exists():
+            self.load_checkpoint()
+
+    def add_seeds(self, seeds: Iterable[str], priority: float = 1.0):
+        """Queue seed keywords at the given priority"""
+        for seed in seeds:
+            self._enqueue(seed, priority, depth=0)
+
+    def _enqueue(self, keyword: str, priority: float, depth: int) -> bool:
+        key = normalize_keyword(keyword)
+        if not key or key in self.visited or key in self._queued:
+            return False
+        self._queued.add(key)
+        self._push(key, priority, depth)
+        self.stats["discovered"] += 1
+        return True
+
+    def _push(self, keyword: str, priority: float, depth: int):
+        self._sequence += 1
+        heapq.heappush(self.frontier, (-priority, self._sequence, keyword, depth))
+
+    def _finish(self, keyword: str):
+        self._queued.discard(keyword)
+        self.visited.add(keyword)
+
+    def retry_failed(self) -> int:
+        """Re-queue keywords that ran out of attempts, with fresh attempts"""
+        retried = 0
+        for keyword, entry in self.failed.items():
+            if keyword in self.visited:
+                self.visited.discard(keyword)
+                self._queued.add(keyword)
+                entry["attempts"] = 0
+                self._push(keyword, entry["priority"], entry["depth"])
+                retried += 1
+        return retried
+
+    def _fetch(self, keyword: str) -> Dict[str, Any]:
+        return self.api.get_share_of_voice(keyword)
+
+    def crawl(self) -> Dict[str, Dict[str, Any]]:
+        """Run until the frontier is empty or this run's request quota is spent"""
+        in_flight = {}
+        issued = 0
+        completed_since_checkpoint = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while self.frontier or in_flight:
+                while (
+                    self.frontier
+                    and len(in_flight) < self.max_concurrency
+                    and issued < self.max_requests
+                ):
+                    neg_priority, _, keyword, depth = heapq.heappop(self.frontier)
+                    issued += 1
+                    self.stats["requests"] += 1
+                    future = executor.submit(self._fetch, keyword)
+                    in_flight[future] = (keyword, depth, -neg_priority)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    keyword, depth, priority = in_flight.pop(future)
+                    self._handle_result(future, keyword, depth, priority)
+                    completed_since_checkpoint += 1
+
+                if self.checkpoint_path and completed_since_checkpoint >= self.checkpoint_every:
+                    self.save_checkpoint(pending=list(in_flight.values()))
+                    completed_since_checkpoint = 0
+
+        if self.checkpoint_path:
+            self.save_checkpoint()
+
+        logger.info(
+            f"Keyword crawl finished: {len(self.results)} keywords scored, "
+            f"{issued} requests, {len(self.frontier)} left in frontier"
+        )
+        return self.results
+
+    def _handle_result(self, future, keyword: str, depth: int, priority: float):
+        try:
+            response = future.result()
+            attributes = response["data"]["attributes"]
+        except Exception as e:
+            self.stats["errors"] += 1
+            entry = self.failed.setdefault(keyword, {"attempts": 0, "depth": depth, "priority": priority})
+            entry["attempts"] += 1
+            if entry["attempts"] < self.max_attempts:
+                logger.warning(f"Keyword crawl failed for '{keyword}' (attempt {entry['attempts']}), re-queued: {str(e)}")
+                self.stats["retries"] += 1
+                self._push(keyword, priority, depth)
+            else:
+                logger.error(f"Keyword crawl gave up on '{keyword}' after {entry['attempts']} attempts: {str(e)}")
+                self._finish(keyword)
+            return
+
+        self._finish(keyword)
+        self.failed.pop(keyword, None)
+        volume = attributes.get("estimated_30_day_search_volume", 0)
+        score = opportunity_score(volume, attributes.get("brands", []))
+        self.results[keyword] = {
+            "keyword": keyword,
+            "depth": depth,
+            "search_volume": volume,
+            "opportunity_score": score,
+            "estimated_priority": priority,
+            "updated_at": attributes.get("updated_at"),
+            "timestamp": datetime.now().isoformat()
+        }
+
+        if self.memory_store is not None:
+            try:
+                self.memory_store.store_market_insight(keyword, response)
+            except Exception as e:
+                logger.error(f"Error storing crawl result for '{keyword}': {str(e)}")
+
+        if depth >= self.max_depth or volume < self.min_search_volume:
+            return
+
+        for term, weight in extract_related_terms(
+            keyword, attributes, include_brand_terms=self.include_brand_terms
+        ):
+            self._enqueue(term, score * weight, depth + 1)
+
+    def save_checkpoint(self, pending: Optional[List[Tuple[str, int, float]]] = None):
+        """Persist frontier, visited index and results"""
+        frontier = list(self.frontier)
+        # Requests still in flight are put back so a resume retries them
+        for keyword, depth, priority in pending or []:
+            frontier.append((-priority, 0, keyword, depth))
+
+        state = {
+            "timestamp": datetime.now().isoformat(),
+            "frontier": [[-p, k, d] for p, _, k, d in sorted(frontier)],
+            "visited": sorted(self.visited),
+            "failed": self.failed,
+            "results": self.results,
+            "stats": self.stats
+        }
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        tmp_path.replace(self.checkpoint_path)
+
+    def load_checkpoint(self):
+        """Restore crawler state from the checkpoint file"""
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading crawl checkpoint: {str(e)}")
+            raise
+
+        self.results = state.get("results", {})
+        self.failed = state.get("failed", {})
+        self.stats.update(state.get("stats", {}))
+        self.frontier = []
+        for priority, keyword, depth in state.get("frontier", []):
+            self._push(keyword, priority, depth)
+        self._queued = {keyword for _, _, keyword, _ in self.frontier}
+        # Older checkpoints also listed queued keywords as visited
+        self.visited = set(state.get("visited", [])) - self._queued
+        logger.info(
+            f"Resumed keyword crawl: {len(self.results)} results, {len(self.frontier)} queued"
+        )
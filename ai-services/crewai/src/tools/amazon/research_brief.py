@@ -0,0 +1,140 @@
+# src/tools/amazon/research_brief.py
+
+from typing import Dict, Any, List, Optional
+import logging
+
+from tools.ai.budget import default_prompt_budget
+from tools.ai.preflight import PromptSection, fit_sections
+
+logger = logging.getLogger(__name__)
+
+# Same segments AmazonMemoryStore uses for market gap analysis
+PRICE_BANDS = {
+    "budget": (0, 30),
+    "mid_range": (30, 100),
+    "premium": (100, float("inf"))
+}
+GAP_SHARE = 0.2
+
+
+def _concentration_level(top_three: float) -> str:
+    if top_three > 0.7:
+        return "high"
+    elif top_three > 0.4:
+        return "medium"
+    return "low"
+
+
+def build_research_brief(keyword: str, sov_response: Dict[str, Any], top_k: int = 5) -> Dict[str, Any]:
+    """Condense a Share of Voice payload into a bounded research brief
+
+    Only the signals agents reason about are kept: demand, brand
+    concentration, the top-k brands, price band shares and gaps, and the
+    best-converting ASINs. The size is independent of how many brands and
+    ASINs the raw payload lists.
+    """
+    attrs = sov_response["data"]["attributes"]
+    brands = sorted(
+        attrs.get("brands", []),
+        key=lambda x: x.get("combined_weighted_sov", 0),
+        reverse=True
+    )
+    shares = [b.get("combined_weighted_sov", 0) for b in brands]
+    top_three = sum(shares[:3])
+
+    bands = {}
+    for band, (low, high) in PRICE_BANDS.items():
+        members = [
+            b for b in brands
+            if b.get("combined_average_price") is not None
+            and low <= b["combined_average_price"] < high
+        ]
+        bands[band] = {
+            "share": round(sum(b.get("combined_weighted_sov", 0) for b in members), 4),
+            "brands": len(members)
+        }
+
+    asins = sorted(
+        attrs.get("top_asins", []),
+        key=lambda x: x.get("conversions", 0),
+        reverse=True
+    )
+    clicks = sum(a.get("clicks", 0) for a in asins)
+    conversions = sum(a.get("conversions", 0) for a in asins)
+
+    return {
+        "keyword": keyword,
+        "search_volume": attrs.get("estimated_30_day_search_volume"),
+        "product_count": attrs.get("product_count"),
+        "suggested_bid": attrs.get("exact_suggested_bid_median"),
+        "updated_at": attrs.get("updated_at"),
+        "concentration": {
+            "top_brand": round(shares[0], 4) if shares else 0.0,
+            "top_three": round(top_three, 4),
+            "hhi": round(sum(s * s for s in shares), 4),
+            "level": _concentration_level(top_three),
+            "brand_count": len(brands)
+        },
+        "top_brands": [{
+            "brand": b.get("brand"),
+            "share": round(b.get("combined_weighted_sov", 0), 4),
+            "avg_price": b.get("combined_average_price"),
+            "avg_position": b.get("combined_average_position")
+        } for b in brands[:top_k]],
+        "price_bands": bands,
+        "gaps": [band for band, stats in bands.items() if stats["share"] < GAP_SHARE],
+        "top_asins": [{
+            "asin": a.get("asin"),
+            "name": (a.get("name") or "")[:60],
+            "brand": a.get("brand"),
+            "conversion_rate": a.get("conversion_rate"),
+            "conversions": a.get("conversions")
+        } for a in asins[:top_k]],
+        "asin_conversion_rate": round(conversions / clicks, 4) if clicks else None
+    }
+
+
+def render_brief(brief: Dict[str, Any], max_tokens: Optional[int] = None, model: Optional[str] = None) -> str:
+    """Compact text form of a brief for prompts, fitted to a token budget
+
+    When over budget, the ASIN list goes first (down to a one-line summary),
+    then price bands and gaps; the headline numbers and brands are kept.
+    """
+    conc = brief["concentration"]
+    headline = "\n".join([
+        f"Market Analysis for '{brief['keyword']}' (data as of {brief.get('updated_at') or 'n/a'})",
+        f"Monthly Search Volume: {brief['search_volume'] or 0:,} | Products: {brief['product_count'] or 0:,}"
+        + (f" | Suggested Bid: ${brief['suggested_bid']:.2f}" if brief.get("suggested_bid") else ""),
+        f"Concentration: {conc['level']} (top1 {conc['top_brand']:.0%}, top3 {conc['top_three']:.0%}, "
+        f"HHI {conc['hhi']:.3f}, {conc['brand_count']} brands)"
+    ])
+    brands = ["Top Brands (share, avg price, avg position):"]
+    for b in brief["top_brands"]:
+        price = f"${b['avg_price']:.2f}" if b.get("avg_price") is not None else "n/a"
+        position = f"{b['avg_position']:.1f}" if b.get("avg_position") is not None else "n/a"
+        brands.append(f"- {b['brand']}: {b['share']:.1%}, {price}, {position}")
+
+    bands = "\n".join([
+        "Price Bands (share / brands): " + ", ".join(
+            f"{band} {stats['share']:.0%}/{stats['brands']}" for band, stats in brief["price_bands"].items()
+        ),
+        f"Gaps (<{GAP_SHARE:.0%} share): {', '.join(brief['gaps']) or 'none'}"
+    ])
+    sections = [
+        PromptSection("headline", headline, priority=3),
+        PromptSection("brands", "\n".join(brands), priority=2),
+        PromptSection("price_bands", bands, priority=1)
+    ]
+
+    if brief["top_asins"]:
+        rate = brief.get("asin_conversion_rate")
+        title = "Top ASINs by conversions" + (f" (overall conversion {rate:.1%})" if rate is not None else "") + ":"
+        asins = [title]
+        for a in brief["top_asins"]:
+            conversion = f"{a['conversion_rate']:.1%}" if a.get("conversion_rate") is not None else "n/a"
+            asins.append(f"- {a['asin']} {a['brand'] or ''}: {conversion} conv, {a['conversions'] or 0} sales | {a['name']}")
+        summary = f"{title} " + ", ".join(a["asin"] for a in brief["top_asins"])
+        sections.append(PromptSection("top_asins", "\n".join(asins), priority=0, summary=summary))
+
+    max_tokens = default_prompt_budget() if max_tokens is None else max_tokens
+    return fit_sections(sections, max_tokens, model=model, separator="\n")
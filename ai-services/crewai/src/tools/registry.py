@@ -0,0 +1,171 @@
+# src/tools/registry.py
+
+from typing import Dict, Any, Callable, Optional, Tuple, Iterable
+from collections import Counter
+import functools
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ToolSpec:
+    """How to build a provider client and which of its methods count as usage"""
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        default_credentials: Optional[Callable[[], Dict[str, Any]]] = None,
+        tracked_methods: Iterable[str] = ()
+    ):
+        self.factory = factory
+        self.default_credentials = default_credentials or dict
+        self.tracked_methods = tuple(tracked_methods)
+
+
+def _lazy(path: str) -> Callable[..., Any]:
+    """Factory that imports 'module:Class' on first use so unused SDKs never load"""
+    module_name, class_name = path.split(":")
+
+    def factory(**kwargs):
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)(**kwargs)
+    return factory
+
+
+def credential_fingerprint(credentials: Dict[str, Any]) -> str:
+    """Stable, non-reversible identifier for a credential set"""
+    payload = json.dumps(credentials, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+class ToolRegistry:
+    """Process-wide registry of lazily created, shared tool clients
+
+    Clients are singletons per (provider, credentials), so every agent that
+    asks for the same provider shares one SDK client and its HTTP pool.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._instances: Dict[Tuple[str, str], Any] = {}
+        self._acquisitions: Counter = Counter()
+        self._calls: Counter = Counter()
+        self._lock = threading.RLock()
+
+    def register(self, provider: str, spec: ToolSpec):
+        """Register (or replace) how a provider's client is built"""
+        with self._lock:
+            self._specs[provider] = spec
+
+    def get(self, provider: str, **credentials) -> Any:
+        """Return the shared client for a provider, creating it on first use"""
+        spec = self._specs.get(provider)
+        if spec is None:
+            raise KeyError(f"Unknown tool provider: {provider}")
+
+        credentials = {**spec.default_credentials(), **credentials}
+        key = (provider, credential_fingerprint(credentials))
+
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                logger.info(f"Creating shared {provider} client ({key[1]})")
+                instance = spec.factory(**credentials)
+                self._track(instance, key, spec.tracked_methods)
+                self._instances[key] = instance
+            self._acquisitions[key] += 1
+        return instance
+
+    def _track(self, instance: Any, key: Tuple[str, str], methods: Tuple[str, ...]):
+        """Shadow tracked methods on the instance with call-counting wrappers"""
+        for name in methods:
+            method = getattr(instance, name, None)
+            if not callable(method):
+                continue
+
+            @functools.wraps(method)
+            def counted(*args, _method=method, **kwargs):
+                with self._lock:
+                    self._calls[key] += 1
+                return _method(*args, **kwargs)
+
+            try:
+                setattr(instance, name, counted)
+            except (AttributeError, TypeError, ValueError):
+                logger.warning(f"Cannot track {name} calls on {type(instance).__name__}")
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Acquisition and call counts per client"""
+        with self._lock:
+            return {
+                f"{provider}:{fingerprint}": {
+                    "acquisitions": self._acquisitions[(provider, fingerprint)],
+                    "calls": self._calls[(provider, fingerprint)]
+                }
+                for provider, fingerprint in self._instances
+            }
+
+    def clear(self):
+        """Drop all cached clients and counters"""
+        with self._lock:
+            self._instances.clear()
+            self._acquisitions.clear()
+            self._calls.clear()
+
+
+def _junglescout_credentials() -> Dict[str, Any]:
+    return {
+        "api_key": os.getenv("JUNGLE_SCOUT_API_KEY"),
+        "api_name": os.getenv("JUNGLE_SCOUT_API_NAME", "inupo_goods")
+    }
+
+
+def _env_credentials(variable: str) -> Callable[[], Dict[str, Any]]:
+    return lambda: {"api_key": os.getenv(variable)}
+
+
+DEFAULT_TOOLS = {
+    "junglescout": ToolSpec(
+        _lazy("tools.amazon.junglescout_api:JungleScoutAPI"),
+        default_credentials=_junglescout_credentials,
+        tracked_methods=("get_share_of_voice",)
+    ),
+    "gpt4": ToolSpec(
+        _lazy("tools.ai.gpt4_api:GPT4API"),
+        default_credentials=_env_credentials("OPENAI_API_KEY"),
+        tracked_methods=("analyze",)
+    ),
+    "claude": ToolSpec(
+        _lazy("tools.ai.claude_api:ClaudeAPI"),
+        default_credentials=_env_credentials("ANTHROPIC_API_KEY"),
+        tracked_methods=("analyze",)
+    ),
+    "gemini": ToolSpec(
+        _lazy("tools.ai.gemini_api:GeminiAPI"),
+        default_credentials=_env_credentials("GOOGLE_API_KEY"),
+        tracked_methods=("analyze",)
+    ),
+    "web_search": ToolSpec(_lazy("tools.search.web_search:WebSearchTool"), tracked_methods=("search",)),
+    "perplexity": ToolSpec(_lazy("tools.search.perplexity:PerplexitySearchTool"), tracked_methods=("search",)),
+    "local_index": ToolSpec(_lazy("tools.search.local_index:LocalSearchTool"), tracked_methods=("search",)),
+    "semantic_recall": ToolSpec(_lazy("tools.ai.vector_index:SemanticRecallTool"), tracked_methods=("recall",))
+}
+
+_registry: Optional[ToolRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ToolRegistry:
+    """Process-wide registry preloaded with the default providers"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ToolRegistry()
+            for provider, spec in DEFAULT_TOOLS.items():
+                _registry.register(provider, spec)
+        return _registry
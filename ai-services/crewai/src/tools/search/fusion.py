@@ -0,0 +1,54 @@
+# src/tools/search/fusion.py
+
+from typing import Dict, Any, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the click, never change the page
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "ref_", "srsltid", "_ga"}
+# Standard RRF damping constant; keeps one top rank from dominating
+RRF_K = 60
+
+
+def canonical_url(url: str) -> str:
+    """URL with scheme, host, trailing slash, fragment and tracking noise normalized"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def reciprocal_rank_fusion(ranked_lists: Dict[str, List[Dict[str, Any]]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """Merge per-query result lists into one ranking by reciprocal-rank fusion
+
+    Each result scores sum(1 / (k + rank)) over the queries that returned it,
+    so pages found by several angles rise above any single list's top hit.
+    Results are deduplicated by canonical URL; the first copy seen is kept,
+    annotated with its ``score`` and the ``queries`` that matched it.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for query, results in ranked_lists.items():
+        seen = set()
+        for rank, result in enumerate(results, start=1):
+            url = canonical_url(result.get("link") or "")
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            entry = fused.setdefault(url, dict(result, score=0.0, queries=[]))
+            entry["score"] += 1.0 / (k + rank)
+            entry["queries"].append(query)
+
+    merged = sorted(fused.values(), key=lambda r: r["score"], reverse=True)
+    for position, result in enumerate(merged, start=1):
+        result["position"] = position
+    return merged
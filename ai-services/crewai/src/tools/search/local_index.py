@@ -0,0 +1,185 @@
+# src/tools/search/local_index.py
+
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+# Indexed text per document is capped; long prompts add little beyond their start
+MAX_FIELD_CHARS = 20000
+
+
+def match_expression(query: str, match_all: bool = False) -> str:
+    """FTS5 MATCH expression for free text: any term (or every term), ranked by bm25
+
+    Terms are quoted so punctuation and FTS operators in agent queries
+    cannot break the syntax.
+    """
+    terms = dict.fromkeys(t.lower() for t in _TERM.findall(query))
+    return (" AND " if match_all else " OR ").join(f'"{t}"' for t in terms)
+
+
+class LocalIndex:
+    """Local BM25 full-text index of search results and LLM analyses
+
+    Documents live in an SQLite FTS5 table keyed by (source, ref); adding
+    the same ref again replaces the old copy. Search ranks by bm25 over the
+    title, query and body columns.
+    """
+
+    def __init__(self, path: str = "memory/local_index.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.stats = {"documents_added": 0, "searches": 0, "hits": 0}
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5("
+                "title, query, body, source UNINDEXED, ref UNINDEXED, "
+                "metadata UNINDEXED, created_at UNINDEXED, tokenize='porter unicode61')"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS document_keys (key TEXT PRIMARY KEY, doc_id INTEGER NOT NULL)"
+            )
+
+    @classmethod
+    def from_env(cls) -> "LocalIndex":
+        """Index stored at LOCAL_INDEX_PATH"""
+        return cls(os.getenv("LOCAL_INDEX_PATH", "memory/local_index.db"))
+
+    def add(
+        self,
+        source: str,
+        body: str,
+        title: str = "",
+        query: str = "",
+        ref: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Index one document and return its ref (a content hash by default)"""
+        ref = ref or hashlib.sha256(f"{title}\n{body}".encode()).hexdigest()[:16]
+        key = f"{source}:{ref}"
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT doc_id FROM document_keys WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM documents WHERE rowid = ?", (row[0],))
+            cursor = self._conn.execute(
+                "INSERT INTO documents (title, query, body, source, ref, metadata, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    title[:MAX_FIELD_CHARS], query[:MAX_FIELD_CHARS], body[:MAX_FIELD_CHARS],
+                    source, ref, json.dumps(metadata or {}, default=str), datetime.now().isoformat()
+                )
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO document_keys (key, doc_id) VALUES (?, ?)", (key, cursor.lastrowid)
+            )
+            self.stats["documents_added"] += 1
+        return ref
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        sources: Optional[List[str]] = None,
+        max_age: Optional[timedelta] = None,
+        match_all: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Best matches for free text, most relevant first; ``match_all`` requires every term"""
+        expression = match_expression(query, match_all)
+        if not expression:
+            return []
+        sql = (
+            "SELECT source, ref, title, query, body, metadata, created_at, "
+            "snippet(documents, 2, '', '', ' ... ', 24), bm25(documents, 2.0, 1.0, 1.0) AS rank "
+            "FROM documents WHERE documents MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if sources:
+            sql += f" AND source IN ({', '.join('?' * len(sources))})"
+            params.extend(sources)
+        if max_age is not None:
+            sql += " AND created_at >= ?"
+            params.append((datetime.now() - max_age).isoformat())
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self.stats["searches"] += 1
+            self.stats["hits"] += 1 if rows else 0
+        return [{
+            "source": source,
+            "ref": ref,
+            "title": title,
+            "query": indexed_query,
+            "body": body,
+            "snippet": snippet,
+            "metadata": json.loads(metadata),
+            "created_at": created_at,
+            "score": -rank
+        } for source, ref, title, indexed_query, body, metadata, created_at, snippet, rank in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM document_keys").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index: Optional[LocalIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> Optional[LocalIndex]:
+    """Process-wide local index, or None when LOCAL_INDEX_ENABLED=0"""
+    global _index
+    if os.getenv("LOCAL_INDEX_ENABLED", "1") == "0":
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = LocalIndex.from_env()
+        return _index
+
+
+class LocalSearchTool:
+    """Lookup over everything already fetched or analyzed, before paying for an API
+
+    Returns the same status dict shape as the web search tools, with
+    ``found`` set when anything matched.
+    """
+
+    def __init__(self, index: Optional[LocalIndex] = None):
+        self.name = "Local Knowledge Search"
+        self.index = index
+
+    def search(self, query: str, limit: int = 5, max_age_days: Optional[float] = None) -> Dict[str, Any]:
+        """Search previously fetched search results and analyses"""
+        index = self.index or get_local_index()
+        if index is None:
+            return {"status": "error", "error": "Local index is disabled"}
+        try:
+            max_age = timedelta(days=max_age_days) if max_age_days is not None else None
+            results = index.search(query, limit=limit, max_age=max_age)
+        except Exception as e:
+            logger.error(f"Local index search failed: {str(e)}")
+            return {"status": "error", "error": str(e)}
+        return {
+            "status": "success",
+            "found": bool(results),
+            "results": results,
+            "total_results": len(results)
+        }
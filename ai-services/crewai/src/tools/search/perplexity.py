@@ -1,19 +1,79 @@
-# src/tools/perplexity.py
-from typing import Dict, Any
+# src/tools/search/perplexity.py
+from typing import Dict, Any, List, Optional
+import logging
+import os
+import requests
+
+from .local_index import LocalIndex, get_local_index
+
+logger = logging.getLogger(__name__)
 
 class PerplexitySearchTool:
-    """Perplexity search tool implementation"""
-    
-    def __init__(self):
+    """Perplexity search tool implementation
+
+    Asks Perplexity's chat completions API (PERPLEXITY_MODEL, "sonar" by
+    default) and returns the answer with its citations. Answers are also
+    written to the local full-text index so later lookups can reuse them.
+    """
+
+    API_URL = "https://api.perplexity.ai/chat/completions"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: float = 60.0,
+        index: Optional[LocalIndex] = None
+    ):
         self.name = "Perplexity Search"
-        
+        self.api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
+        self.model = model or os.getenv("PERPLEXITY_MODEL", "sonar")
+        self.timeout = timeout
+        self.index = index if index is not None else get_local_index()
+
     def search(self, query: str) -> Dict[str, Any]:
-        """
-        Perform Perplexity search
-        Currently a placeholder - implement actual search logic
-        """
+        """Perform Perplexity search"""
+        if not self.api_key:
+            return {"status": "error", "error": "PERPLEXITY_API_KEY is not set"}
+        try:
+            data = self._request(query)
+        except Exception as e:
+            logger.error(f"Perplexity search error: {str(e)}")
+            return {"status": "error", "error": str(e)}
+
+        choices = data.get("choices") or []
+        answer = choices[0].get("message", {}).get("content", "") if choices else ""
+        citations: List[str] = data.get("citations") or []
+        results = [{
+            "title": result.get("title", ""),
+            "link": result.get("url"),
+            "date": result.get("date")
+        } for result in data.get("search_results") or []]
+        if answer:
+            self._index_answer(query, answer, citations or [r["link"] for r in results])
         return {
             "status": "success",
             "query": query,
-            "results": []  # Implement actual search results
-        }
\ No newline at end of file
+            "answer": answer,
+            "citations": citations,
+            "results": results
+        }
+
+    def _index_answer(self, query: str, answer: str, citations: List[str]):
+        if self.index is None:
+            return
+        try:
+            self.index.add("perplexity", answer, title=query, query=query, metadata={"citations": citations})
+        except Exception as e:
+            logger.warning(f"Could not index Perplexity answer locally: {str(e)}")
+
+    def _request(self, query: str) -> Dict[str, Any]:
+        """Raw chat completions response for one query"""
+        response = requests.post(
+            self.API_URL,
+            headers={"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"},
+            json={"model": self.model, "messages": [{"role": "user", "content": query}]},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
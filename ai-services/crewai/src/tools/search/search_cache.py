@@ -0,0 +1,216 @@
+# src/tools/search/search_cache.py
+
+from typing import Dict, Any, Optional, Callable, Tuple, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[\w$%.+-]+")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: lowercase, single spaces, punctuation dropped
+
+    Every word and its order are kept, since both change what a search
+    returns ("flights from NYC to LA" is not "flights from LA to NYC").
+    """
+    terms = [t.strip(".") for t in _TOKEN.findall(query.lower())]
+    return " ".join(t for t in terms if t)
+
+
+def search_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key for a normalized query and the search parameters that shape results"""
+    payload = json.dumps({"q": normalize_query(query), **(params or {})}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SearchCache:
+    """Persistent TTL cache of search results, one JSON file per query"""
+
+    def __init__(self, storage_dir: str = "memory/search_cache", ttl: timedelta = timedelta(hours=24)):
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SearchCache":
+        """Cache configured by SEARCH_CACHE_DIR and SEARCH_CACHE_TTL_HOURS"""
+        return cls(
+            storage_dir=os.getenv("SEARCH_CACHE_DIR", "memory/search_cache"),
+            ttl=timedelta(hours=float(os.getenv("SEARCH_CACHE_TTL_HOURS", "24")))
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.storage_dir / f"{key}.json"
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, or None if missing or expired"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except Exception as e:
+            logger.error(f"Error reading search cache entry {key}: {str(e)}")
+            self._count("misses")
+            return None
+
+        if datetime.fromisoformat(entry["expires_at"]) <= datetime.now():
+            path.unlink(missing_ok=True)
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return entry["result"]
+
+    def put(self, key: str, query: str, result: Dict[str, Any]):
+        """Store a search result under its key"""
+        now = datetime.now()
+        entry = {
+            "key": key,
+            "query": query,
+            "created_at": now.isoformat(),
+            "expires_at": (now + self.ttl).isoformat(),
+            "result": result
+        }
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, indent=2, default=str)
+            tmp_path.replace(path)
+            self._count("stores")
+        except Exception as e:
+            logger.error(f"Error storing search cache entry {key}: {str(e)}")
+
+    def purge_expired(self) -> int:
+        """Delete entries whose TTL has passed"""
+        removed = 0
+        now = datetime.now()
+        for path in self.storage_dir.glob("*.json"):
+            try:
+                with open(path, 'r') as f:
+                    expires_at = datetime.fromisoformat(json.load(f)["expires_at"])
+            except Exception:
+                continue
+            if expires_at <= now:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Remove all entries"""
+        for path in self.storage_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` once per key at a time; returns (result, shared)
+
+        Callers that arrive while a call is running wait for it and get
+        its result (or exception) with ``shared`` set.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result(), False
+
+
+class QuotaCounter:
+    """Paid API calls per calendar month, persisted so restarts keep the count
+
+    The count file is shared by every process using the same cache dir;
+    each check re-reads it under an ``flock`` so parallel workers never
+    overwrite each other's increments.
+    """
+
+    def __init__(self, path: Path, monthly_limit: Optional[int] = None):
+        self.path = Path(path)
+        self.monthly_limit = monthly_limit
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.path.with_suffix(".lock")
+
+    @staticmethod
+    def _month() -> str:
+        return datetime.now().strftime("%Y-%m")
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        with self._lock, open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, int]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def used(self) -> int:
+        with self._file_lock(exclusive=False):
+            return self._read().get(self._month(), 0)
+
+    def remaining(self) -> Optional[int]:
+        """Calls left this month, or None without a limit"""
+        if self.monthly_limit is None:
+            return None
+        return max(self.monthly_limit - self.used(), 0)
+
+    def consume(self) -> bool:
+        """Count one call; False (and nothing counted) if the quota is spent"""
+        with self._file_lock(exclusive=True):
+            counts = self._read()
+            month = self._month()
+            if self.monthly_limit is not None and counts.get(month, 0) >= self.monthly_limit:
+                return False
+            counts[month] = counts.get(month, 0) + 1
+            tmp_path = self.path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(counts, f)
+                tmp_path.replace(self.path)
+            except Exception as e:
+                logger.error(f"Error saving quota counts: {str(e)}")
+            return True
@@ -1,59 +1,217 @@
 # src/tools/search/web_search.py
 import os
 from serpapi import GoogleSearch
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List
+from collections import Counter
+import asyncio
 import logging
+import threading
+
+from .fusion import canonical_url, reciprocal_rank_fusion
+from .local_index import LocalIndex, get_local_index
+from .search_cache import QuotaCounter, SearchCache, SingleFlight, search_key
 
 logger = logging.getLogger(__name__)
 
 class WebSearchTool:
-    """Web search implementation using SerpAPI"""
-    
-    def __init__(self):
+    """Web search implementation using SerpAPI
+
+    Results are cached by normalized query for SEARCH_CACHE_TTL_HOURS, and
+    concurrent identical searches share one SerpAPI call. Paid calls are
+    counted per month; with SERP_API_MONTHLY_QUOTA set, searches that miss
+    the cache fail fast once it is spent. Every fetched result is also
+    written to the local full-text index, and a query that misses the
+    cache is answered from that index when it already holds at least
+    ``local_min_results`` fresh results matching every query term
+    (SEARCH_LOCAL_MIN_RESULTS, 0 to always go to SerpAPI).
+    """
+
+    PARAMS = {
+        "engine": "google",
+        "num": 10,  # Limit results to conserve quota
+        "gl": "us"  # Set to US results
+    }
+
+    def __init__(
+        self,
+        cache: Optional[SearchCache] = None,
+        monthly_quota: Optional[int] = None,
+        index: Optional[LocalIndex] = None,
+        local_min_results: Optional[int] = None
+    ):
         self.api_key = os.getenv('SERP_API_KEY')
         if not self.api_key:
             raise ValueError("SERP_API_KEY not found in environment variables")
-            
-    def search(self, query: str) -> Dict[str, Any]:
-        """Perform web search using SerpAPI"""
+        self.cache = cache if cache is not None else SearchCache.from_env()
+        if monthly_quota is None and os.getenv("SERP_API_MONTHLY_QUOTA"):
+            monthly_quota = int(os.getenv("SERP_API_MONTHLY_QUOTA"))
+        self.index = index if index is not None else get_local_index()
+        if local_min_results is None:
+            local_min_results = int(os.getenv("SEARCH_LOCAL_MIN_RESULTS", "5"))
+        self.local_min_results = local_min_results
+        self.quota = QuotaCounter(self.cache.storage_dir / "quota" / "serpapi.json", monthly_quota)
+        self._flights = SingleFlight()
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def search(self, query: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Perform web search using SerpAPI, served from cache when possible"""
+        key = search_key(query, self.PARAMS)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                return dict(cached, cached=True)
+            local = self._search_local(query)
+            if local is not None:
+                self._count("local_hits")
+                return local
+
+        result, shared = self._flights.do(key, lambda: self._search(query, key))
+        if shared:
+            self._count("coalesced")
+        return result
+
+    async def search_many(self, queries: List[str], max_concurrency: int = 4) -> Dict[str, Any]:
+        """Run related searches concurrently and fuse them into one ranked list
+
+        Up to ``max_concurrency`` searches are in flight at once; each still
+        goes through the cache and single-flight guard. Results are
+        deduplicated by canonical URL and ranked by reciprocal-rank fusion;
+        failed queries are reported under ``errors``.
+        """
+        queries = list(dict.fromkeys(q for q in queries if q and q.strip()))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self.search, query)
+
+        responses = await asyncio.gather(*(run(q) for q in queries))
+        ranked = {q: r.get("results", []) for q, r in zip(queries, responses) if r.get("status") == "success"}
+        errors = {q: r.get("error") for q, r in zip(queries, responses) if r.get("status") != "success"}
+        if not ranked and errors:
+            return {
+                "status": "error",
+                "error": "All searches failed",
+                "errors": errors
+            }
+
+        merged = reciprocal_rank_fusion(ranked)
+        return {
+            "status": "success",
+            "queries": queries,
+            "results": merged,
+            "total_results": len(merged),
+            "errors": errors
+        }
+
+    def search_all(self, queries: List[str], max_concurrency: int = 4) -> Dict[str, Any]:
+        """Blocking variant of search_many() for synchronous agent tools"""
+        return asyncio.run(self.search_many(queries, max_concurrency))
+
+    def _search(self, query: str, key: str) -> Dict[str, Any]:
+        if not self.quota.consume():
+            self._count("quota_rejections")
+            logger.warning(f"SerpAPI monthly quota of {self.quota.monthly_limit} searches exhausted")
+            return {
+                "status": "error",
+                "error": "SerpAPI monthly quota exhausted"
+            }
+
+        self._count("api_calls")
         try:
-            search = GoogleSearch({
-                "q": query,
-                "api_key": self.api_key,
-                "engine": "google",
-                "num": 10,  # Limit results to conserve quota
-                "gl": "us"  # Set to US results
-            })
-            
-            results = search.get_dict()
-            
+            results = self._request(query)
+
             # Extract and format relevant data
             organic_results = results.get("organic_results", [])
-            
+
             if not organic_results:
                 logger.warning("No results found for query")
-                return {
-                    "status": "success",
-                    "results": [],
-                    "total_results": 0
-                }
-            
-            formatted_results = [{
-                "title": result.get("title"),
-                "link": result.get("link"),
-                "snippet": result.get("snippet"),
-                "position": result.get("position")
-            } for result in organic_results]
-            
-            return {
+                formatted_results = []
+            else:
+                formatted_results = [{
+                    "title": result.get("title"),
+                    "link": result.get("link"),
+                    "snippet": result.get("snippet"),
+                    "position": result.get("position")
+                } for result in organic_results]
+
+            response = {
                 "status": "success",
                 "results": formatted_results,
                 "total_results": len(formatted_results)
             }
-            
+            self.cache.put(key, query, response)
+            self._index_results(query, formatted_results)
+            return response
+
         except Exception as e:
+            self._count("errors")
             logger.error(f"SerpAPI search failed: {str(e)}")
             return {
                 "status": "error",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+    def _search_local(self, query: str) -> Optional[Dict[str, Any]]:
+        """Results already fetched by earlier searches, if there are enough of them"""
+        if self.index is None or self.local_min_results <= 0:
+            return None
+        try:
+            hits = self.index.search(
+                query, limit=self.PARAMS["num"], sources=["web_search"], max_age=self.cache.ttl, match_all=True
+            )
+        except Exception as e:
+            logger.warning(f"Local index lookup failed: {str(e)}")
+            return None
+        if len(hits) < self.local_min_results:
+            return None
+        results = [{
+            "title": hit["title"],
+            "link": hit["metadata"].get("link"),
+            "snippet": hit["body"],
+            "position": position
+        } for position, hit in enumerate(hits, 1)]
+        return {
+            "status": "success",
+            "results": results,
+            "total_results": len(results),
+            "local": True
+        }
+
+    def _index_results(self, query: str, results: List[Dict[str, Any]]):
+        if self.index is None:
+            return
+        for result in results:
+            try:
+                self.index.add(
+                    "web_search",
+                    result.get("snippet") or "",
+                    title=result.get("title") or "",
+                    query=query,
+                    ref=canonical_url(result.get("link") or "") or None,
+                    metadata={"link": result.get("link")}
+                )
+            except Exception as e:
+                logger.warning(f"Could not index search result locally: {str(e)}")
+
+    def _request(self, query: str) -> Dict[str, Any]:
+        """Raw SerpAPI response for a query"""
+        search = GoogleSearch({"q": query, "api_key": self.api_key, **self.PARAMS})
+        return search.get_dict()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache and local-index hits, coalesced and paid searches, and monthly quota usage"""
+        with self._lock:
+            stats = {
+                name: self._stats[name]
+                for name in ("api_calls", "cache_hits", "local_hits", "coalesced", "quota_rejections", "errors")
+            }
+        stats["quota_used"] = self.quota.used()
+        stats["quota_remaining"] = self.quota.remaining()
+        return stats
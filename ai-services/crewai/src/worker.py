@@ -0,0 +1,58 @@
+# src/worker.py
+
+"""
+Standalone task queue worker
+
+Leases crew runs and Share of Voice sweeps from the shared task queue
+(TASK_QUEUE_PATH) and runs them with the same handlers as the API.
+Start several containers of it to scale throughput:
+
+    python worker.py --concurrency 2 --kinds amazon_research sov_sweep
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+
+from api.handlers import TASK_HANDLERS
+from api.task_queue import QueueWorker, get_task_queue
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run tasks from the durable task queue")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("TASK_WORKER_CONCURRENCY", "1")))
+    parser.add_argument("--kinds", nargs="*", choices=sorted(TASK_HANDLERS), help="Task kinds to run (default: all)")
+    parser.add_argument("--poll-interval", type=float, default=float(os.getenv("TASK_POLL_INTERVAL", "1.0")))
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+    handlers = {kind: TASK_HANDLERS[kind] for kind in (args.kinds or TASK_HANDLERS)}
+    worker = QueueWorker(
+        get_task_queue(),
+        handlers,
+        worker_id=os.getenv("TASK_WORKER_ID"),
+        concurrency=args.concurrency,
+        poll_interval=args.poll_interval
+    )
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        # Finish running tasks, then exit; unfinished leases expire and are retried elsewhere
+        signal.signal(sig, lambda *_: worker.stop(wait=False))
+
+    logger.info(f"Worker {worker.worker_id} consuming {sorted(handlers)} with concurrency {args.concurrency}")
+    worker.run_forever()
+    logger.info(f"Worker {worker.worker_id} stopped: {worker.stats}")
+
+
+if __name__ == "__main__":
+    main()